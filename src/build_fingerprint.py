@@ -0,0 +1,195 @@
+"""
+Build fingerprints for skipping unchanged project builds.
+
+A fingerprint hashes what a build reads: each repository's HEAD and
+uncommitted changes, the merged project config, the content of the enabled
+POs and the resolved build command. project_build records it next to the
+artifacts of a successful build and reuses that build when a later
+fingerprint matches and the recorded artifacts are still intact.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.plugins.po_plugins.bundle import bundle_path_for
+from src.plugins.po_plugins.utils import FileHashCache, write_json_atomic
+from src.repo_state import scan_repositories
+
+FINGERPRINT_FILE = "fingerprint.json"
+FINGERPRINT_VERSION = 1
+# The tool's own .cache (builds, logs, PO state) lives in the workspace root, which may itself be a repository.
+_DIRTY_PATHSPEC = ["--", ".", ":(exclude).cache"]
+
+
+def _digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _file_digest(path: str, hash_cache: FileHashCache) -> str:
+    try:
+        return hash_cache.sha256(path, os.stat(path))
+    except OSError:
+        return ""
+
+
+def dirty_hash(repo_path: str, hash_cache: FileHashCache) -> Optional[str]:
+    """sha256 of a repository's uncommitted changes outside .cache (diff plus untracked files), None on error."""
+    try:
+        diff = subprocess.run(
+            ["git", "diff", "HEAD", "--binary", "--no-ext-diff", "--no-color", *_DIRTY_PATHSPEC],
+            cwd=repo_path,
+            capture_output=True,
+            check=False,
+        )
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard", "-z", *_DIRTY_PATHSPEC],
+            cwd=repo_path,
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    if diff.returncode != 0 or untracked.returncode != 0:
+        return None
+    digest = hashlib.sha256(diff.stdout)
+    for rel in sorted(path for path in untracked.stdout.split(b"\0") if path):
+        digest.update(b"\0" + rel + b"\0")
+        digest.update(_file_digest(os.path.join(repo_path, os.fsdecode(rel)), hash_cache).encode("ascii"))
+    return digest.hexdigest()
+
+
+def repository_inputs(
+    repositories: List[Tuple[str, str]], max_workers: int, hash_cache: FileHashCache
+) -> Optional[List[Dict[str, str]]]:
+    """Return [{repo, head, dirty}] sorted by name, or None when a repository is not a readable git work tree."""
+    states = scan_repositories(repositories, max_workers)
+
+    def _inputs(item: Tuple[str, str]) -> Optional[Dict[str, str]]:
+        repo_path, repo_name = item
+        state = states.get(repo_path)
+        if state is None:
+            return None
+        changes = dirty_hash(repo_path, hash_cache) if state.dirty else ""
+        if changes is None:
+            return None
+        return {"repo": repo_name, "head": state.head, "dirty": changes}
+
+    if not repositories:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(repositories)))) as executor:
+        entries = list(executor.map(_inputs, repositories))
+    if any(entry is None for entry in entries):
+        return None
+    return sorted((entry for entry in entries if entry is not None), key=lambda entry: entry["repo"])
+
+
+def po_inputs(po_dir: str, po_names: List[str], hash_cache: FileHashCache) -> List[Dict[str, str]]:
+    """Return [{po, sha256}] over each PO directory's files, or its .pobundle when only the bundle exists."""
+    entries: List[Dict[str, str]] = []
+    for po_name in po_names:
+        po_path = os.path.join(po_dir, po_name)
+        files: List[Tuple[str, str]] = []
+        if os.path.isdir(po_path):
+            for current_root, dirs, names in os.walk(po_path):
+                dirs.sort()
+                for name in sorted(names):
+                    path = os.path.join(current_root, name)
+                    rel = os.path.relpath(path, po_path).replace(os.sep, "/")
+                    files.append((rel, _file_digest(path, hash_cache)))
+        elif os.path.isfile(bundle_path_for(po_path)):
+            files.append(("", _file_digest(bundle_path_for(po_path), hash_cache)))
+        entries.append({"po": po_name, "sha256": _digest(files)})
+    return entries
+
+
+def build_fingerprint(inputs: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Return (fingerprint, summary) for the collected inputs.
+
+    The summary keeps repository states and PO hashes but only digests of the
+    config and commands, which may carry credentials.
+    """
+    summary = {
+        "repositories": inputs.get("repositories", []),
+        "pos": inputs.get("pos", []),
+        "config": _digest(inputs.get("config", {})),
+        "command": _digest(inputs.get("command", {})),
+    }
+    return _digest(summary), summary
+
+
+def artifact_files(manifest: Dict[str, Any]) -> List[Tuple[str, int, str]]:
+    """Return (path below the artifacts root, size, sha256) for every file an artifacts manifest records."""
+    files: List[Tuple[str, int, str]] = []
+    for item in manifest.get("items") or []:
+        dest = str(item.get("dest") or "")
+        if isinstance(item.get("files"), list):
+            files.extend(
+                (os.path.join(dest, entry.get("path", "")), entry.get("size", -1), str(entry.get("sha256") or ""))
+                for entry in item["files"]
+            )
+        else:
+            files.append((dest, item.get("size", -1), str(item.get("sha256") or "")))
+    return files
+
+
+def load_artifacts_manifest(artifacts_root: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(artifacts_root, "manifest.json"), "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def artifacts_intact(artifacts_root: str, manifest: Dict[str, Any], hash_cache: FileHashCache) -> bool:
+    """True when every recorded artifact still exists with its recorded size and sha256."""
+    files = artifact_files(manifest)
+    if not files:
+        return False
+    for rel, size, sha256 in files:
+        path = os.path.join(artifacts_root, rel)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if not sha256 or st.st_size != size or hash_cache.sha256(path, st) != sha256:
+            return False
+    return True
+
+
+def write_record(build_root: str, payload: Dict[str, Any]) -> None:
+    write_json_atomic(os.path.join(build_root, FINGERPRINT_FILE), {"schema_version": FINGERPRINT_VERSION, **payload})
+
+
+def find_reusable_build(
+    project_cache: str, fingerprint: str, current_build_root: str, hash_cache: FileHashCache
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Return (build_root, artifacts manifest) of the newest matching build whose artifacts are intact."""
+    try:
+        names = sorted(os.listdir(project_cache), reverse=True)
+    except OSError:
+        return None
+    for name in names:
+        build_root = os.path.join(project_cache, name)
+        if os.path.abspath(build_root) == os.path.abspath(current_build_root):
+            continue
+        try:
+            with open(os.path.join(build_root, FINGERPRINT_FILE), "r", encoding="utf-8") as handle:
+                record = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(record, dict) or record.get("fingerprint") != fingerprint:
+            continue
+        artifacts_root = os.path.join(build_root, "artifacts")
+        manifest = load_artifacts_manifest(artifacts_root)
+        if manifest is not None and artifacts_intact(artifacts_root, manifest, hash_cache):
+            return build_root, manifest
+    return None
@@ -0,0 +1,298 @@
+"""
+Tar writer for project_diff archives with selectable compression.
+
+Entries can be added from bytes, from a file or directory on disk, or from a
+stream of known size (for example a `git cat-file --batch` blob), so a diff can
+be archived without first materializing it below `.cache/build`. Writes are
+serialized by a lock, which lets several repositories be captured in parallel
+into one archive. `zstd` compression uses the optional `zstandard` package and
+compresses on all cores.
+
+DiffObjectStore offers the same interface but stores every file once under
+`.cache/build/objects/<sha256[:2]>/<sha256>` and records the build as a JSON
+manifest of entries; export_manifest turns a manifest back into a tarball.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import tarfile
+import tempfile
+import threading
+import time
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+from src.plugins.po_plugins.utils import FileHashCache, write_json_atomic
+
+COMPRESSIONS = ("none", "gz", "xz", "zstd")
+INSTALL_HINT = 'pip install -e ".[zstd]"'
+_SUFFIXES = {"none": ".tar", "gz": ".tar.gz", "xz": ".tar.xz", "zstd": ".tar.zst"}
+_TAR_MODES = {"none": "w", "gz": "w:gz", "xz": "w:xz"}
+_ZSTD_LEVEL = 3
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+_COPY_CHUNK_SIZE = 1024 * 1024
+# Streams up to this size are hashed in memory, so content already in the store is never written.
+_SPOOL_LIMIT = 16 * 1024 * 1024
+
+
+def normalise_compression(value: Any) -> str:
+    """Return one of COMPRESSIONS ("gz" when unset), or "" for an unknown value."""
+    if value is None or value is True or str(value).strip() == "":
+        return "gz"
+    text = str(value).strip().lower()
+    aliases = {"tar": "none", "off": "none", "gzip": "gz", "zst": "zstd"}
+    text = aliases.get(text, text)
+    return text if text in COMPRESSIONS else ""
+
+
+def archive_suffix(compress: str) -> str:
+    return _SUFFIXES[compress]
+
+
+def compression_available(compress: str) -> bool:
+    """False only for zstd without the `zstandard` package."""
+    return compress != "zstd" or importlib.util.find_spec("zstandard") is not None
+
+
+def _skip_git_dirs(info: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+    return None if info.name.rsplit("/", 1)[-1] == ".git" else info
+
+
+class DiffArchive:
+    """Thread-safe tar writer; use as a context manager."""
+
+    def __init__(self, path: str, compress: str = "gz") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = int(time.time())
+        self._zstd_writer: Optional[IO[bytes]] = None
+        if compress == "zstd":
+            import zstandard  # pylint: disable=import-outside-toplevel
+
+            self._zstd_writer = zstandard.ZstdCompressor(level=_ZSTD_LEVEL, threads=-1).stream_writer(
+                open(path, "wb")  # pylint: disable=consider-using-with
+            )
+            self._tar = tarfile.open(fileobj=self._zstd_writer, mode="w|", dereference=True)
+        else:
+            self._tar = tarfile.open(path, _TAR_MODES[compress], dereference=True)
+
+    def __enter__(self) -> "DiffArchive":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self._tar.close()
+        finally:
+            if self._zstd_writer is not None:
+                self._zstd_writer.close()
+
+    def _info(self, arcname: str, size: int, mode: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(arcname)
+        info.size = size
+        info.mode = mode
+        info.mtime = self._mtime
+        return info
+
+    def add_dir(self, arcname: str) -> None:
+        info = self._info(arcname, 0, 0o755)
+        info.type = tarfile.DIRTYPE
+        with self._lock:
+            self._tar.addfile(info)
+
+    def add_bytes(self, arcname: str, data: bytes, mode: int = 0o644) -> None:
+        with self._lock:
+            self._tar.addfile(self._info(arcname, len(data), mode), io.BytesIO(data))
+
+    def add_stream(self, arcname: str, size: int, stream: IO[bytes], mode: int = 0o644) -> None:
+        """Copy exactly `size` bytes from stream into a new entry."""
+        with self._lock:
+            self._tar.addfile(self._info(arcname, size, mode), stream)
+
+    def add_path(self, arcname: str, path: str) -> None:
+        """Add a file or directory tree from disk, following symlinks and skipping .git directories."""
+        with self._lock:
+            self._tar.add(path, arcname=arcname, filter=_skip_git_dirs)
+
+
+class DiffObjectStore:
+    """Content-addressed sink with the DiffArchive interface; close() writes the manifest."""
+
+    def __init__(
+        self,
+        objects_dir: str,
+        manifest_path: str,
+        meta: Dict[str, Any],
+        hash_cache: Optional[FileHashCache] = None,
+    ) -> None:
+        self.objects_dir = objects_dir
+        self.manifest_path = manifest_path
+        self._meta = dict(meta)
+        self._hash_cache = hash_cache
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self.stored = 0
+        self.reused = 0
+        self.bytes_written = 0
+
+    def __enter__(self) -> "DiffObjectStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _record(self, arcname: str, mode: int, digest: str = "", size: int = 0) -> None:
+        entry: Dict[str, Any] = {"path": arcname, "type": "file" if digest else "dir", "mode": mode}
+        if digest:
+            entry.update({"sha256": digest, "size": size})
+        with self._lock:
+            self._entries.append(entry)
+
+    def _count(self, written: int) -> None:
+        with self._lock:
+            if written:
+                self.stored += 1
+                self.bytes_written += written
+            else:
+                self.reused += 1
+
+    def _store_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.object_path(digest)
+        if os.path.exists(target):
+            self._count(0)
+            return digest
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".obj.", dir=os.path.dirname(target))
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, target)
+        self._count(len(data))
+        return digest
+
+    def _store_copy(self, stream: IO[bytes], size: Optional[int]) -> Tuple[str, int]:
+        """Copy stream (exactly `size` bytes when given) into the store, hashing on the way."""
+        os.makedirs(self.objects_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".obj.", dir=self.objects_dir)
+        digest = hashlib.sha256()
+        copied = 0
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                while size is None or copied < size:
+                    want = _COPY_CHUNK_SIZE if size is None else min(_COPY_CHUNK_SIZE, size - copied)
+                    chunk = stream.read(want)
+                    if not chunk:
+                        if size is not None:
+                            raise OSError("unexpected end of data")
+                        break
+                    digest.update(chunk)
+                    handle.write(chunk)
+                    copied += len(chunk)
+            target = self.object_path(digest.hexdigest())
+            if os.path.exists(target):
+                os.unlink(tmp_path)
+                self._count(0)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+                self._count(copied)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest.hexdigest(), copied
+
+    def _store_file(self, path: str) -> Tuple[str, int]:
+        st = os.stat(path)
+        if self._hash_cache is not None:
+            digest = self._hash_cache.sha256(path, st)
+            if os.path.exists(self.object_path(digest)):
+                self._count(0)
+                return digest, st.st_size
+        # Hash while copying so the object name always matches what was stored.
+        with open(path, "rb") as handle:
+            return self._store_copy(handle, None)
+
+    def add_dir(self, arcname: str) -> None:
+        self._record(arcname, 0o755)
+
+    def add_bytes(self, arcname: str, data: bytes, mode: int = 0o644) -> None:
+        self._record(arcname, mode, self._store_bytes(data), len(data))
+
+    def add_stream(self, arcname: str, size: int, stream: IO[bytes], mode: int = 0o644) -> None:
+        if size <= _SPOOL_LIMIT:
+            data = stream.read(size)
+            if len(data) != size:
+                raise OSError("unexpected end of data")
+            self.add_bytes(arcname, data, mode)
+            return
+        digest, copied = self._store_copy(stream, size)
+        self._record(arcname, mode, digest, copied)
+
+    def add_path(self, arcname: str, path: str) -> None:
+        """Store a file or directory tree from disk, following symlinks and skipping .git directories."""
+        if not os.path.isdir(path):
+            digest, size = self._store_file(path)
+            self._record(arcname, os.stat(path).st_mode & 0o777, digest, size)
+            return
+        self._record(arcname, 0o755)
+        for root, dirs, files in os.walk(path, followlinks=True):
+            dirs[:] = sorted(name for name in dirs if name != ".git")
+            rel_root = os.path.relpath(root, path).replace(os.sep, "/")
+            prefix = arcname if rel_root == "." else f"{arcname}/{rel_root}"
+            for name in dirs:
+                self._record(f"{prefix}/{name}", 0o755)
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest, size = self._store_file(file_path)
+                self._record(f"{prefix}/{name}", os.stat(file_path).st_mode & 0o777, digest, size)
+
+    def close(self) -> None:
+        with self._lock:
+            entries = sorted(self._entries, key=lambda entry: entry["path"])
+        objects = os.path.relpath(self.objects_dir, os.path.dirname(os.path.abspath(self.manifest_path)))
+        payload = {"schema_version": MANIFEST_VERSION, **self._meta}
+        payload.update({"objects": objects.replace(os.sep, "/"), "entries": entries})
+        write_json_atomic(self.manifest_path, payload)
+
+
+DiffSink = Union[DiffArchive, DiffObjectStore]
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """Read a DiffObjectStore manifest; raise ValueError when it is not one."""
+    with open(manifest_path, "r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if not isinstance(manifest, dict) or manifest.get("schema_version") != MANIFEST_VERSION:
+        raise ValueError(f"{manifest_path}: not a diff manifest")
+    if not isinstance(manifest.get("entries"), list):
+        raise ValueError(f"{manifest_path}: manifest has no entries")
+    return manifest
+
+
+def export_manifest(manifest_path: str, archive_path: str, compress: str = "gz") -> int:
+    """Rebuild the tarball a manifest describes from the object store; return the number of entries."""
+    manifest = load_manifest(manifest_path)
+    objects_dir = os.path.join(os.path.dirname(os.path.abspath(manifest_path)), manifest.get("objects") or "")
+    with DiffArchive(archive_path, compress) as archive:
+        for entry in manifest["entries"]:
+            if entry.get("type") == "dir":
+                archive.add_dir(entry["path"])
+                continue
+            digest = str(entry.get("sha256") or "")
+            object_file = os.path.join(objects_dir, digest[:2], digest)
+            with open(object_file, "rb") as handle:
+                if os.fstat(handle.fileno()).st_size != entry.get("size"):
+                    raise ValueError(f"{object_file}: size does not match the manifest")
+                archive.add_stream(entry["path"], entry["size"], handle, mode=entry.get("mode", 0o644))
+    return len(manifest["entries"])
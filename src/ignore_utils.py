@@ -0,0 +1,208 @@
+"""
+Compiled ignore-pattern matching for workspace scans (po_new / po_update).
+
+Two pattern sources are supported:
+
+- `PROJECT_PO_IGNORE`: space separated patterns. Plain words (no wildcard)
+  match any path containing them; wildcard patterns use fnmatch semantics
+  (`*` may cross `/`).
+- `.gitignore` lines from the workspace root, with gitignore semantics:
+  comments, negation (`!`), anchoring (leading or inner `/`), directory-only
+  patterns (trailing `/`) and `**`. As in git, a negation cannot re-include
+  a file whose parent directory is excluded.
+
+Patterns are translated to regular expressions once and combined, so the
+common "nothing matches" case costs a single regex search per path.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+_WILDCARD_CHARS = ("*", "?", "[", "]")
+
+
+def _translate_glob(glob: str) -> str:
+    """Translate a gitignore glob body (no leading/trailing slash) into a regex fragment."""
+    out: List[str] = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        char = glob[i]
+        if char == "*":
+            if glob.startswith("**", i):
+                at_segment_start = i == 0 or glob[i - 1] == "/"
+                after = i + 2
+                if at_segment_start and after < n and glob[after] == "/":
+                    out.append("(?:.*/)?")
+                    i = after + 1
+                    continue
+                if at_segment_start and after == n:
+                    out.append(".*")
+                    i = after
+                    continue
+            out.append("[^/]*")
+            i += 1
+        elif char == "?":
+            out.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = glob.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+                i += 1
+                continue
+            body = glob[i + 1 : end]
+            if body[:1] in ("!", "^"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        elif char == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(char))
+            i += 1
+    return "".join(out)
+
+
+def _gitignore_rule(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """Translate one .gitignore line into (regex for the path itself, negated, dir_only), or None."""
+    line = line.rstrip("\n").rstrip("\r")
+    if not line or line.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped.
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/") if dir_only else line
+    # A leading or inner slash anchors the pattern; a trailing one only marks a directory.
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"{prefix}{_translate_glob(line)}", negated, dir_only
+
+
+def gitignore_pattern_to_regex(line: str) -> Optional[Tuple[str, bool]]:
+    """
+    Translate one .gitignore line into (regex, negated), or None for blanks/comments.
+
+    The regex matches a path relative to the ignore file's directory when the
+    pattern matches the path itself or one of its parent directories.
+    """
+    rule = _gitignore_rule(line)
+    if rule is None:
+        return None
+    regex, negated, dir_only = rule
+    # Directory-only patterns can only match a parent directory of a file path.
+    suffix = "/.*" if dir_only else "(?:/.*)?"
+    return f"{regex}{suffix}", negated
+
+
+def po_ignore_pattern_to_regex(pattern: str) -> str:
+    """Translate one PROJECT_PO_IGNORE entry (legacy containment/fnmatch semantics) into a regex."""
+    if any(char in pattern for char in _WILDCARD_CHARS):
+        return fnmatch.translate(pattern)
+    return f".*{re.escape(pattern)}.*"
+
+
+class IgnoreMatcher:
+    """Decide whether a repository file is ignored by PROJECT_PO_IGNORE or .gitignore patterns."""
+
+    def __init__(self, po_ignore_patterns: Iterable[str] = (), gitignore_lines: Iterable[str] = ()) -> None:
+        self.po_ignore_patterns = [p for p in po_ignore_patterns if p]
+        self._po_ignore: Optional[Pattern[str]] = None
+        if self.po_ignore_patterns:
+            combined = "|".join(f"(?:{po_ignore_pattern_to_regex(p)})" for p in self.po_ignore_patterns)
+            self._po_ignore = re.compile(f"(?s:{combined})\\Z")
+
+        rules: List[Tuple[Pattern[str], bool, bool]] = []
+        any_patterns: List[str] = []
+        for line in gitignore_lines:
+            translated = gitignore_pattern_to_regex(line)
+            rule = _gitignore_rule(line)
+            if translated is None or rule is None:
+                continue
+            regex, negated, dir_only = rule
+            rules.append((re.compile(f"(?s:{regex})\\Z"), negated, dir_only))
+            any_patterns.append(f"(?:(?s:{translated[0]})\\Z)")
+        self._git_rules = rules
+        self._git_any: Optional[Pattern[str]] = None
+        self._git_has_negation = any(negated for _rule, negated, _dir_only in rules)
+        if rules:
+            self._git_any = re.compile("|".join(any_patterns))
+
+    def __bool__(self) -> bool:
+        return bool(self._po_ignore or self._git_rules)
+
+    def _git_ignored(self, path: str) -> bool:
+        if self._git_any is None or not self._git_any.match(path):
+            return False
+        if not self._git_has_negation:
+            return True
+        # Walk down from the top: the last matching rule decides each component, and
+        # like git, a file below an excluded directory cannot be re-included.
+        parts = path.split("/")
+        for end in range(1, len(parts) + 1):
+            is_dir = end < len(parts)
+            candidate = "/".join(parts[:end])
+            ignored = False
+            for rule, negated, dir_only in reversed(self._git_rules):
+                if (is_dir or not dir_only) and rule.match(candidate):
+                    ignored = not negated
+                    break
+            if ignored or not is_dir:
+                return ignored
+        return False
+
+    def is_ignored(self, file_path: str, repo_name: str = "root") -> bool:
+        """Match the repo-relative path and the repo-prefixed workspace path."""
+        paths = [file_path]
+        if repo_name != "root":
+            paths.append(f"{repo_name}/{file_path}")
+        for path in paths:
+            if self._po_ignore is not None and self._po_ignore.match(path):
+                return True
+            if self._git_ignored(path):
+                return True
+        return False
+
+
+@lru_cache(maxsize=32)
+def _load_matcher(po_ignore: str, gitignore_path: str, _gitignore_mtime_ns: int) -> IgnoreMatcher:
+    lines: List[str] = []
+    if gitignore_path:
+        with open(gitignore_path, "r", encoding="utf-8") as handle:
+            lines = handle.readlines()
+    return IgnoreMatcher(po_ignore.split(), lines)
+
+
+def load_ignore_matcher(po_ignore: str = "", workspace_root: Optional[str] = None) -> IgnoreMatcher:
+    """
+    Return a compiled matcher for PROJECT_PO_IGNORE plus `<workspace_root>/.gitignore`.
+
+    Matchers are cached by pattern text and .gitignore mtime, so repeated
+    scans in one process share the compiled patterns.
+    """
+    gitignore_path = os.path.join(workspace_root or os.getcwd(), ".gitignore")
+    try:
+        mtime_ns = os.stat(gitignore_path).st_mtime_ns
+    except OSError:
+        gitignore_path, mtime_ns = "", 0
+    try:
+        return _load_matcher(str(po_ignore or "").strip(), gitignore_path, mtime_ns)
+    except OSError:
+        return _load_matcher(str(po_ignore or "").strip(), "", 0)
@@ -45,11 +45,17 @@ _REDACTION_RULES: list[tuple[re.Pattern[str], str]] = [
 ]
 
 
+# Every _REDACTION_RULES match contains one of these; strings without a hit are returned as-is.
+_REDACTION_HINT = re.compile(r"(?i)ghp_|github_pat_|akia|asia|bearer|token|secret|password|api[_-]?key|://[^/@\s]*@")
+
+
 def redact_secrets(text: Any) -> str:
     """Best-effort secret redaction for logs. Keeps output readable."""
     if text is None:
         return ""
     value = str(text)
+    if not _REDACTION_HINT.search(value):
+        return value
     for pattern, replacement in _REDACTION_RULES:
         value = pattern.sub(replacement, value)
     return value
@@ -2,7 +2,8 @@
 Utilities for emitting machine-readable execution plans.
 
 This is intentionally lightweight and has no side effects beyond writing the
-requested plan JSON to stdout or a file.
+requested plan JSON to stdout or a file. JSON is encoded incrementally and
+redacted while it is written, so large plans never exist as one string.
 """
 
 from __future__ import annotations
@@ -10,12 +11,14 @@ from __future__ import annotations
 import json
 import os
 import sys
-from typing import Any, Dict, Optional, Tuple
+from json.encoder import encode_basestring
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
 
 from src.log_manager import redact_secrets
 
 _TRUTHY = {"1", "true", "yes", "y", "on"}
 _FALSY = {"0", "false", "no", "n", "off"}
+_WRITE_BUFFER_CHARS = 64 * 1024
 
 
 def parse_emit_plan(value: Any) -> Tuple[bool, Optional[str]]:
@@ -36,27 +39,95 @@ def parse_emit_plan(value: Any) -> Tuple[bool, Optional[str]]:
     return True, text
 
 
-def _redact_payload(value: Any) -> Any:
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return redact_secrets(value)
-    if isinstance(value, list):
-        return [_redact_payload(v) for v in value]
-    if isinstance(value, dict):
-        return {k: _redact_payload(v) for k, v in value.items()}
-    return value
+def _json_key(key: Any) -> str:
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
 
 
-def emit_plan_json(payload: Dict[str, Any], emit_plan: Any) -> bool:
+def iter_json(value: Any, *, compact: bool = False, redact: bool = True) -> Iterator[str]:
+    """
+    Encode `value` as JSON chunks, redacting string values while walking.
+
+    Output matches `json.dumps(value, indent=2, ensure_ascii=False)` (or the
+    compact `separators=(",", ":")` form) without building a redacted copy or
+    one large string.
+    """
+    key_sep = ":" if compact else ": "
+
+    def _walk(item: Any, level: int) -> Iterator[str]:
+        if isinstance(item, str):
+            yield encode_basestring(redact_secrets(item) if redact else item)
+        elif item is None:
+            yield "null"
+        elif item is True:
+            yield "true"
+        elif item is False:
+            yield "false"
+        elif isinstance(item, int):
+            yield int.__repr__(item)
+        elif isinstance(item, float):
+            yield json.dumps(item)
+        elif isinstance(item, dict):
+            if not item:
+                yield "{}"
+                return
+            newline = "" if compact else "\n" + "  " * (level + 1)
+            first = True
+            for key, child in item.items():
+                yield ("{" if first else ",") + newline + encode_basestring(_json_key(key)) + key_sep
+                first = False
+                yield from _walk(child, level + 1)
+            yield ("" if compact else "\n" + "  " * level) + "}"
+        elif isinstance(item, (list, tuple)):
+            if not item:
+                yield "[]"
+                return
+            newline = "" if compact else "\n" + "  " * (level + 1)
+            for index, child in enumerate(item):
+                yield ("[" if index == 0 else ",") + newline
+                yield from _walk(child, level + 1)
+            yield ("" if compact else "\n" + "  " * level) + "]"
+        else:
+            raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+
+    return _walk(value, 0)
+
+
+def write_json(value: Any, handle: IO[str], *, compact: bool = False, redact: bool = True) -> None:
+    """Stream `value` as JSON plus a trailing newline to an open text handle."""
+    buffer: List[str] = []
+    size = 0
+    for chunk in iter_json(value, compact=compact, redact=redact):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= _WRITE_BUFFER_CHARS:
+            handle.write("".join(buffer))
+            buffer, size = [], 0
+    buffer.append("\n")
+    handle.write("".join(buffer))
+
+
+def print_json(value: Any, *, compact: bool = False, redact: bool = True) -> None:
+    """Stream `value` as redacted JSON to stdout."""
+    write_json(value, sys.stdout, compact=compact, redact=redact)
+    sys.stdout.flush()
+
+
+def emit_plan_json(payload: Dict[str, Any], emit_plan: Any, *, compact: bool = False) -> bool:
     """Emit a redacted JSON payload to stdout or to the provided path."""
     enabled, out_path = parse_emit_plan(emit_plan)
     if not enabled:
         return False
 
-    redacted = _redact_payload(payload)
-    text = json.dumps(redacted, indent=2, ensure_ascii=False) + "\n"
-
     if out_path:
         out_path = os.path.expanduser(out_path)
         out_dir = os.path.dirname(out_path)
@@ -64,9 +135,9 @@ def emit_plan_json(payload: Dict[str, Any], emit_plan: Any) -> bool:
             os.makedirs(out_dir, exist_ok=True)
         tmp_path = f"{out_path}.tmp"
         with open(tmp_path, "w", encoding="utf-8") as handle:
-            handle.write(text)
+            write_json(payload, handle, compact=compact)
         os.replace(tmp_path, out_path)
         return True
 
-    sys.stdout.write(text)
+    print_json(payload, compact=compact)
     return True
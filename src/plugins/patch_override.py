@@ -8,12 +8,15 @@ import os
 import re
 import shutil
 import subprocess
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from src.ignore_utils import load_ignore_matcher
 from src.log_manager import log
 from src.operations.registry import register
-from src.plan_utils import emit_plan_json, parse_emit_plan
+from src.plan_utils import emit_plan_json, parse_emit_plan, print_json, write_json
 from src.plugins.po_plugins.registry import (
     APPLY_PHASE_GLOBAL_PRE,
     APPLY_PHASE_PER_PO,
@@ -21,11 +24,21 @@ from src.plugins.po_plugins.registry import (
     REVERT_PHASE_PER_PO,
     get_po_plugins,
 )
+from src.plugins.po_plugins.bundle import bundle_path_for, pack_po, po_exists, resolve_po_path, unpack_po
+from src.plugins.po_plugins.materialized import MaterializedCache
 from src.plugins.po_plugins.runtime import PoPluginContext, PoPluginRuntime
-from src.plugins.po_plugins.utils import extract_patch_targets
+from src.plugins.po_plugins.utils import (
+    FileHashCache,
+    PatchHeaderCache,
+    file_sha256,
+    list_po_files,
+    read_patch_header,
+    safe_cache_segment,
+)
 from src.plugins.po_plugins.utils import (
     po_applied_record_path as _po_applied_record_path,
 )
+from src.utils import parse_jobs
 
 # from src.profiler import auto_profile  # unused
 
@@ -126,14 +139,175 @@ def _repo_name_from_po_relpath(rel_path: str) -> str:
     return os.path.join(*parts[:-1])
 
 
-def _read_patch_targets_best_effort(abs_patch_path: str) -> List[str]:
+def _patch_header_cache(env: Dict[str, Any]) -> PatchHeaderCache:
+    return PatchHeaderCache(str(env.get("root_path") or os.getcwd()))
+
+
+def _read_patch_targets_best_effort(abs_patch_path: str, patch_headers: PatchHeaderCache) -> List[str]:
     try:
-        with open(abs_patch_path, "r", encoding="utf-8") as handle:
-            return extract_patch_targets(handle.read())
+        return read_patch_header(abs_patch_path, patch_headers)["targets"]
     except OSError:
         return []
 
 
+def _read_commit_meta_best_effort(abs_patch_path: str, patch_headers: PatchHeaderCache) -> Tuple[List[str], str]:
+    """Return (targets, original_commit_sha) for a commit patch; empty values on error."""
+    try:
+        header = read_patch_header(abs_patch_path, patch_headers)
+    except OSError:
+        return [], ""
+    return header["targets"], header["original_commit_sha"] or ""
+
+
+def _file_sha256_best_effort(path: str) -> str:
+    try:
+        return file_sha256(path)
+    except OSError:
+        return ""
+
+
+def _repo_head_best_effort(repo_path: str) -> str:
+    """Return HEAD sha for a repo, or an empty string when it cannot be resolved."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return ""
+    if result.returncode != 0:
+        return ""
+    return (result.stdout or "").strip()
+
+
+class _PoPlanIndex:
+    """
+    Memoizes PO directory listings, PO file hashes and repository HEADs.
+
+    One index can be shared while building plans for several projects of a
+    board, so POs enabled by many projects are only listed and hashed once.
+    """
+
+    def __init__(self) -> None:
+        self._files: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._heads: Dict[str, str] = {}
+
+    def list_files(self, plugin: Any, po_path: str, runtime: PoPluginRuntime) -> Dict[str, Any]:
+        key = (plugin.name, po_path)
+        if key not in self._files:
+            self._files[key] = plugin.list_files(po_path, runtime) or {}
+        # Callers replace (never mutate) the lists when filtering exclusions.
+        return dict(self._files[key])
+
+    def sha256(self, path: str) -> str:
+        if path not in self._hashes:
+            self._hashes[path] = _file_sha256_best_effort(path)
+        return self._hashes[path]
+
+    def head(self, repo_path: str) -> str:
+        if repo_path not in self._heads:
+            self._heads[repo_path] = _repo_head_best_effort(repo_path)
+        return self._heads[repo_path]
+
+
+def _plan_repositories(
+    repo_entries: List[Tuple[str, str]], workspace_root: str, index: _PoPlanIndex
+) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": repo_name,
+            "path": os.path.relpath(repo_path, start=workspace_root),
+            "head": index.head(repo_path),
+        }
+        for repo_path, repo_name in repo_entries
+    ]
+
+
+def _load_po_plan(path: str, operation: str, project_name: str) -> Optional[Dict[str, Any]]:
+    """Load a plan emitted via --emit-plan and check it targets this operation/project."""
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            plan = jsonlib.load(handle)
+    except (OSError, ValueError) as exc:
+        log.error("Failed to load plan '%s': %s", path, exc)
+        return None
+    if not isinstance(plan, dict) or plan.get("schema_version") != 1:
+        log.error("Unsupported plan format in '%s'", path)
+        return None
+    if plan.get("operation") != operation:
+        log.error("Plan '%s' was emitted for '%s', not '%s'", path, plan.get("operation"), operation)
+        return None
+    if plan.get("project_name") != project_name:
+        log.error("Plan '%s' was emitted for project '%s', not '%s'", path, plan.get("project_name"), project_name)
+        return None
+    return plan
+
+
+def _resolve_po_path(po_dir: str, po_name: str) -> Optional[str]:
+    """Return the directory to read a PO from, extracting `<po_name>.pobundle` when only the bundle exists."""
+    po_path = os.path.join(po_dir, po_name)
+    try:
+        return resolve_po_path(po_path)
+    except (OSError, ValueError, KeyError) as e:
+        log.error("Failed to read PO bundle '%s': %s", bundle_path_for(po_path), e)
+        return None
+
+
+def _verify_po_plan(plan: Dict[str, Any], po_dir: str, runtime: PoPluginRuntime) -> bool:
+    """Check that PO files and repository HEADs still match what the plan recorded."""
+    ok = True
+    for repo in plan.get("repositories") or []:
+        repo_name = repo.get("name", "")
+        repo_root = runtime.repo_map.get(repo_name)
+        if not repo_root:
+            log.error("Plan repository '%s' is not part of the current workspace", repo_name)
+            ok = False
+            continue
+        expected_head = repo.get("head") or ""
+        if expected_head and _repo_head_best_effort(repo_root) != expected_head:
+            log.error("Repository '%s' HEAD changed since the plan was emitted (expected %s)", repo_name, expected_head)
+            ok = False
+
+    po_paths: Dict[str, str] = {}
+    for repo_actions in plan.get("per_repo_actions") or []:
+        for action in repo_actions.get("actions") or []:
+            expected_sha = action.get("sha256")
+            source = action.get("source")
+            if not expected_sha or not source:
+                continue
+            po_name = action.get("po", "")
+            if po_name not in po_paths:
+                po_paths[po_name] = _resolve_po_path(po_dir, po_name) or os.path.join(po_dir, po_name)
+            source_abs = os.path.join(po_paths[po_name], source)
+            if _file_sha256_best_effort(source_abs) != expected_sha:
+                log.error("PO file '%s' changed since the plan was emitted", os.path.join(action.get("po", ""), source))
+                ok = False
+    return ok
+
+
+def _planned_po_files(plan: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, Any]]]:
+    """Return per-PO planned file lists and per-PO action metadata keyed by source."""
+    planned_files: Dict[str, Dict[str, List[str]]] = {}
+    for item in plan.get("pos") or []:
+        plugins = item.get("plugins") or {}
+        planned_files[item["po"]] = {
+            "commits": list((plugins.get("commits") or {}).get("commit_files") or []),
+            "patches": list((plugins.get("patches") or {}).get("patch_files") or []),
+            "overrides": list((plugins.get("overrides") or {}).get("override_files") or []),
+        }
+
+    planned_meta: Dict[str, Dict[str, Any]] = {po_name: {} for po_name in planned_files}
+    for repo_actions in plan.get("per_repo_actions") or []:
+        for action in repo_actions.get("actions") or []:
+            if action.get("source"):
+                planned_meta.setdefault(action.get("po", ""), {})[action["source"]] = action
+    return planned_files, planned_meta
+
+
 def _split_override_repo_prefix(rel_path: str, repo_names: List[str]) -> Tuple[str, str]:
     """Return (repo_name, dest_rel_in_repo) for an overrides rel_path."""
     root_prefix = f"root{os.sep}"
@@ -150,6 +324,88 @@ def _split_override_repo_prefix(rel_path: str, repo_names: List[str]) -> Tuple[s
     return "root", rel_path
 
 
+_PO_FILE_KINDS = ("commits", "patches", "overrides")
+
+
+def _build_po_repo_index(po_paths: Dict[str, str], repo_names: List[str]) -> Dict[str, Any]:
+    """
+    Index which repositories each PO touches, from its file listing.
+
+    Commit and patch files map to repositories by directory, override files by
+    repo-prefix resolution (longest repository name first). Returns:
+      files:       {po: {kind: {repo: [relpaths]}}}
+      po_to_repos: {po: [repos]}
+      repo_to_pos: {repo: [pos]}
+    """
+    files: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+    po_to_repos: Dict[str, List[str]] = {}
+    repo_to_pos: Dict[str, List[str]] = {}
+    for po_name, po_path in po_paths.items():
+        by_kind: Dict[str, Dict[str, List[str]]] = {kind: {} for kind in _PO_FILE_KINDS}
+        for kind in _PO_FILE_KINDS:
+            for rel_path in list_po_files(os.path.join(po_path, kind)):
+                if kind == "overrides":
+                    repo_name, _dest_rel = _split_override_repo_prefix(rel_path, repo_names)
+                else:
+                    repo_name = _repo_name_from_po_relpath(rel_path)
+                by_kind[kind].setdefault(repo_name, []).append(rel_path)
+        files[po_name] = by_kind
+        repos = sorted({repo_name for per_repo in by_kind.values() for repo_name in per_repo})
+        po_to_repos[po_name] = repos
+        for repo_name in repos:
+            repo_to_pos.setdefault(repo_name, []).append(po_name)
+    return {"files": files, "po_to_repos": po_to_repos, "repo_to_pos": repo_to_pos}
+
+
+def _scope_pos_to_repos(
+    repo: str, apply_pos: List[str], po_dir: str, runtime: PoPluginRuntime
+) -> Optional[Tuple[List[str], Dict[str, Dict[str, List[str]]], Set[str]]]:
+    """
+    Resolve `--repo` for po_apply/po_revert.
+
+    Returns (POs touching the selected repositories, their per-kind file lists
+    restricted to those repositories, selected repository names), or None on error.
+    """
+    selected = _parse_po_filter(repo)
+    unknown = [name for name in selected if name not in runtime.repo_map]
+    if unknown:
+        log.error("Unknown repository for --repo: %s", ", ".join(unknown))
+        return None
+
+    po_paths: Dict[str, str] = {}
+    for po_name in apply_pos:
+        po_path = _resolve_po_path(po_dir, po_name)
+        if po_path is None:
+            return None
+        po_paths[po_name] = po_path
+    repo_names = sorted([name for name in runtime.repo_map if name != "root"], key=len, reverse=True)
+    index = _build_po_repo_index(po_paths, repo_names)
+
+    repo_filter = set(selected)
+    scoped_pos: List[str] = []
+    scoped_files: Dict[str, Dict[str, List[str]]] = {}
+    for po_name in apply_pos:
+        if not repo_filter.intersection(index["po_to_repos"][po_name]):
+            continue
+        scoped_pos.append(po_name)
+        scoped_files[po_name] = {
+            kind: sorted(
+                rel_path
+                for repo_name, rel_paths in index["files"][po_name][kind].items()
+                if repo_name in repo_filter
+                for rel_path in rel_paths
+            )
+            for kind in _PO_FILE_KINDS
+        }
+    log.info(
+        "--repo %s: %d of %d PO(s) touch the selected repositories",
+        ", ".join(selected),
+        len(scoped_pos),
+        len(apply_pos),
+    )
+    return scoped_pos, scoped_files, repo_filter
+
+
 def _per_repo_plan_actions(
     repo_entries: List[Tuple[str, str]],
     actions_by_repo: Dict[str, List[Dict[str, Any]]],
@@ -170,8 +426,20 @@ def build_po_apply_plan(
     force: bool = False,
     reapply: bool = False,
     po: str = "",
+    index: Optional[_PoPlanIndex] = None,
+    patch_headers: Optional[PatchHeaderCache] = None,
 ) -> Dict[str, Any]:
-    """Build a machine-readable plan for po_apply without mutating repositories."""
+    """
+    Build a machine-readable plan for po_apply without mutating repositories.
+
+    Patch headers are read through `patch_headers`; without one, a cache under
+    the workspace root is opened and saved once the plan is built.
+    """
+    if index is None:
+        index = _PoPlanIndex()
+    owns_patch_headers = patch_headers is None
+    if patch_headers is None:
+        patch_headers = _patch_header_cache(env)
     projects_path = env["projects_path"]
     project_info = projects_info.get(project_name, {}) if isinstance(projects_info, dict) else {}
     project_cfg = project_info.get("config", {}) if isinstance(project_info, dict) else {}
@@ -213,11 +481,11 @@ def build_po_apply_plan(
 
     po_items: List[Dict[str, Any]] = []
     for po_name in apply_pos:
-        po_path = os.path.join(po_dir, po_name)
+        po_path = _resolve_po_path(po_dir, po_name) or os.path.join(po_dir, po_name)
         plugin_files: Dict[str, Any] = {}
 
         for plugin in plugins:
-            files = plugin.list_files(po_path, runtime) or {}
+            files = index.list_files(plugin, po_path, runtime)
             # Filter excluded files for this PO, matching plugin relpaths.
             excluded = exclude_files.get(po_name, set())
             if excluded:
@@ -233,12 +501,15 @@ def build_po_apply_plan(
         for rel_path in plugin_files.get("commits", {}).get("commit_files", []) or []:
             repo_name = _repo_name_from_po_relpath(rel_path)
             patch_abs = os.path.join(po_path, "commits", rel_path)
+            targets, original_commit_sha = _read_commit_meta_best_effort(patch_abs, patch_headers)
             actions_by_repo.setdefault(repo_name, []).append(
                 {
                     "type": "commit_apply",
                     "po": po_name,
                     "source": f"commits/{rel_path}",
-                    "targets": _read_patch_targets_best_effort(patch_abs),
+                    "sha256": index.sha256(patch_abs),
+                    "targets": targets,
+                    "original_commit_sha": original_commit_sha,
                 }
             )
 
@@ -251,7 +522,8 @@ def build_po_apply_plan(
                     "type": "patch_apply",
                     "po": po_name,
                     "source": f"patches/{rel_path}",
-                    "targets": _read_patch_targets_best_effort(patch_abs),
+                    "sha256": index.sha256(patch_abs),
+                    "targets": _read_patch_targets_best_effort(patch_abs, patch_headers),
                 }
             )
 
@@ -266,6 +538,7 @@ def build_po_apply_plan(
                     "type": "override_remove" if is_remove else "override_copy",
                     "po": po_name,
                     "source": f"overrides/{rel_path}",
+                    "sha256": index.sha256(os.path.join(po_path, "overrides", rel_path)),
                     "path_in_repo": dest_rel,
                 }
             )
@@ -284,6 +557,8 @@ def build_po_apply_plan(
             actions,
             key=lambda item: (str(item.get("po", "")), str(item.get("type", "")), str(item.get("source", ""))),
         )
+    if owns_patch_headers:
+        patch_headers.save()
 
     return {
         "schema_version": 1,
@@ -297,10 +572,7 @@ def build_po_apply_plan(
             "reapply": bool(reapply),
             "po": str(po or ""),
         },
-        "repositories": [
-            {"name": repo_name, "path": os.path.relpath(repo_path, start=workspace_root)}
-            for repo_path, repo_name in repo_entries
-        ],
+        "repositories": _plan_repositories(repo_entries, workspace_root, index),
         "pos": po_items,
         "per_repo_actions": _per_repo_plan_actions(repo_entries, actions_by_repo),
     }
@@ -314,6 +586,7 @@ def build_po_revert_plan(
     po: str = "",
 ) -> Dict[str, Any]:
     """Build a machine-readable plan for po_revert without mutating repositories."""
+    index = _PoPlanIndex()
     projects_path = env["projects_path"]
     project_info = projects_info.get(project_name, {}) if isinstance(projects_info, dict) else {}
     project_cfg = project_info.get("config", {}) if isinstance(project_info, dict) else {}
@@ -355,11 +628,11 @@ def build_po_revert_plan(
 
     po_items: List[Dict[str, Any]] = []
     for po_name in reversed(apply_pos):
-        po_path = os.path.join(po_dir, po_name)
+        po_path = _resolve_po_path(po_dir, po_name) or os.path.join(po_dir, po_name)
         plugin_files: Dict[str, Any] = {}
 
         for plugin in plugins:
-            files = plugin.list_files(po_path, runtime) or {}
+            files = index.list_files(plugin, po_path, runtime)
             excluded = exclude_files.get(po_name, set())
             if excluded and "override_files" in files:
                 files["override_files"] = [p for p in files["override_files"] if p not in excluded]
@@ -388,6 +661,7 @@ def build_po_revert_plan(
                     "type": "patch_reverse",
                     "po": po_name,
                     "source": f"patches/{rel_path}",
+                    "sha256": index.sha256(os.path.join(po_path, "patches", rel_path)),
                 }
             )
 
@@ -401,6 +675,7 @@ def build_po_revert_plan(
                     "type": "override_revert",
                     "po": po_name,
                     "source": f"overrides/{rel_path}",
+                    "sha256": index.sha256(os.path.join(po_path, "overrides", rel_path)),
                     "path_in_repo": dest_rel,
                 }
             )
@@ -467,10 +742,7 @@ def build_po_revert_plan(
         "flags": {
             "po": str(po or ""),
         },
-        "repositories": [
-            {"name": repo_name, "path": os.path.relpath(repo_path, start=workspace_root)}
-            for repo_path, repo_name in repo_entries
-        ],
+        "repositories": _plan_repositories(repo_entries, workspace_root, index),
         "pos": po_items,
         "per_repo_actions": _per_repo_plan_actions(repo_entries, actions_by_repo),
     }
@@ -486,6 +758,11 @@ def po_apply(
     reapply: bool = False,
     po: str = "",
     emit_plan: Any = False,
+    from_plan: str = "",
+    in_process_patch: bool = False,
+    po_cache: bool = False,
+    repo: str = "",
+    compact: bool = False,
 ) -> bool:
     """
     Apply patch/override/commits for the specified project.
@@ -498,6 +775,11 @@ def po_apply(
         force (bool): If True, allow destructive operations like override .remove deletions.
         reapply (bool): If True, apply POs even if applied records already exist (overwrites them after success).
         po (str): Optional PO filter; only apply these POs (comma/space separated) from PROJECT_PO_CONFIG.
+        from_plan (str): Execute a plan previously written by --emit-plan (fails if PO files or repo HEADs changed).
+        in_process_patch (bool): Apply plain text patches in-process; binary/rename/mode patches still use git apply.
+        po_cache (bool): Reuse patched file contents from .cache/po_materialized (implies in_process_patch).
+        repo (str): Optional repository filter (comma/space separated); only POs and files touching them are applied.
+        compact (bool): Emit the --emit-plan JSON without indentation.
     Returns:
         bool: True if success, otherwise False.
     """
@@ -512,32 +794,54 @@ def po_apply(
 
     board_path = os.path.join(projects_path, board_name)
     po_dir = os.path.join(board_path, "po")
-    po_config = str(project_cfg.get("PROJECT_PO_CONFIG", "") or "").strip()
     emit_enabled, _ = parse_emit_plan(emit_plan)
-    if not po_config:
+    plan: Optional[Dict[str, Any]] = None
+    planned_files: Dict[str, Dict[str, List[str]]] = {}
+    planned_meta: Dict[str, Dict[str, Any]] = {}
+    if repo and (from_plan or emit_enabled):
+        log.error("--repo cannot be combined with --from-plan or --emit-plan")
+        return False
+    if from_plan:
         if emit_enabled:
-            payload = build_po_apply_plan(env, projects_info, project_name, force=force, reapply=reapply, po=po)
-            emit_plan_json(payload, emit_plan)
+            log.error("--from-plan cannot be combined with --emit-plan")
+            return False
+        plan = _load_po_plan(from_plan, "po_apply", project_name)
+        if plan is None:
+            return False
+        # The plan already reflects PROJECT_PO_CONFIG, --po and file exclusions.
+        planned_files, planned_meta = _planned_po_files(plan)
+        apply_pos = [item["po"] for item in plan.get("pos") or []]
+        exclude_pos, exclude_files = set(), {}
+        plan_flags = plan.get("flags") or {}
+        force = bool(force or plan_flags.get("force"))
+        reapply = bool(reapply or plan_flags.get("reapply"))
+        log.info("Executing po_apply plan '%s' for project '%s'", from_plan, project_name)
+    else:
+        po_config = str(project_cfg.get("PROJECT_PO_CONFIG", "") or "").strip()
+        if not po_config:
+            if emit_enabled:
+                payload = build_po_apply_plan(env, projects_info, project_name, force=force, reapply=reapply, po=po)
+                emit_plan_json(payload, emit_plan, compact=compact)
+                return True
+            log.warning("No PROJECT_PO_CONFIG found for '%s'", project_name)
             return True
-        log.warning("No PROJECT_PO_CONFIG found for '%s'", project_name)
-        return True
 
-    apply_pos, exclude_pos, exclude_files = parse_po_config(po_config)
-    requested_pos = _parse_po_filter(po)
-    filtered = _filter_pos_from_config(apply_pos, requested_pos)
-    if filtered is None:
-        return False
-    if requested_pos:
-        log.info(
-            "Applying selected POs for project '%s': %s",
-            project_name,
-            ", ".join(filtered) if filtered else "(none)",
-        )
-    apply_pos = filtered
-    if emit_enabled:
-        payload = build_po_apply_plan(env, projects_info, project_name, force=force, reapply=reapply, po=po)
-        emit_plan_json(payload, emit_plan)
-        return True
+        apply_pos, exclude_pos, exclude_files = parse_po_config(po_config)
+        requested_pos = _parse_po_filter(po)
+        filtered = _filter_pos_from_config(apply_pos, requested_pos)
+        if filtered is None:
+            return False
+        if requested_pos:
+            log.info(
+                "Applying selected POs for project '%s': %s",
+                project_name,
+                ", ".join(filtered) if filtered else "(none)",
+            )
+        apply_pos = filtered
+        if emit_enabled:
+            payload = build_po_apply_plan(env, projects_info, project_name, force=force, reapply=reapply, po=po)
+            emit_plan_json(payload, emit_plan, compact=compact)
+            return True
 
     if not apply_pos:
         log.warning("No POs selected for '%s' after --po filter; nothing to do.", project_name)
@@ -559,6 +863,9 @@ def po_apply(
         workspace_root=os.getcwd(),
         po_configs=env.get("po_configs", {}),
     )
+    if plan is not None and not _verify_po_plan(plan, po_dir, runtime):
+        log.error("Plan '%s' is stale; re-emit it with --emit-plan", from_plan)
+        return False
 
     plugins = get_po_plugins()
     global_pre_plugins = sorted(
@@ -573,9 +880,24 @@ def po_apply(
     if reapply:
         log.info("--reapply enabled: ignoring existing applied record markers")
 
+    repo_filter: Optional[Set[str]] = None
+    if repo:
+        scoped = _scope_pos_to_repos(repo, apply_pos, po_dir, runtime)
+        if scoped is None:
+            return False
+        apply_pos, planned_files, repo_filter = scoped
+
+    materialized_cache: Optional[MaterializedCache] = None
+    if po_cache and not dry_run:
+        materialized_cache = MaterializedCache(os.path.join(os.getcwd(), ".cache", "po_materialized"))
+        in_process_patch = True
+    patch_headers = _patch_header_cache(env)
+
     ctxs: List[PoPluginContext] = []
     for po_name in apply_pos:
-        po_path = os.path.join(po_dir, po_name)
+        po_path = _resolve_po_path(po_dir, po_name)
+        if po_path is None:
+            return False
         ctxs.append(
             PoPluginContext(
                 project_name=project_name,
@@ -591,6 +913,12 @@ def po_apply(
                 reapply=reapply,
                 exclude_files=exclude_files,
                 applied_records={},
+                planned_files=planned_files.get(po_name) if plan is not None or repo_filter is not None else None,
+                planned_meta=planned_meta.get(po_name, {}),
+                in_process_patch=bool(in_process_patch),
+                materialized_cache=materialized_cache,
+                repo_filter=repo_filter,
+                patch_headers=patch_headers,
             )
         )
 
@@ -625,6 +953,15 @@ def po_apply(
 
         log.info("po '%s' has been processed", ctx.po_name)
 
+    patch_headers.save()
+    if materialized_cache is not None:
+        evicted = materialized_cache.prune()
+        log.info(
+            "po cache: %d hit(s), %d miss(es), %d entr(ies) evicted",
+            materialized_cache.hits,
+            materialized_cache.misses,
+            evicted,
+        )
     log.info("po apply finished for project: '%s'", project_name)
     return True
 
@@ -641,6 +978,10 @@ def po_revert(
     dry_run: bool = False,
     po: str = "",
     emit_plan: Any = False,
+    from_plan: str = "",
+    in_process_patch: bool = False,
+    repo: str = "",
+    compact: bool = False,
 ) -> bool:
     """
     Revert patch/override/commits for the specified project.
@@ -651,6 +992,10 @@ def po_revert(
         dry_run (bool): If True, only print planned actions without modifying files.
         emit_plan (bool|str): Emit a machine-readable JSON plan to stdout (true) or to the given path.
         po (str): Optional PO filter; only revert these POs (comma/space separated) from PROJECT_PO_CONFIG.
+        from_plan (str): Execute a plan previously written by --emit-plan (fails if PO files or repo HEADs changed).
+        in_process_patch (bool): Reverse plain text patches in-process; other patches still use git apply --reverse.
+        repo (str): Optional repository filter (comma/space separated); only POs and files touching them are reverted.
+        compact (bool): Emit the --emit-plan JSON without indentation.
     Returns:
         bool: True if success, otherwise False.
     """
@@ -665,32 +1010,51 @@ def po_revert(
 
     board_path = os.path.join(projects_path, board_name)
     po_dir = os.path.join(board_path, "po")
-    po_config = str(project_cfg.get("PROJECT_PO_CONFIG", "") or "").strip()
     emit_enabled, _ = parse_emit_plan(emit_plan)
-    if not po_config:
+    plan: Optional[Dict[str, Any]] = None
+    planned_files: Dict[str, Dict[str, List[str]]] = {}
+    planned_meta: Dict[str, Dict[str, Any]] = {}
+    if repo and (from_plan or emit_enabled):
+        log.error("--repo cannot be combined with --from-plan or --emit-plan")
+        return False
+    if from_plan:
         if emit_enabled:
-            payload = build_po_revert_plan(env, projects_info, project_name, po=po)
-            emit_plan_json(payload, emit_plan)
+            log.error("--from-plan cannot be combined with --emit-plan")
+            return False
+        plan = _load_po_plan(from_plan, "po_revert", project_name)
+        if plan is None:
+            return False
+        planned_files, planned_meta = _planned_po_files(plan)
+        # Revert plans list POs in revert order; keep apply order here.
+        apply_pos = list(reversed([item["po"] for item in plan.get("pos") or []]))
+        exclude_pos, exclude_files = set(), {}
+        log.info("Executing po_revert plan '%s' for project '%s'", from_plan, project_name)
+    else:
+        po_config = str(project_cfg.get("PROJECT_PO_CONFIG", "") or "").strip()
+        if not po_config:
+            if emit_enabled:
+                payload = build_po_revert_plan(env, projects_info, project_name, po=po)
+                emit_plan_json(payload, emit_plan, compact=compact)
+                return True
+            log.warning("No PROJECT_PO_CONFIG found for '%s'", project_name)
             return True
-        log.warning("No PROJECT_PO_CONFIG found for '%s'", project_name)
-        return True
 
-    apply_pos, exclude_pos, exclude_files = parse_po_config(po_config)
-    requested_pos = _parse_po_filter(po)
-    filtered = _filter_pos_from_config(apply_pos, requested_pos)
-    if filtered is None:
-        return False
-    if requested_pos:
-        log.info(
-            "Reverting selected POs for project '%s': %s",
-            project_name,
-            ", ".join(filtered) if filtered else "(none)",
-        )
-    apply_pos = filtered
-    if emit_enabled:
-        payload = build_po_revert_plan(env, projects_info, project_name, po=po)
-        emit_plan_json(payload, emit_plan)
-        return True
+        apply_pos, exclude_pos, exclude_files = parse_po_config(po_config)
+        requested_pos = _parse_po_filter(po)
+        filtered = _filter_pos_from_config(apply_pos, requested_pos)
+        if filtered is None:
+            return False
+        if requested_pos:
+            log.info(
+                "Reverting selected POs for project '%s': %s",
+                project_name,
+                ", ".join(filtered) if filtered else "(none)",
+            )
+        apply_pos = filtered
+        if emit_enabled:
+            payload = build_po_revert_plan(env, projects_info, project_name, po=po)
+            emit_plan_json(payload, emit_plan, compact=compact)
+            return True
 
     if not apply_pos:
         log.warning("No POs selected for '%s' after --po filter; nothing to do.", project_name)
@@ -713,6 +1077,16 @@ def po_revert(
         workspace_root=os.getcwd(),
         po_configs=env.get("po_configs", {}),
     )
+    if plan is not None and not _verify_po_plan(plan, po_dir, runtime):
+        log.error("Plan '%s' is stale; re-emit it with --emit-plan", from_plan)
+        return False
+
+    repo_filter: Optional[Set[str]] = None
+    if repo:
+        scoped = _scope_pos_to_repos(repo, apply_pos, po_dir, runtime)
+        if scoped is None:
+            return False
+        apply_pos, planned_files, repo_filter = scoped
 
     plugins = get_po_plugins()
     per_po_plugins = sorted(
@@ -726,7 +1100,9 @@ def po_revert(
 
     # Stage 1: revert patches/overrides/custom first (these may leave the repo dirty).
     for po_name in reversed(apply_pos):
-        po_path = os.path.join(po_dir, po_name)
+        po_path = _resolve_po_path(po_dir, po_name)
+        if po_path is None:
+            return False
         ctx = PoPluginContext(
             project_name=project_name,
             board_name=board_name,
@@ -740,6 +1116,10 @@ def po_revert(
             force=False,
             exclude_files=exclude_files,
             applied_records={},
+            planned_files=planned_files.get(po_name) if plan is not None or repo_filter is not None else None,
+            planned_meta=planned_meta.get(po_name, {}),
+            in_process_patch=bool(in_process_patch),
+            repo_filter=repo_filter,
         )
 
         for plugin in per_po_plugins:
@@ -749,7 +1129,9 @@ def po_revert(
 
     # Stage 2: revert commit patches (git revert requires clean index).
     for po_name in reversed(apply_pos):
-        po_path = os.path.join(po_dir, po_name)
+        po_path = _resolve_po_path(po_dir, po_name)
+        if po_path is None:
+            return False
         ctx = PoPluginContext(
             project_name=project_name,
             board_name=board_name,
@@ -763,6 +1145,7 @@ def po_revert(
             force=False,
             exclude_files=exclude_files,
             applied_records={},
+            repo_filter=repo_filter,
         )
 
         for plugin in global_post_plugins:
@@ -772,7 +1155,7 @@ def po_revert(
 
         # Clear applied flag so the PO can be applied again after a successful revert.
         po_applied_flag_path = os.path.join(po_dir, po_name, "po_applied")
-        if not dry_run and os.path.isfile(po_applied_flag_path):
+        if not dry_run and repo_filter is None and os.path.isfile(po_applied_flag_path):
             try:
                 os.remove(po_applied_flag_path)
                 log.debug("Removed po_applied flag: '%s'", po_applied_flag_path)
@@ -781,7 +1164,9 @@ def po_revert(
 
         log.info("po '%s' has been reverted", po_name)
         if not dry_run:
-            for repo_path, _repo_name in repositories or []:
+            for repo_path, repo_name in repositories or []:
+                if repo_filter is not None and repo_name not in repo_filter:
+                    continue
                 record_path = _po_applied_record_path(repo_path, board_name, project_name, po_name)
                 try:
                     if os.path.exists(record_path):
@@ -794,37 +1179,64 @@ def po_revert(
     return True
 
 
-@register(
-    "po_analyze",
-    needs_repositories=True,
-    desc="Analyze PO conflicts (overlapping patch/override targets) for a project.",
-)
-def po_analyze(
-    env: Dict[str, Any],
-    projects_info: Dict[str, Any],
-    project_name: str,
-    po: str = "",
-    json: bool = False,
-    strict: bool = False,
-) -> bool:
-    """
-    Analyze enabled POs for conflicts (overlapping patch targets and override targets).
+_ANALYZE_LEVELS = ("file", "adjacent", "overlap")
+# Whole-file interval used for patches whose hunks cannot be located (binary, mode-only, unreadable).
+_WHOLE_FILE_RANGE = (1, 2**31 - 1)
 
-    po (str): Optional PO filter; only analyze these POs (comma/space separated) from PROJECT_PO_CONFIG.
-    json (bool): Output machine-readable JSON to stdout.
-    strict (bool): Exit non-zero (return False) when conflicts are detected.
+
+def _find_hunk_overlaps(
+    intervals: List[Tuple[int, int, str, str]], max_gap: int
+) -> List[Tuple[Tuple[int, int, str, str], Tuple[int, int, str, str]]]:
     """
+    Return pairs of (start, end, po, source) intervals from different POs that
+    overlap or are at most `max_gap` lines apart.
 
-    try:
-        plan = build_po_apply_plan(env, projects_info, project_name, po=po)
-    except ValueError as exc:
-        log.error("Failed to build PO plan for analysis: %s", exc)
-        return False
+    Intervals are swept in start order while keeping only those whose end can
+    still reach the current start, so cost is proportional to the overlaps found.
+    """
+    pairs = []
+    active: List[Tuple[int, int, str, str]] = []
+    for item in sorted(intervals):
+        active = [other for other in active if other[1] + max_gap >= item[0]]
+        for other in active:
+            if other[2] != item[2]:
+                pairs.append((other, item))
+        active.append(item)
+    return pairs
+
+
+def _hunk_range_payload(item: Tuple[int, int, str, str]) -> Dict[str, Any]:
+    whole_file = (item[0], item[1]) == _WHOLE_FILE_RANGE
+    return {"po": item[2], "source": item[3], "range": None if whole_file else [item[0], item[1]]}
+
+
+def _format_hunk_range(item: Dict[str, Any]) -> str:
+    if item["range"] is None:
+        return f"{item['po']}:whole-file"
+    return f"{item['po']}:{item['range'][0]}-{item['range'][1]}"
+
+
+def _analyze_plan_conflicts(
+    plan: Dict[str, Any],
+    po_dir: str,
+    level: str,
+    memo: Optional[Dict[Any, Optional[Dict[str, Any]]]] = None,
+    patch_headers: Optional[PatchHeaderCache] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Compute override, patch and override/patch conflicts for a po_apply plan.
 
+    `memo` caches per-file hunk analysis by the exact set of hunks involved, so
+    projects that enable the same PO combination reuse the result.
+    """
+    if memo is None:
+        memo = {}
     per_repo = plan.get("per_repo_actions") or []
 
     override_map: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
     patch_map: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    hunk_index: Dict[str, List[Tuple[int, int, str, str]]] = {}
+    po_paths: Dict[str, str] = {}
 
     def _key(repo_name: str, path_in_repo: str) -> str:
         repo_name = str(repo_name or "root")
@@ -849,44 +1261,141 @@ def po_analyze(
                 continue
 
             if action_type in {"patch_apply", "commit_apply"}:
+                source = str(action.get("source") or "")
+                try:
+                    if po_name not in po_paths:
+                        po_paths[po_name] = _resolve_po_path(po_dir, po_name) or os.path.join(po_dir, po_name)
+                    hunks = read_patch_header(os.path.join(po_paths[po_name], source), patch_headers)["hunks"]
+                except OSError:
+                    hunks = {}
                 for target in action.get("targets") or []:
                     key = _key(repo_name, target)
                     if not key:
                         continue
                     patch_map.setdefault(key, {}).setdefault(po_name, []).append(action)
+                    ranges = hunks.get(target) or [list(_WHOLE_FILE_RANGE)]
+                    hunk_index.setdefault(key, []).extend(
+                        (int(start), int(end), po_name, source) for start, end in ranges
+                    )
 
     override_conflicts = [
         {"path": path, "pos": sorted(po_map.keys())}
         for path, po_map in sorted(override_map.items(), key=lambda item: item[0])
         if len(po_map) > 1
     ]
-    patch_conflicts = [
-        {"path": path, "pos": sorted(po_map.keys())}
-        for path, po_map in sorted(patch_map.items(), key=lambda item: item[0])
-        if len(po_map) > 1
-    ]
 
-    has_conflicts = bool(override_conflicts or patch_conflicts)
+    patch_conflicts = []
+    for path, po_map in sorted(patch_map.items(), key=lambda item: item[0]):
+        if len(po_map) < 2:
+            continue
+        if level == "file":
+            patch_conflicts.append({"path": path, "pos": sorted(po_map.keys()), "hunks": []})
+            continue
+        intervals = hunk_index.get(path, [])
+        memo_key = (level, path, tuple(sorted(intervals)))
+        if memo_key not in memo:
+            memo[memo_key] = _hunk_conflict_entry(path, intervals, 1 if level == "adjacent" else 0)
+        if memo[memo_key] is not None:
+            patch_conflicts.append(memo[memo_key])
+
+    # An override replaces the whole file, so any patch from another PO on the same path interacts with it.
+    override_patch_conflicts = []
+    for path in sorted(set(override_map) & set(patch_map)):
+        override_pos = sorted(override_map[path].keys())
+        patch_pos = sorted(patch_map[path].keys())
+        if any(o != p for o in override_pos for p in patch_pos):
+            override_patch_conflicts.append({"path": path, "override_pos": override_pos, "patch_pos": patch_pos})
+
+    return {
+        "overrides": override_conflicts,
+        "patches": patch_conflicts,
+        "override_patch": override_patch_conflicts,
+    }
+
+
+def _hunk_conflict_entry(
+    path: str, intervals: List[Tuple[int, int, str, str]], max_gap: int
+) -> Optional[Dict[str, Any]]:
+    pairs = _find_hunk_overlaps(intervals, max_gap)
+    if not pairs:
+        return None
+    return {
+        "path": path,
+        "pos": sorted({item[2] for pair in pairs for item in pair}),
+        "hunks": [
+            {
+                "kind": "overlap" if first[1] >= second[0] else "adjacent",
+                "a": _hunk_range_payload(first),
+                "b": _hunk_range_payload(second),
+            }
+            for first, second in pairs
+        ],
+    }
+
+
+@register(
+    "po_analyze",
+    needs_repositories=True,
+    desc="Analyze PO conflicts (overlapping patch/override targets) for a project.",
+)
+def po_analyze(
+    env: Dict[str, Any],
+    projects_info: Dict[str, Any],
+    project_name: str,
+    po: str = "",
+    json: bool = False,
+    strict: bool = False,
+    level: str = "adjacent",
+    compact: bool = False,
+) -> bool:
+    """
+    Analyze enabled POs for conflicts (overlapping patch hunks and override targets).
+
+    po (str): Optional PO filter; only analyze these POs (comma/space separated) from PROJECT_PO_CONFIG.
+    json (bool): Output machine-readable JSON to stdout.
+    compact (bool): With --json, print compact single-line JSON.
+    strict (bool): Exit non-zero (return False) when conflicts are detected.
+    level (str): Patch conflict granularity: file, adjacent (default; overlapping or touching hunks) or overlap.
+    """
+    level = str(level or "adjacent").strip().lower()
+    if level not in _ANALYZE_LEVELS:
+        log.error("Invalid --level '%s' (expected one of: %s)", level, ", ".join(_ANALYZE_LEVELS))
+        return False
+
+    patch_headers = _patch_header_cache(env)
+    try:
+        plan = build_po_apply_plan(env, projects_info, project_name, po=po, patch_headers=patch_headers)
+    except ValueError as exc:
+        log.error("Failed to build PO plan for analysis: %s", exc)
+        return False
+
+    po_dir = os.path.join(env["projects_path"], plan.get("board_name") or "", "po")
+    conflicts = _analyze_plan_conflicts(plan, po_dir, level, patch_headers=patch_headers)
+    patch_headers.save()
+    override_conflicts = conflicts["overrides"]
+    patch_conflicts = conflicts["patches"]
+    override_patch_conflicts = conflicts["override_patch"]
+
+    has_conflicts = bool(override_conflicts or patch_conflicts or override_patch_conflicts)
     payload = {
         "schema_version": 1,
         "generated_at": datetime.now().isoformat(),
         "operation": "po_analyze",
         "project_name": project_name,
         "board_name": plan.get("board_name") or "",
+        "level": level,
         "pos": [item.get("po") for item in (plan.get("pos") or []) if item.get("po")],
-        "conflicts": {
-            "overrides": override_conflicts,
-            "patches": patch_conflicts,
-        },
+        "conflicts": conflicts,
         "summary": {
             "override_conflict_count": len(override_conflicts),
             "patch_conflict_count": len(patch_conflicts),
+            "override_patch_conflict_count": len(override_patch_conflicts),
             "has_conflicts": has_conflicts,
         },
     }
 
     if json:
-        print(jsonlib.dumps(payload, indent=2, ensure_ascii=False))
+        print_json(payload, compact=compact)
     else:
         if not has_conflicts:
             print("No PO conflicts detected.")
@@ -896,12 +1405,303 @@ def po_analyze(
                 print(f"- override conflict: {item['path']} (POs: {', '.join(item['pos'])})")
             for item in patch_conflicts:
                 print(f"- patch conflict: {item['path']} (POs: {', '.join(item['pos'])})")
+                for hunk in item["hunks"]:
+                    print(f"    {hunk['kind']}: {_format_hunk_range(hunk['a'])} vs {_format_hunk_range(hunk['b'])}")
+            for item in override_patch_conflicts:
+                print(
+                    f"- override/patch conflict: {item['path']} "
+                    f"(override: {', '.join(item['override_pos'])}; patch: {', '.join(item['patch_pos'])})"
+                )
 
     if strict and has_conflicts:
         return False
     return True
 
 
+def _conflict_po_pairs(conflicts: Dict[str, List[Dict[str, Any]]]) -> List[Tuple[str, str, str, str]]:
+    """Flatten analysis results into (po_a, po_b, kind, path) tuples with po_a < po_b."""
+    pairs = set()
+    for item in conflicts["overrides"]:
+        for i, po_a in enumerate(item["pos"]):
+            for po_b in item["pos"][i + 1 :]:
+                pairs.add((po_a, po_b, "override", item["path"]))
+    for item in conflicts["patches"]:
+        if item["hunks"]:
+            po_pairs = {tuple(sorted((hunk["a"]["po"], hunk["b"]["po"]))) for hunk in item["hunks"]}
+        else:
+            po_pairs = {(a, b) for i, a in enumerate(item["pos"]) for b in item["pos"][i + 1 :]}
+        for po_a, po_b in po_pairs:
+            pairs.add((po_a, po_b, "patch", item["path"]))
+    for item in conflicts["override_patch"]:
+        for po_a in item["override_pos"]:
+            for po_b in item["patch_pos"]:
+                if po_a != po_b:
+                    first, second = sorted((po_a, po_b))
+                    pairs.add((first, second, "override_patch", item["path"]))
+    return sorted(pairs)
+
+
+@register(
+    "po_analyze_board",
+    needs_repositories=True,
+    desc="Analyze PO conflicts across all projects of a board (conflict matrix).",
+)
+def po_analyze_board(
+    env: Dict[str, Any],
+    projects_info: Dict[str, Any],
+    board_name: str = "",
+    json: bool = False,
+    strict: bool = False,
+    level: str = "adjacent",
+) -> bool:
+    """
+    Build a PO conflict matrix for every project of a board (or the whole workspace when no board is given).
+
+    PO listings, file hashes, repository HEADs and parsed patch headers are shared across projects,
+    so POs enabled by several projects are only scanned once.
+
+    json (bool): Output machine-readable JSON to stdout instead of the compact table.
+    strict (bool): Exit non-zero (return False) when conflicts are detected.
+    level (str): Patch conflict granularity: file, adjacent (default; overlapping or touching hunks) or overlap.
+    """
+    level = str(level or "adjacent").strip().lower()
+    if level not in _ANALYZE_LEVELS:
+        log.error("Invalid --level '%s' (expected one of: %s)", level, ", ".join(_ANALYZE_LEVELS))
+        return False
+
+    board_name = str(board_name or "").strip()
+    project_names = sorted(
+        name
+        for name, info in (projects_info or {}).items()
+        if isinstance(info, dict)
+        and info.get("board_name")
+        and (not board_name or info.get("board_name") == board_name)
+        and str((info.get("config") or {}).get("PROJECT_PO_CONFIG", "") or "").strip()
+    )
+    if board_name and not any(
+        isinstance(info, dict) and info.get("board_name") == board_name for info in (projects_info or {}).values()
+    ):
+        log.error("Cannot find board: '%s'", board_name)
+        return False
+
+    index = _PoPlanIndex()
+    patch_headers = _patch_header_cache(env)
+    memo: Dict[Any, Optional[Dict[str, Any]]] = {}
+    projects: List[Dict[str, Any]] = []
+    matrix: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for project_name in project_names:
+        try:
+            plan = build_po_apply_plan(env, projects_info, project_name, index=index, patch_headers=patch_headers)
+        except ValueError as exc:
+            log.error("Failed to build PO plan for project '%s': %s", project_name, exc)
+            return False
+        project_board = plan.get("board_name") or ""
+        po_dir = os.path.join(env["projects_path"], project_board, "po")
+        projects.append(
+            {
+                "project_name": project_name,
+                "board_name": project_board,
+                "pos": [item.get("po") for item in (plan.get("pos") or []) if item.get("po")],
+            }
+        )
+        conflicts = _analyze_plan_conflicts(plan, po_dir, level, memo, patch_headers)
+        for po_a, po_b, kind, path in _conflict_po_pairs(conflicts):
+            row = matrix.setdefault(
+                (project_board, po_a, po_b),
+                {"board_name": project_board, "pos": [po_a, po_b], "projects": set(), "conflicts": {}},
+            )
+            row["projects"].add(project_name)
+            row["conflicts"].setdefault((kind, path), set()).add(project_name)
+    patch_headers.save()
+
+    rows = [
+        {
+            "board_name": row["board_name"],
+            "pos": row["pos"],
+            "projects": sorted(row["projects"]),
+            "conflicts": [
+                {"kind": kind, "path": path, "projects": sorted(names)}
+                for (kind, path), names in sorted(row["conflicts"].items())
+            ],
+        }
+        for _key, row in sorted(matrix.items())
+    ]
+    has_conflicts = bool(rows)
+    payload = {
+        "schema_version": 1,
+        "generated_at": datetime.now().isoformat(),
+        "operation": "po_analyze_board",
+        "board_name": board_name,
+        "level": level,
+        "projects": projects,
+        "matrix": rows,
+        "summary": {
+            "project_count": len(projects),
+            "conflicting_pair_count": len(rows),
+            "has_conflicts": has_conflicts,
+        },
+    }
+
+    if json:
+        print_json(payload)
+    elif not has_conflicts:
+        print(f"No PO conflicts detected across {len(projects)} project(s).")
+    else:
+        table = [("BOARD", "PO PAIR", "KINDS", "PATHS", "PROJECTS")]
+        for row in rows:
+            table.append(
+                (
+                    row["board_name"],
+                    f"{row['pos'][0]} x {row['pos'][1]}",
+                    ",".join(sorted({item["kind"] for item in row["conflicts"]})),
+                    str(len({item["path"] for item in row["conflicts"]})),
+                    ",".join(row["projects"]),
+                )
+            )
+        widths = [max(len(line[col]) for line in table) for col in range(len(table[0]) - 1)]
+        print(f"PO conflict matrix ({len(rows)} conflicting pair(s), {len(projects)} project(s), level={level}):")
+        for line in table:
+            print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)) + "  " + line[-1])
+
+    if strict and has_conflicts:
+        return False
+    return True
+
+
+def _git_status_entries(repo_path: str) -> List[Tuple[str, str]]:
+    """
+    Return (xy, path) for every changed, deleted or untracked file in a repository.
+
+    Uses a single `git status --porcelain=v2 -z --untracked-files=all` call. `xy`
+    is converted to porcelain v1 notation (space = unmodified, `??` = untracked).
+    Returns an empty list when the directory is not a usable git repository.
+    """
+    result = subprocess.run(
+        ["git", "status", "--porcelain=v2", "-z", "--untracked-files=all"],
+        cwd=repo_path,
+        capture_output=True,
+        encoding="utf-8",
+        errors="surrogateescape",
+        check=False,
+    )
+    if result.returncode != 0:
+        log.debug("git status failed in '%s': %s", repo_path, (result.stderr or "").strip())
+        return []
+
+    entries: List[Tuple[str, str]] = []
+    fields = (result.stdout or "").split("\0")
+    i = 0
+    while i < len(fields):
+        record = fields[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "1":
+            parts = record.split(" ", 8)
+        elif kind == "2":
+            parts = record.split(" ", 9)
+            i += 1  # the original path of a rename/copy follows as its own field
+        elif kind == "u":
+            parts = record.split(" ", 10)
+        elif kind == "?":
+            entries.append(("??", record[2:]))
+            continue
+        else:
+            continue
+        if len(parts) < 3:
+            continue
+        entries.append((parts[1].replace(".", " "), parts[-1]))
+    return entries
+
+
+_DIFF_PATHSPEC_CHUNK = 500
+
+
+def _diff_git_header_path(header: bytes) -> Optional[str]:
+    """Return the path of a `diff --git a/<p> b/<p>` header line (paths may contain spaces)."""
+    line = header.decode("utf-8", errors="surrogateescape").rstrip("\n")
+    rest = line[len("diff --git ") :]
+    if rest.startswith("a/") and (len(rest) - 5) % 2 == 0:
+        size = (len(rest) - 5) // 2
+        path = rest[2 : 2 + size]
+        if rest[2 + size :] == f" b/{path}":
+            return path
+    # Renames and quoted paths: fall back to the whitespace separated b/ path.
+    parts = rest.split()
+    if len(parts) >= 2 and parts[-1].startswith("b/"):
+        return parts[-1][2:]
+    return None
+
+
+def _split_git_diff(diff_output: bytes) -> Dict[str, bytes]:
+    """Split combined `git diff` output into per-file patches at `diff --git` boundaries."""
+    patches: Dict[str, bytes] = {}
+    if not diff_output:
+        return patches
+    starts = [0] if diff_output.startswith(b"diff --git ") else []
+    pos = diff_output.find(b"\ndiff --git ")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = diff_output.find(b"\ndiff --git ", pos + 1)
+    starts.append(len(diff_output))
+    for begin, end in zip(starts, starts[1:]):
+        chunk = diff_output[begin:end]
+        path = _diff_git_header_path(chunk.split(b"\n", 1)[0])
+        if path:
+            patches[path] = patches.get(path, b"") + chunk
+    return patches
+
+
+def _git_diff_files(repo_path: str, file_paths: List[str], cached: bool) -> Dict[str, bytes]:
+    """Run `git diff [--cached]` once per pathspec chunk and split the output per file."""
+    patches: Dict[str, bytes] = {}
+    for start in range(0, len(file_paths), _DIFF_PATHSPEC_CHUNK):
+        # Fixed a/ b/ prefixes: _split_git_diff relies on them whatever diff.noprefix/mnemonicPrefix say.
+        cmd = ["git", "-c", "core.quotepath=off", "--literal-pathspecs", "diff", "--no-ext-diff", "--no-color"]
+        cmd += ["--src-prefix=a/", "--dst-prefix=b/"]
+        if cached:
+            cmd.append("--cached")
+        cmd += ["--"] + file_paths[start : start + _DIFF_PATHSPEC_CHUNK]
+        result = subprocess.run(cmd, cwd=repo_path, capture_output=True, check=False)
+        if result.returncode != 0:
+            log.debug("git diff failed in '%s': %s", repo_path, result.stderr.decode("utf-8", "replace").strip())
+            continue
+        patches.update(_split_git_diff(result.stdout))
+    return patches
+
+
+def _git_diff_per_file(repo_path: str, file_paths: List[str]) -> Dict[str, Tuple[bytes, bool]]:
+    """
+    Return {path: (patch, staged)} for the given files of one repository.
+
+    Files with staged changes use the staged diff, all others the working tree
+    diff, matching the per-file behaviour of po_new. Files without changes
+    (e.g. untracked ones) are left out.
+    """
+    staged = _git_diff_files(repo_path, file_paths, cached=True)
+    result = {path: (patch, True) for path, patch in staged.items()}
+    remaining = [path for path in file_paths if path not in staged]
+    if remaining:
+        for path, patch in _git_diff_files(repo_path, remaining, cached=False).items():
+            result[path] = (patch, False)
+    return result
+
+
+def _describe_git_status(xy: str) -> str:
+    """Annotate a porcelain v1 XY status for the po_new file selection screens."""
+    if xy == "??":
+        return "?? (working)"
+    staged = xy[0] != " "
+    if xy[1] == "D":
+        return f"{xy} (staged+deleted)" if staged else f"{xy} (deleted)"
+    if staged and xy[1] != " ":
+        return f"{xy} (staged+modified)"
+    if staged:
+        return f"{xy} (staged)"
+    return f"{xy} (working)"
+
+
 @register("po_new", needs_repositories=True, desc="Create a new PO for a project")
 def po_new(
     env: Dict,
@@ -983,95 +1783,18 @@ def po_new(
                 return False
             print("Please enter 'yes' or 'no'.")
 
-    def __get_modified_files(repo_path, repo_name, ignore_patterns):
+    def __get_modified_files(repo_path, repo_name, ignore_matcher):
         """Get modified files in a repository including staged files, with ignore support."""
         modified_files = []
         try:
-            # Get staged files (files in index)
-            staged_result = subprocess.run(
-                ["git", "diff", "--name-only", "--cached"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+            entries = _git_status_entries(repo_path)
 
-            staged_files = set()
-            if staged_result.returncode == 0 and staged_result.stdout.strip():
-                staged_files = set(staged_result.stdout.strip().split("\n"))
-
-            # Get modified and untracked files (files in working directory)
-            working_result = subprocess.run(
-                ["git", "ls-files", "--modified", "--others", "--exclude-standard"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
-            working_files = set()
-            if working_result.returncode == 0 and working_result.stdout.strip():
-                working_files = set(working_result.stdout.strip().split("\n"))
-
-            # Get deleted files (files that were tracked but are now missing)
-            deleted_result = subprocess.run(
-                ["git", "ls-files", "--deleted"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
-            deleted_files = set()
-            if deleted_result.returncode == 0 and deleted_result.stdout.strip():
-                deleted_files = set(deleted_result.stdout.strip().split("\n"))
-
-            # Process all files
-            all_files = staged_files | working_files | deleted_files
-
-            def is_ignored(file_path):
-                # Create full path for matching: repo_name/file_path
-                full_path = f"{repo_name}/{file_path}" if repo_name != "root" else file_path
-
-                for pattern in ignore_patterns:
-                    if fnmatch.fnmatch(file_path, pattern) or fnmatch.fnmatch(full_path, pattern):
-                        return True
-                return False
-
-            for file_path in all_files:
+            for xy, file_path in entries:
                 if not file_path.strip():
                     continue
-                if is_ignored(file_path):
+                if ignore_matcher.is_ignored(file_path, repo_name):
                     continue
-
-                # Determine file status
-                status_result = subprocess.run(
-                    ["git", "status", "--porcelain", file_path],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-
-                if status_result.returncode == 0 and status_result.stdout.strip():
-                    status = status_result.stdout.strip()[:2]
-
-                    # Enhance status description for better understanding
-                    if file_path in deleted_files:
-                        if file_path in staged_files:
-                            status = f"{status} (staged+deleted)"
-                        else:
-                            status = f"{status} (deleted)"
-                    elif file_path in staged_files and file_path in working_files:
-                        status = f"{status} (staged+modified)"
-                    elif file_path in staged_files:
-                        status = f"{status} (staged)"
-                    else:
-                        status = f"{status} (working)"
-                else:
-                    status = "?? (unknown)"
-
-                modified_files.append((repo_name, file_path, status))
+                modified_files.append((repo_name, file_path, _describe_git_status(xy)))
 
         except (OSError, subprocess.SubprocessError) as e:
             log.error("Failed to get modified files for repository %s: %s", repo_name, e)
@@ -1080,6 +1803,19 @@ def po_new(
 
         return modified_files
 
+    def __scan_repositories(repositories, ignore_matcher):
+        """Collect modified files of all repositories concurrently, keeping repository order."""
+        with ThreadPoolExecutor() as executor:
+            results = list(
+                executor.map(
+                    lambda repo: __get_modified_files(repo[0], repo[1], ignore_matcher),
+                    repositories,
+                )
+            )
+        if any(result is None for result in results):
+            return None
+        return [item for result in results for item in result]
+
     def __find_repo_path_by_name(repo_name):
         """Find repository path by name."""
         # 直接用env['repositories']
@@ -1088,104 +1824,24 @@ def po_new(
                 return repo_path
         return None
 
-    def __create_patch_for_file(repo_name, file_path, patches_dir, force=False):
-        """Create a patch file for the specified file."""
-        try:
-            # Find the repository path
-            repo_path = __find_repo_path_by_name(repo_name)
-            if not repo_path:
-                return False
-
-            # Check if file is staged
-            staged_result = subprocess.run(
-                ["git", "diff", "--name-only", "--cached"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
-            is_staged = False
-            if staged_result.returncode == 0 and staged_result.stdout.strip():
-                staged_files = staged_result.stdout.strip().split("\n")
-                is_staged = file_path in staged_files
-
-            # Determine patch source (staged vs working directory)
-            use_staged = False
-            if is_staged and not force:
-                print(f"    File {file_path} is staged. Choose patch source:")
-                print("      1. Use staged changes (git diff --cached)")
-                print("      2. Use working directory changes (git diff)")
-
-                while True:
-                    choice = input("    Choice (1/2): ").strip()
-                    if choice == "1":
-                        use_staged = True
-                        break
-                    if choice == "2":
-                        use_staged = False
-                        break
-                    print("    Invalid choice. Please enter 1 or 2.")
-            elif is_staged and force:
-                # In force mode, default to staged for staged files
-                use_staged = True
-
-            # Ask user for custom patch name
-            default_filename = os.path.basename(file_path)
-            print(f"    Default patch name: {default_filename}.patch")
-            custom_name = input("    Enter custom patch name (or press Enter for default): ").strip()
-
-            if custom_name:
-                # Remove .patch extension if user included it
-                if custom_name.endswith(".patch"):
-                    custom_name = custom_name[:-6]
-                filename = custom_name
-            else:
-                filename = default_filename
-
-            # Create patch file path: patches_dir/repo_name/file_path.patch
-            if repo_name == "root":
-                # For root repository, patch is based on root directory, use only filename
-                patch_file_path = os.path.join(patches_dir, f"{filename}.patch")
-            else:
-                # For other repositories, patch is based on repo root directory, use only filename
-                patch_file_path = os.path.join(patches_dir, repo_name, f"{filename}.patch")
-
-            # Create patches directory and subdirectories if they don't exist
-            os.makedirs(os.path.dirname(patch_file_path), exist_ok=True)
-
-            # Generate patch using appropriate git diff command
-            if use_staged:
-                result = subprocess.run(
-                    ["git", "diff", "--cached", "--", file_path],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-                print(f"    Generating patch from staged changes for {file_path}")
-            else:
-                result = subprocess.run(
-                    ["git", "diff", "--", file_path],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-                print(f"    Generating patch from working directory for {file_path}")
-
-            if result.returncode == 0 and result.stdout.strip():
-                # Write patch file
-                with open(patch_file_path, "w", encoding="utf-8") as f:
-                    f.write(result.stdout)
-
-                return True
-            print(f"    Warning: No changes found for {file_path}")
-            return False
+    def __patch_file_path(repo_name, file_path, patches_dir):
+        """Ask for the patch name of a file and return the patch file path."""
+        default_filename = os.path.basename(file_path)
+        print(f"    Default patch name: {default_filename}.patch")
+        custom_name = input(f"    Enter custom patch name for {file_path} (or press Enter for default): ").strip()
+
+        if custom_name:
+            # Remove .patch extension if user included it
+            if custom_name.endswith(".patch"):
+                custom_name = custom_name[:-6]
+            filename = custom_name
+        else:
+            filename = default_filename
 
-        except (OSError, subprocess.SubprocessError) as e:
-            log.error("Failed to create patch for file %s: %s", file_path, e)
-            return False
+        # Patches are based on the repository root directory, use only filename
+        if repo_name == "root":
+            return os.path.join(patches_dir, f"{filename}.patch")
+        return os.path.join(patches_dir, repo_name, f"{filename}.patch")
 
     def __create_override_for_file(repo_name, file_path, overrides_dir):
         """Create an override file for the specified file."""
@@ -1336,17 +1992,47 @@ def po_new(
                 print("Invalid choice. Please enter 1, 2, or 3.")
 
     def __batch_create_patches(file_infos, po_path):
-        """Create patches for multiple files."""
+        """Create patches for multiple files with one batched git diff per repository."""
         patches_dir = os.path.join(po_path, "patches")
         success_count = 0
 
         print("  Creating patches for all selected files...")
+        targets = []
+        files_by_repo: Dict[str, List[str]] = {}
         for repo_name, file_path, _ in file_infos:
-            if __create_patch_for_file(repo_name, file_path, patches_dir, force=True):
-                print(f"    ✓ Created patch for {file_path}")
-                success_count += 1
-            else:
+            targets.append((repo_name, file_path, __patch_file_path(repo_name, file_path, patches_dir)))
+            files_by_repo.setdefault(repo_name, []).append(file_path)
+
+        def __diff_repo(repo_name):
+            repo_path = __find_repo_path_by_name(repo_name)
+            if not repo_path:
+                return {}
+            try:
+                return _git_diff_per_file(repo_path, files_by_repo[repo_name])
+            except (OSError, subprocess.SubprocessError) as e:
+                log.error("Failed to create patches for repository %s: %s", repo_name, e)
+                return {}
+
+        with ThreadPoolExecutor() as executor:
+            diffs = dict(zip(files_by_repo, executor.map(__diff_repo, files_by_repo)))
+
+        for repo_name, file_path, patch_file_path in targets:
+            patch, staged = diffs[repo_name].get(file_path, (b"", False))
+            if not patch.strip():
+                print(f"    Warning: No changes found for {file_path}")
+                print(f"    ✗ Failed to create patch for {file_path}")
+                continue
+            try:
+                os.makedirs(os.path.dirname(patch_file_path), exist_ok=True)
+                with open(patch_file_path, "wb") as f:
+                    f.write(patch)
+            except OSError as e:
+                log.error("Failed to create patch for file %s: %s", file_path, e)
                 print(f"    ✗ Failed to create patch for {file_path}")
+                continue
+            source = "staged changes" if staged else "working directory"
+            print(f"    ✓ Created patch for {file_path} (from {source})")
+            success_count += 1
 
         print(f"  Completed: {success_count}/{len(file_infos)} patches created")
         return success_count
@@ -1399,15 +2085,11 @@ def po_new(
         # Load ignore patterns once for all repositories
         # project_cfg contains the full project info, config is in project_cfg["config"]
         project_config = project_cfg.get("config", {}) if isinstance(project_cfg, dict) else {}
-        ignore_patterns = __load_ignore_patterns(project_config)
+        ignore_matcher = __load_ignore_matcher(project_config)
 
-        all_modified_files = []
-        for repo_path, repo_name in repositories:
-            modified_files = __get_modified_files(repo_path, repo_name, ignore_patterns)
-            if modified_files is None:
-                return
-            if modified_files:
-                all_modified_files.extend(modified_files)
+        all_modified_files = __scan_repositories(repositories, ignore_matcher)
+        if all_modified_files is None:
+            return
 
         if not all_modified_files:
             print("No modified files found in any repository.")
@@ -1521,15 +2203,11 @@ def po_new(
             return True
 
         project_config = project_cfg.get("config", {}) if isinstance(project_cfg, dict) else {}
-        ignore_patterns = __load_ignore_patterns(project_config)
+        ignore_matcher = __load_ignore_matcher(project_config)
 
-        all_modified_files = []
-        for repo_path, repo_name in repositories:
-            modified_files = __get_modified_files(repo_path, repo_name, ignore_patterns)
-            if modified_files is None:
-                return False
-            if modified_files:
-                all_modified_files.extend(modified_files)
+        all_modified_files = __scan_repositories(repositories, ignore_matcher)
+        if all_modified_files is None:
+            return False
 
         if not all_modified_files:
             print("No modified files found in any repository.")
@@ -1600,65 +2278,11 @@ def po_new(
             return False
         return True
 
-    def __load_ignore_patterns(project_cfg):
-        """Load ignore patterns from project configuration or .gitignore."""
-        patterns = []
-
-        # First, try to get ignore patterns from project configuration
-        log.debug("project_cfg type: %s, content: %s", type(project_cfg), project_cfg)
-        if project_cfg:
-            po_ignore_config = project_cfg.get("PROJECT_PO_IGNORE", "").strip()
-            log.debug("po_ignore_config: '%s'", po_ignore_config)
-            if po_ignore_config:
-                config_patterns = [p.strip() for p in po_ignore_config.split() if p.strip()]
-                patterns.extend(config_patterns)
-
-                # Add enhanced patterns for path containment matching
-                enhanced_patterns = []
-                for pattern in config_patterns:
-                    # Skip patterns that already contain wildcards or special characters
-                    if any(char in pattern for char in ["*", "?", "[", "]"]):
-                        continue
-
-                    # Add patterns to match repositories and files containing the pattern in their path
-                    enhanced_patterns.extend(
-                        [
-                            # Match any path containing the pattern
-                            f"*{pattern}*",
-                            # Match directories starting with the pattern
-                            f"*{pattern}/*",
-                            # Match directories containing the pattern
-                            f"*/{pattern}/*",
-                            # Match files/directories ending with the pattern
-                            f"*/{pattern}",
-                        ]
-                    )
-
-                patterns.extend(enhanced_patterns)
-                log.debug(
-                    "Loaded ignore patterns from project config: %s",
-                    config_patterns,
-                )
-                log.debug(
-                    "Added enhanced patterns for path containment: %s",
-                    enhanced_patterns,
-                )
-
-        # Then load from .gitignore file
-        gitignore_file = os.path.join(os.getcwd(), ".gitignore")
-        if os.path.exists(gitignore_file):
-            try:
-                with open(gitignore_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith("#"):
-                            patterns.append(line)
-                log.debug("Loaded ignore patterns from file: %s", gitignore_file)
-            except OSError as e:
-                log.warning("Failed to read ignore file %s: %s", gitignore_file, e)
-
-        log.debug("Loaded ignore patterns: %s", patterns)
-        return patterns
+    def __load_ignore_matcher(project_cfg):
+        """Load the compiled ignore matcher for PROJECT_PO_IGNORE and the workspace .gitignore."""
+        po_ignore_config = str((project_cfg or {}).get("PROJECT_PO_IGNORE", "") or "").strip()
+        log.debug("po_ignore_config: '%s'", po_ignore_config)
+        return load_ignore_matcher(po_ignore_config, os.getcwd())
 
     # Show creation information and ask for confirmation
     if not force:
@@ -1957,6 +2581,97 @@ def po_del(env: Dict, projects_info: Dict, project_name: str, po_name: str, forc
     return True
 
 
+def _po_dir_for_project(env: Dict, projects_info: Dict, project_name: str) -> Optional[str]:
+    project_cfg = projects_info.get(project_name, {}) if isinstance(projects_info, dict) else {}
+    board_name = project_cfg.get("board_name") if isinstance(project_cfg, dict) else None
+    if not board_name:
+        log.error("Board info missing for project '%s'", project_name)
+        return None
+    return os.path.join(env["projects_path"], board_name, "po")
+
+
+@register("po_pack", needs_repositories=False, desc="Pack a PO directory into a single indexed bundle file")
+def po_pack(env: Dict, projects_info: Dict, project_name: str, po_name: str, remove_dir: bool = False) -> bool:
+    """
+    Pack `po/<po_name>/` into `po/<po_name>.pobundle` (uncompressed tar with a JSON index first).
+    PO commands read the bundle transparently when the PO directory is absent.
+    Args:
+        env (dict): Global environment dict.
+        projects_info (dict): All projects info.
+        project_name (str): Project name (selects the board).
+        po_name (str): Name of the PO to pack.
+        remove_dir (bool): Remove the PO directory after a successful pack.
+    Returns:
+        bool: True if success, otherwise False.
+    """
+    po_dir = _po_dir_for_project(env, projects_info, project_name)
+    if po_dir is None:
+        return False
+    po_path = os.path.join(po_dir, po_name)
+    if not os.path.isdir(po_path):
+        log.error("PO directory '%s' does not exist", po_path)
+        return False
+    bundle_file = bundle_path_for(po_path)
+    try:
+        count = pack_po(po_path, bundle_file)
+    except (OSError, ValueError, tarfile.TarError) as e:
+        log.error("Failed to pack PO '%s': %s", po_name, e)
+        return False
+    log.info("packed %d file(s) of po '%s' into '%s'", count, po_name, bundle_file)
+    if remove_dir:
+        try:
+            shutil.rmtree(po_path)
+        except OSError as e:
+            log.error("Failed to remove PO directory '%s': %s", po_path, e)
+            return False
+        log.info("removed PO directory '%s'", po_path)
+    return True
+
+
+@register("po_unpack", needs_repositories=False, desc="Extract a PO bundle back into a PO directory")
+def po_unpack(env: Dict, projects_info: Dict, project_name: str, po_name: str, remove_bundle: bool = False) -> bool:
+    """
+    Extract `po/<po_name>.pobundle` into `po/<po_name>/`.
+    Args:
+        env (dict): Global environment dict.
+        projects_info (dict): All projects info.
+        project_name (str): Project name (selects the board).
+        po_name (str): Name of the PO to unpack.
+        remove_bundle (bool): Remove the bundle file after a successful unpack.
+    Returns:
+        bool: True if success, otherwise False.
+    """
+    po_dir = _po_dir_for_project(env, projects_info, project_name)
+    if po_dir is None:
+        return False
+    po_path = os.path.join(po_dir, po_name)
+    bundle_file = bundle_path_for(po_path)
+    if not os.path.isfile(bundle_file):
+        log.error("PO bundle '%s' does not exist", bundle_file)
+        return False
+    if os.path.exists(po_path):
+        log.error("PO directory '%s' already exists", po_path)
+        return False
+    try:
+        count = unpack_po(bundle_file, po_path)
+    except (OSError, ValueError, KeyError) as e:
+        log.error("Failed to unpack PO bundle '%s': %s", bundle_file, e)
+        return False
+    log.info("unpacked %d file(s) of po '%s' into '%s'", count, po_name, po_path)
+    if remove_bundle:
+        try:
+            os.remove(bundle_file)
+        except OSError as e:
+            log.error("Failed to remove PO bundle '%s': %s", bundle_file, e)
+            return False
+    return True
+
+
+def _record_counts(record: Dict[str, Any]) -> Dict[str, int]:
+    """Per-section entry counts of an applied record."""
+    return {key: len(record.get(key) or []) for key in ("commits", "patches", "overrides", "custom", "commands")}
+
+
 @register("po_status", needs_repositories=True, desc="Show applied record status for a project")
 def po_status(
     env: Dict,
@@ -1965,6 +2680,8 @@ def po_status(
     po: str = "",
     short: bool = False,
     json: bool = False,
+    repo: str = "",
+    compact: bool = False,
 ) -> List[dict]:
     """
     Show applied record status for configured POs of the specified project.
@@ -1976,6 +2693,8 @@ def po_status(
         po (str): Optional PO filter; only show these POs (comma/space separated) from PROJECT_PO_CONFIG.
         short (bool): If True, only print per-PO summary.
         json (bool): If True, print JSON output to stdout.
+        repo (str): Optional repository filter (comma/space separated); only POs touching them are shown.
+        compact (bool): With json, print compact single-line JSON.
     Returns:
         list: List of dicts with per-PO applied record status.
     """
@@ -2017,6 +2736,13 @@ def po_status(
     )
 
     repo_entries = sorted(runtime.repositories, key=lambda item: (item[1] != "root", item[1]))
+    repo_filter: Optional[Set[str]] = None
+    if repo:
+        scoped = _scope_pos_to_repos(repo, apply_pos, po_dir, runtime)
+        if scoped is None:
+            return []
+        apply_pos, _scoped_files, repo_filter = scoped
+        repo_entries = [entry for entry in repo_entries if entry[1] in repo_filter]
 
     items: List[dict] = []
     for po_name in sorted(apply_pos):
@@ -2040,13 +2766,7 @@ def po_status(
                     record_ok = True
                     row_status = str(record.get("status") or "applied")
                     applied_at = record.get("applied_at")
-                    counts = {
-                        "commits": len(record.get("commits") or []),
-                        "patches": len(record.get("patches") or []),
-                        "overrides": len(record.get("overrides") or []),
-                        "custom": len(record.get("custom") or []),
-                        "commands": len(record.get("commands") or []),
-                    }
+                    counts = _record_counts(record)
 
             rows.append(
                 {
@@ -2063,7 +2783,7 @@ def po_status(
 
         # Workspace-level record (used by custom copies that don't map into repos).
         workspace_record_path = runtime.applied_record_path(runtime.workspace_root, po_name)
-        if os.path.isfile(workspace_record_path):
+        if repo_filter is None and os.path.isfile(workspace_record_path):
             record = runtime.load_applied_record(runtime.workspace_root, po_name)
             row_status = "unreadable" if record is None else str(record.get("status") or "applied")
             applied_at = None
@@ -2072,13 +2792,7 @@ def po_status(
             if record is not None:
                 record_ok = True
                 applied_at = record.get("applied_at")
-                counts = {
-                    "commits": len(record.get("commits") or []),
-                    "patches": len(record.get("patches") or []),
-                    "overrides": len(record.get("overrides") or []),
-                    "custom": len(record.get("custom") or []),
-                    "commands": len(record.get("commands") or []),
-                }
+                counts = _record_counts(record)
 
             rows.append(
                 {
@@ -2110,7 +2824,7 @@ def po_status(
             "board_name": board_name,
             "items": items,
         }
-        print(jsonlib.dumps(payload, indent=2, ensure_ascii=False))
+        print_json(payload, compact=compact)
         return items
 
     print(f"\nPO status for project: {project_name} (board: {board_name})")
@@ -2137,6 +2851,344 @@ def po_status(
     return items
 
 
+def _verify_fingerprint(path: str, expected: Dict[str, Any], hash_cache: FileHashCache) -> str:
+    """Classify one recorded copy: ok, modified, missing or unrecorded (record has no fingerprint)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    if not expected.get("sha256"):
+        return "unrecorded"
+    if st.st_size != expected.get("size"):
+        return "modified"
+    if st.st_mtime_ns == expected.get("mtime_ns"):
+        return "ok"
+    return "ok" if hash_cache.sha256(path, st) == expected["sha256"] else "modified"
+
+
+def _verify_repo_records(
+    runtime: PoPluginRuntime,
+    repo_path: str,
+    repo_name: str,
+    po_names: List[str],
+    hash_cache: FileHashCache,
+) -> List[dict]:
+    """Check every override and custom copy recorded for one repository."""
+    results: List[dict] = []
+    for po_name in po_names:
+        if not os.path.isfile(runtime.applied_record_path(repo_path, po_name)):
+            continue
+        record = runtime.load_applied_record(repo_path, po_name)
+        if record is None:
+            results.append({"po": po_name, "repo": repo_name, "kind": "record", "path": "", "status": "unreadable"})
+            continue
+        for entry in record.get("overrides") or []:
+            path_in_repo = str(entry.get("path_in_repo") or "")
+            dest = os.path.join(repo_path, path_in_repo)
+            if entry.get("operation") == "remove":
+                status = "reappeared" if os.path.lexists(dest) else "ok"
+            else:
+                status = _verify_fingerprint(dest, entry, hash_cache)
+            results.append({"po": po_name, "repo": repo_name, "kind": "override", "path": path_in_repo, "status": status})
+        for entry in record.get("custom") or []:
+            files = entry.get("files")
+            if files is None:
+                target = str(entry.get("target") or "")
+                results.append({"po": po_name, "repo": repo_name, "kind": "custom", "path": target, "status": "unrecorded"})
+                continue
+            for file_entry in files:
+                path = str(file_entry.get("path") or "")
+                status = _verify_fingerprint(path, file_entry, hash_cache)
+                results.append({"po": po_name, "repo": repo_name, "kind": "custom", "path": path, "status": status})
+    return results
+
+
+@register("po_verify", needs_repositories=True, desc="Check applied overrides and custom copies for drift")
+def po_verify(
+    env: Dict,
+    projects_info: Dict,
+    project_name: str,
+    po: str = "",
+    json: bool = False,
+    report: str = "",
+    jobs: str = "",
+) -> bool:
+    """
+    Verify that files copied by applied POs still match what was applied.
+
+    Each override and custom copy is checked against the size, mtime and sha256
+    stored in its applied record. Files whose stat is unchanged are not read;
+    others are hashed once and remembered in `.cache/po_verify_hashes.json`.
+
+    Args:
+        env (dict): Global environment dict.
+        projects_info (dict): All projects info.
+        project_name (str): Project name.
+        po (str): Optional PO filter; only verify these POs (comma/space separated) from PROJECT_PO_CONFIG.
+        json (bool): If True, print the JSON drift report to stdout.
+        report (str): Optional path to write the JSON drift report to.
+        jobs (str): Number of repositories checked in parallel (default: CPU count).
+    Returns:
+        bool: True if nothing drifted, False on drift or error.
+    """
+    log.info("start po_verify for project: '%s'", project_name)
+    project_info = projects_info.get(project_name, {}) if isinstance(projects_info, dict) else {}
+    project_cfg = project_info.get("config", {}) if isinstance(project_info, dict) else {}
+    board_name = project_info.get("board_name") if isinstance(project_info, dict) else None
+    if not board_name:
+        log.error("Cannot find board name for project: '%s'", project_name)
+        return False
+
+    apply_pos, _, _ = parse_po_config(str(project_cfg.get("PROJECT_PO_CONFIG", "") or "").strip())
+    filtered = _filter_pos_from_config(apply_pos, _parse_po_filter(po))
+    if filtered is None:
+        return False
+    apply_pos = sorted(filtered)
+
+    max_workers = parse_jobs(jobs)
+    if max_workers < 1:
+        log.error("Invalid --jobs value: '%s'", jobs)
+        return False
+
+    runtime = PoPluginRuntime(
+        board_name=board_name,
+        project_name=project_name,
+        repositories=env.get("repositories", []),
+        workspace_root=os.getcwd(),
+        po_configs=env.get("po_configs", {}),
+    )
+    # In single-repo mode "root" is the workspace itself; check each directory once.
+    repo_entries: List[Tuple[str, str]] = []
+    seen_paths: Set[str] = set()
+    for repo_path, repo_name in sorted(runtime.repositories, key=lambda item: (item[1] != "root", item[1])):
+        if os.path.realpath(repo_path) not in seen_paths:
+            seen_paths.add(os.path.realpath(repo_path))
+            repo_entries.append((repo_path, repo_name))
+    if os.path.realpath(runtime.workspace_root) not in seen_paths:
+        repo_entries.append((runtime.workspace_root, "workspace"))
+
+    hash_cache = FileHashCache("po_verify_hashes", runtime.workspace_root)
+    results: List[dict] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(repo_entries)))) as executor:
+        futures = [
+            executor.submit(_verify_repo_records, runtime, repo_path, repo_name, apply_pos, hash_cache)
+            for repo_path, repo_name in repo_entries
+        ]
+        for future in futures:
+            results.extend(future.result())
+    hash_cache.save()
+
+    # Records written before fingerprints existed cannot drift-check; list them without failing.
+    unrecorded = [item for item in results if item["status"] == "unrecorded"]
+    drift = [item for item in results if item["status"] not in ("ok", "unrecorded")]
+    payload = {
+        "schema_version": 1,
+        "project_name": project_name,
+        "board_name": board_name,
+        "checked": len(results),
+        "hashed": hash_cache.hashed,
+        "drift_count": len(drift),
+        "drift": drift,
+        "unrecorded_count": len(unrecorded),
+        "unrecorded": unrecorded,
+    }
+    if report:
+        os.makedirs(os.path.dirname(os.path.abspath(report)), exist_ok=True)
+        with open(report, "w", encoding="utf-8") as handle:
+            write_json(payload, handle)
+    if json:
+        print_json(payload)
+    else:
+        print(f"\nPO verify for project: {project_name} (board: {board_name})")
+        counts = f"checked: {len(results)}  hashed: {hash_cache.hashed}  drift: {len(drift)}"
+        print(f"  {counts}  unrecorded: {len(unrecorded)}")
+        for item in drift + unrecorded:
+            print(f"  - [{item['status']}] {item['po']} {item['repo']}: {item['kind']} {item['path']}")
+        if unrecorded:
+            print("  Note: unrecorded entries predate fingerprinting; apply the PO again to check them.")
+
+    if drift:
+        log.error("po_verify found %d drifted file(s) for '%s'", len(drift), project_name)
+        return False
+    return True
+
+
+def _parse_selector(value: str) -> List[str]:
+    """Split a comma/space separated selector into fnmatch patterns."""
+    return [token for token in re.split(r"[,\s]+", str(value or "").strip()) if token]
+
+
+def _scan_applied_tree(
+    repo_path: str,
+    repo_name: str,
+    targets: Dict[Tuple[str, str], List[str]],
+    summary: bool,
+) -> List[Tuple[str, str, dict]]:
+    """
+    Walk `<repo>/.cache/po_applied` once and return (project, po segment, row) for selected projects.
+
+    `targets` maps (board segment, project segment) to project names. In summary
+    mode records are only listed; otherwise each one is parsed for status and counts.
+    """
+    found: List[Tuple[str, str, dict]] = []
+    root = os.path.join(repo_path, ".cache", "po_applied")
+    try:
+        boards = [entry for entry in os.scandir(root) if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return found
+    for board_entry in boards:
+        for project_entry in os.scandir(board_entry.path):
+            project_names = targets.get((board_entry.name, project_entry.name))
+            if not project_names or not project_entry.is_dir(follow_symlinks=False):
+                continue
+            for record_entry in os.scandir(project_entry.path):
+                if not record_entry.name.endswith(".json") or not record_entry.is_file(follow_symlinks=False):
+                    continue
+                row: Dict[str, Any] = {"repo_name": repo_name, "record_path": record_entry.path}
+                if not summary:
+                    try:
+                        with open(record_entry.path, "r", encoding="utf-8") as handle:
+                            record = jsonlib.load(handle)
+                    except (OSError, ValueError):
+                        record = None
+                    if isinstance(record, dict):
+                        row.update(
+                            status=str(record.get("status") or "applied"),
+                            applied_at=record.get("applied_at"),
+                            counts=_record_counts(record),
+                        )
+                    else:
+                        row.update(status="unreadable", applied_at=None, counts=None)
+                for project_name in project_names:
+                    found.append((project_name, record_entry.name[: -len(".json")], row))
+    return found
+
+
+@register("po_status_all", needs_repositories=True, desc="Show applied record status across all projects")
+def po_status_all(
+    env: Dict,
+    projects_info: Dict,
+    board_name: str = "",
+    project: str = "",
+    summary: bool = False,
+    ndjson: bool = False,
+    json: bool = False,
+    jobs: str = "",
+) -> bool:
+    """
+    Report applied PO records for every project (optionally one board or a project selector).
+
+    Each repository's `.cache/po_applied` tree is scanned once, in parallel, and
+    the records are aggregated by project, PO and repository.
+
+    Args:
+        env (dict): Global environment dict.
+        projects_info (dict): All projects info.
+        board_name (str): Optional board; only its projects are reported.
+        project (str): Optional project selector (comma/space separated fnmatch patterns).
+        summary (bool): If True, only count records without parsing them.
+        ndjson (bool): If True, stream one JSON object per project and PO to stdout.
+        json (bool): If True, print a single JSON payload to stdout.
+        jobs (str): Number of repositories scanned in parallel (default: CPU count).
+    Returns:
+        bool: True on success, False on invalid arguments.
+    """
+    board_name = str(board_name or "").strip()
+    patterns = _parse_selector(project)
+    max_workers = parse_jobs(jobs)
+    if max_workers < 1:
+        log.error("Invalid --jobs value: '%s'", jobs)
+        return False
+    if board_name and not any(
+        isinstance(info, dict) and info.get("board_name") == board_name for info in (projects_info or {}).values()
+    ):
+        log.error("Cannot find board: '%s'", board_name)
+        return False
+
+    selected: Dict[str, Dict[str, Any]] = {}
+    targets: Dict[Tuple[str, str], List[str]] = {}
+    for name, info in sorted((projects_info or {}).items()):
+        if not isinstance(info, dict) or not info.get("board_name"):
+            continue
+        if board_name and info.get("board_name") != board_name:
+            continue
+        if patterns and not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            continue
+        apply_pos, _, _ = parse_po_config(str((info.get("config") or {}).get("PROJECT_PO_CONFIG", "") or ""))
+        selected[name] = {"board_name": info["board_name"], "pos": apply_pos}
+        key = (safe_cache_segment(info["board_name"]), safe_cache_segment(name))
+        targets.setdefault(key, []).append(name)
+    if patterns and not selected:
+        log.warning("No projects match selector: '%s'", project)
+
+    repo_entries: List[Tuple[str, str]] = []
+    seen_paths: Set[str] = set()
+    for repo_path, repo_name in sorted(env.get("repositories", []), key=lambda item: (item[1] != "root", item[1])):
+        if os.path.abspath(repo_path) not in seen_paths:
+            seen_paths.add(os.path.abspath(repo_path))
+            repo_entries.append((repo_path, repo_name))
+    if os.path.abspath(os.getcwd()) not in seen_paths:
+        repo_entries.append((os.getcwd(), "workspace"))
+
+    found: List[Tuple[str, str, dict]] = []
+    if targets and repo_entries:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(repo_entries))) as executor:
+            futures = [
+                executor.submit(_scan_applied_tree, repo_path, repo_name, targets, bool(summary))
+                for repo_path, repo_name in repo_entries
+            ]
+            for future in futures:
+                found.extend(future.result())
+
+    rows_by_po: Dict[Tuple[str, str], List[dict]] = {}
+    for project_name, po_segment, row in found:
+        rows_by_po.setdefault((project_name, po_segment), []).append(row)
+
+    items: List[dict] = []
+    for project_name, info in selected.items():
+        po_names = {safe_cache_segment(po_name): po_name for po_name in info["pos"]}
+        recorded = {po_segment for name, po_segment in rows_by_po if name == project_name}
+        for po_segment in sorted(set(po_names) | recorded):
+            rows = rows_by_po.get((project_name, po_segment), [])
+            items.append(
+                {
+                    "project_name": project_name,
+                    "board_name": info["board_name"],
+                    "po": po_names.get(po_segment, po_segment),
+                    "configured": po_segment in po_names,
+                    "applied_record_count": len(rows),
+                    "repos": rows,
+                }
+            )
+
+    if ndjson:
+        for item in items:
+            print_json(item, compact=True)
+        return True
+    if json:
+        payload = {
+            "schema_version": 1,
+            "operation": "po_status_all",
+            "board_name": board_name,
+            "summary_only": bool(summary),
+            "project_count": len(selected),
+            "items": items,
+        }
+        print_json(payload)
+        return True
+
+    print(f"\nPO status for {len(selected)} project(s), {len(repo_entries)} repo root(s) scanned")
+    current = None
+    for item in items:
+        if item["project_name"] != current:
+            current = item["project_name"]
+            print(f"\n{current} (board: {item['board_name']})")
+        note = "" if item["configured"] else "  [not in PROJECT_PO_CONFIG]"
+        repos = ",".join(row["repo_name"] for row in item["repos"]) or "-"
+        print(f"  {item['po']}: {item['applied_record_count']} record(s) [{repos}]{note}")
+    return True
+
+
 @register("po_clear", needs_repositories=True, desc="Clear applied record markers for a project")
 def po_clear(
     env: Dict,
@@ -2229,6 +3281,7 @@ def po_list(
     short: bool = False,
     po: str = "",
     json: bool = False,
+    compact: bool = False,
 ) -> List[dict]:
     """
     List all enabled PO (patch/override) directories for the specified project.
@@ -2239,6 +3292,7 @@ def po_list(
         short (bool): If True, only list po names, not details.
         po (str): Optional PO filter; only list these POs (comma/space separated) from PROJECT_PO_CONFIG.
         json (bool): If True, print JSON output to stdout.
+        compact (bool): With json, print compact single-line JSON.
     Returns:
         list: List of dicts with PO info (name, commit_files, patch_files, override_files)
     """
@@ -2282,8 +3336,10 @@ def po_list(
     # Only list POs enabled in configuration
     po_infos = []
     for po_name in sorted(apply_pos):
-        po_path = os.path.join(po_dir, po_name)
-        if not os.path.isdir(po_path):
+        if not po_exists(os.path.join(po_dir, po_name)):
+            continue
+        po_path = _resolve_po_path(po_dir, po_name)
+        if po_path is None:
             continue
 
         po_info = {
@@ -2304,7 +3360,7 @@ def po_list(
             "board_name": board_name,
             "items": po_infos,
         }
-        print(jsonlib.dumps(payload, indent=2, ensure_ascii=False))
+        print_json(payload, compact=compact)
         return po_infos
 
     # Print summary
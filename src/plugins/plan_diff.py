@@ -0,0 +1,204 @@
+"""Compare two plans written by --emit-plan."""
+
+from __future__ import annotations
+
+import json as jsonlib
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.log_manager import log
+from src.operations.registry import register
+from src.plan_utils import print_json
+
+# (repo, po, type, identity field, identity value)
+ActionKey = Tuple[str, str, str, str, str]
+_KEY_FIELDS = ("repo", "po", "type")
+# Fields that tell two actions of one type apart, in order of preference:
+# commit_revert actions have a sha, remove_applied_record actions a path.
+_IDENTITY_FIELDS = ("source", "sha", "path_in_repo", "path")
+
+
+def _load_plan(path: str) -> Optional[Dict[str, Any]]:
+    path = os.path.expanduser(str(path or "").strip())
+    if not path:
+        log.error("plan_diff needs two plan paths")
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            plan = jsonlib.load(handle)
+    except (OSError, ValueError) as exc:
+        log.error("Failed to read plan '%s': %s", path, exc)
+        return None
+    if not isinstance(plan, dict):
+        log.error("Plan '%s' is not a JSON object", path)
+        return None
+    return plan
+
+
+def _action_identity(action: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (field, value) identifying a PO action among actions of its type, falling back to the first target."""
+    for name in _IDENTITY_FIELDS:
+        if action.get(name):
+            return name, str(action[name])
+    targets = action.get("targets") or []
+    return ("target", str(targets[0])) if targets else ("", "")
+
+
+def _add_action(actions: Dict[ActionKey, Dict[str, Any]], key: ActionKey, action: Dict[str, Any]) -> None:
+    """Store an action, numbering repeats of a key (`value#2`, ...) instead of overwriting them."""
+    unique, count = key, 1
+    while unique in actions:
+        count += 1
+        unique = (*key[:4], f"{key[4]}#{count}")
+    actions[unique] = action
+
+
+def _plan_index(plan: Dict[str, Any]) -> Tuple[Dict[ActionKey, Dict[str, Any]], Dict[str, Set[str]]]:
+    """
+    Index a plan into ({(repo, po, type, field, value): action}, {repo: target paths}).
+
+    PO plans are indexed by their per_repo_actions, each identified within its
+    type by source, commit sha or path; project_diff plans map each changed
+    file to a "file" action; project_build plans map each step to a "step"
+    action keyed by its name.
+    """
+    actions: Dict[ActionKey, Dict[str, Any]] = {}
+    targets: Dict[str, Set[str]] = {}
+    if isinstance(plan.get("per_repo_actions"), list):
+        for repo_entry in plan["per_repo_actions"]:
+            repo = str(repo_entry.get("repo") or "")
+            repo_targets = targets.setdefault(repo, set())
+            for action in repo_entry.get("actions") or []:
+                po, action_type = str(action.get("po") or ""), str(action.get("type") or "")
+                _add_action(actions, (repo, po, action_type, *_action_identity(action)), action)
+                repo_targets.update(str(target) for target in action.get("targets") or [])
+                if action.get("path_in_repo"):
+                    repo_targets.add(str(action["path_in_repo"]))
+    elif plan.get("operation") == "project_diff":
+        for repo_entry in plan.get("repositories") or []:
+            repo = str(repo_entry.get("repo") or "")
+            staged = set(repo_entry.get("staged_files") or [])
+            files = [str(path) for path in repo_entry.get("all_files") or []]
+            targets[repo] = set(files)
+            for path in files:
+                actions[(repo, "", "file", "source", path)] = {"staged": path in staged}
+    else:
+        for index, step in enumerate(plan.get("steps") or []):
+            name = str(step.get("name") or f"step{index}")
+            key = ("", "", "step", "source", name)
+            if key in actions:
+                key = ("", "", "step", "source", f"{name}#{index}")
+            actions[key] = step
+    return actions, targets
+
+
+def _key_dict(key: ActionKey) -> Dict[str, str]:
+    fields = dict(zip(_KEY_FIELDS, key))
+    if key[3]:
+        fields[key[3]] = key[4]
+    return fields
+
+
+def diff_plans(plan_a: Dict[str, Any], plan_b: Dict[str, Any]) -> Dict[str, Any]:
+    """Return added, removed and changed actions plus per-repo target changes between two plans."""
+    actions_a, targets_a = _plan_index(plan_a)
+    actions_b, targets_b = _plan_index(plan_b)
+
+    added = [{**_key_dict(key), "action": actions_b[key]} for key in sorted(actions_b.keys() - actions_a.keys())]
+    removed = [{**_key_dict(key), "action": actions_a[key]} for key in sorted(actions_a.keys() - actions_b.keys())]
+    changed: List[Dict[str, Any]] = []
+    for key in sorted(actions_a.keys() & actions_b.keys()):
+        before, after = actions_a[key], actions_b[key]
+        if before == after:
+            continue
+        fields = sorted(name for name in before.keys() | after.keys() if before.get(name) != after.get(name))
+        changed.append({**_key_dict(key), "fields": fields, "before": before, "after": after})
+
+    target_changes: List[Dict[str, Any]] = []
+    for repo in sorted(targets_a.keys() | targets_b.keys()):
+        old, new = targets_a.get(repo, set()), targets_b.get(repo, set())
+        if old != new:
+            target_changes.append({"repo": repo, "added": sorted(new - old), "removed": sorted(old - new)})
+
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "targets": target_changes,
+        "summary": {
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "target_repos": len(target_changes),
+            "identical": not (added or removed or changed or target_changes),
+        },
+    }
+
+
+def _describe(item: Dict[str, Any]) -> str:
+    return " ".join(str(item[name]) for name in (*_KEY_FIELDS, *_IDENTITY_FIELDS, "target") if item.get(name))
+
+
+@register(
+    "plan_diff",
+    needs_projects=False,
+    needs_repositories=False,
+    desc="Compare two plans written by --emit-plan.",
+)
+def plan_diff(
+    env: Dict[str, Any],
+    projects_info: Dict[str, Any],
+    plan_a: str,
+    plan_b: str,
+    json: bool = False,
+    compact: bool = False,
+) -> bool:
+    """
+    Report added, removed and changed plan actions and per-repo target changes.
+
+    plan_a (str): Path to the older plan JSON.
+    plan_b (str): Path to the newer plan JSON.
+    json (bool): Output machine-readable JSON to stdout.
+    compact (bool): With --json, print compact single-line JSON.
+    """
+    _ = env, projects_info
+    first = _load_plan(plan_a)
+    second = _load_plan(plan_b)
+    if first is None or second is None:
+        return False
+    operation_a, operation_b = first.get("operation"), second.get("operation")
+    if operation_a != operation_b:
+        log.warning("Comparing plans of different operations: '%s' vs '%s'", operation_a, operation_b)
+
+    result = diff_plans(first, second)
+    if json:
+        print_json(
+            {
+                "schema_version": 1,
+                "operation": "plan_diff",
+                "plan_a": {"path": plan_a, "operation": operation_a, "generated_at": first.get("generated_at")},
+                "plan_b": {"path": plan_b, "operation": operation_b, "generated_at": second.get("generated_at")},
+                **result,
+            },
+            compact=compact,
+        )
+        return True
+
+    summary = result["summary"]
+    if summary["identical"]:
+        print(f"Plans are equivalent ({operation_a}).")
+        return True
+    print(
+        f"Plan diff ({operation_a}): {summary['added']} added, {summary['removed']} removed, "
+        f"{summary['changed']} changed, {summary['target_repos']} repo(s) with target changes"
+    )
+    for item in result["added"]:
+        print(f"  + {_describe(item)}")
+    for item in result["removed"]:
+        print(f"  - {_describe(item)}")
+    for item in result["changed"]:
+        print(f"  ~ {_describe(item)} ({', '.join(item['fields'])})")
+    for item in result["targets"]:
+        changes = [f"+{path}" for path in item["added"]] + [f"-{path}" for path in item["removed"]]
+        print(f"  targets {item['repo'] or '(root)'}: {' '.join(changes)}")
+    return True
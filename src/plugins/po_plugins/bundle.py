@@ -0,0 +1,221 @@
+"""
+Single-file PO bundles (`po/<po_name>.pobundle`).
+
+A bundle is an uncompressed tar whose first member is a JSON index with the
+relpath, size, mode, sha256 and data offset of every PO file. Listing a
+bundled PO costs one open and one read; file contents are read with a seek
+per entry. Standard `tar` can still list and extract a bundle.
+
+When only the bundle exists, `resolve_po_path` extracts it once into
+`<workspace>/.cache/po_bundles/<index digest>/<po_name>` so plugins can keep
+working with file paths, and registers the index so `list_po_files` answers
+from it instead of walking the directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import threading
+from typing import Any, Dict, List, Optional
+
+BUNDLE_SUFFIX = ".pobundle"
+INDEX_NAME = ".po_index.json"
+BUNDLE_VERSION = 1
+# Runtime state that is never packed.
+_SKIP_TOP_LEVEL = {"po_applied"}
+_FIRST_READ_SIZE = 64 * 1024
+_EXTRACTED_MARKER = ".po_bundle_extracted"
+
+_listing_lock = threading.Lock()
+_bundle_listings: Dict[str, List[str]] = {}
+
+
+def bundle_path_for(po_path: str) -> str:
+    """Return the bundle file path that stands in for a PO directory."""
+    return os.path.normpath(po_path) + BUNDLE_SUFFIX
+
+
+def po_exists(po_path: str) -> bool:
+    """True when a PO is present as a directory or as a bundle."""
+    return os.path.isdir(po_path) or os.path.isfile(bundle_path_for(po_path))
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class PoBundle:
+    """Read access to a PO bundle through its index."""
+
+    def __init__(self, path: str, index: Dict[str, Any], index_bytes: bytes) -> None:
+        self.path = path
+        self.index = index
+        self.digest = _sha256_bytes(index_bytes)
+        self.entries: Dict[str, Dict[str, Any]] = {entry["path"]: entry for entry in index.get("files") or []}
+
+    @classmethod
+    def open(cls, path: str) -> "PoBundle":
+        """Read the index with a single read (a second one only for very large indexes)."""
+        with open(path, "rb") as handle:
+            head = handle.read(_FIRST_READ_SIZE)
+            if len(head) < tarfile.BLOCKSIZE:
+                raise ValueError(f"{path}: not a PO bundle")
+            info = tarfile.TarInfo.frombuf(head[: tarfile.BLOCKSIZE], "utf-8", "surrogateescape")
+            if info.name != INDEX_NAME:
+                raise ValueError(f"{path}: first member is not {INDEX_NAME}")
+            end = tarfile.BLOCKSIZE + info.size
+            if len(head) < end:
+                head += handle.read(end - len(head))
+        index_bytes = head[tarfile.BLOCKSIZE : end]
+        index = json.loads(index_bytes.decode("utf-8"))
+        if not isinstance(index, dict) or index.get("version") != BUNDLE_VERSION:
+            raise ValueError(f"{path}: unsupported PO bundle version")
+        return cls(path, index, index_bytes)
+
+    def files(self) -> List[str]:
+        return sorted(self.entries)
+
+    def read(self, rel_path: str) -> bytes:
+        entry = self.entries[rel_path]
+        with open(self.path, "rb") as handle:
+            handle.seek(entry["offset"])
+            return handle.read(entry["size"])
+
+    def extract_to(self, dest_dir: str) -> None:
+        """Write every entry below dest_dir, verifying sizes and hashes."""
+        root = os.path.abspath(dest_dir)
+        with open(self.path, "rb") as handle:
+            for rel_path in self.files():
+                entry = self.entries[rel_path]
+                target = os.path.abspath(os.path.join(root, *rel_path.split("/")))
+                if os.path.commonpath([root, target]) != root:
+                    raise ValueError(f"{self.path}: entry escapes the PO directory: {rel_path}")
+                handle.seek(entry["offset"])
+                data = handle.read(entry["size"])
+                if len(data) != entry["size"] or _sha256_bytes(data) != entry["sha256"]:
+                    raise ValueError(f"{self.path}: corrupt entry {rel_path}")
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "wb") as out:
+                    out.write(data)
+                os.chmod(target, entry.get("mode", 0o644) & 0o777)
+
+
+def _collect_files(po_path: str) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    for root, dirs, files in os.walk(po_path):
+        dirs.sort()
+        for fname in sorted(files):
+            abs_path = os.path.join(root, fname)
+            rel_path = os.path.relpath(abs_path, po_path).replace(os.sep, "/")
+            if rel_path in _SKIP_TOP_LEVEL:
+                continue
+            if os.path.islink(abs_path) or not os.path.isfile(abs_path):
+                raise ValueError(f"cannot pack non-regular file: {abs_path}")
+            with open(abs_path, "rb") as handle:
+                data = handle.read()
+            entries.append(
+                {
+                    "path": rel_path,
+                    "size": len(data),
+                    "mode": os.stat(abs_path).st_mode & 0o777,
+                    "sha256": _sha256_bytes(data),
+                    "offset": 0,
+                }
+            )
+    return entries
+
+
+def _index_bytes(po_name: str, entries: List[Dict[str, Any]]) -> bytes:
+    payload = {"version": BUNDLE_VERSION, "po_name": po_name, "files": entries}
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+
+def pack_po(po_path: str, bundle_path: str) -> int:
+    """Pack a PO directory into a bundle; return the number of packed files."""
+    po_name = os.path.basename(os.path.normpath(po_path))
+    entries = _collect_files(po_path)
+    # Reserve room for the final offsets, then fill them in once tar has laid out the members.
+    for entry in entries:
+        entry["offset"] = 10**15
+    reserved = len(_index_bytes(po_name, entries))
+
+    tmp_path = f"{bundle_path}.tmp"
+    with tarfile.open(tmp_path, "w", format=tarfile.PAX_FORMAT) as tar:
+        info = tarfile.TarInfo(INDEX_NAME)
+        info.size = reserved
+        tar.addfile(info, io.BytesIO(b" " * reserved))
+        for entry in entries:
+            tar.add(os.path.join(po_path, *entry["path"].split("/")), arcname=entry["path"], recursive=False)
+
+    with tarfile.open(tmp_path, "r") as tar:
+        offsets = {member.name: member.offset_data for member in tar.getmembers()}
+    for entry in entries:
+        entry["offset"] = offsets[entry["path"]]
+    index = _index_bytes(po_name, entries)
+    with open(tmp_path, "r+b") as handle:
+        handle.seek(offsets[INDEX_NAME])
+        handle.write(index.ljust(reserved, b" "))
+    os.replace(tmp_path, bundle_path)
+    return len(entries)
+
+
+def unpack_po(bundle_path: str, po_path: str) -> int:
+    """Extract a bundle into a PO directory; return the number of files written."""
+    bundle = PoBundle.open(bundle_path)
+    bundle.extract_to(po_path)
+    return len(bundle.entries)
+
+
+def _register_listing(po_path: str, files: List[str]) -> None:
+    with _listing_lock:
+        _bundle_listings[os.path.abspath(po_path)] = files
+
+
+def bundle_listing(base_dir: str) -> Optional[List[str]]:
+    """
+    Return sorted relpaths (os.sep separated) below base_dir when base_dir is a
+    subdirectory of an extracted bundle, or None when it is a plain PO directory.
+    """
+    abs_dir = os.path.abspath(base_dir)
+    parent, kind = os.path.split(abs_dir)
+    with _listing_lock:
+        files = _bundle_listings.get(parent)
+    if files is None:
+        return None
+    prefix = kind + "/"
+    return [
+        rel[len(prefix) :].replace("/", os.sep)
+        for rel in files
+        if rel.startswith(prefix) and os.path.basename(rel) != ".gitkeep"
+    ]
+
+
+def resolve_po_path(po_path: str, cache_root: Optional[str] = None) -> str:
+    """
+    Return a directory to read a PO from: the PO directory itself, or the
+    extracted copy of `<po_path>.pobundle` when only the bundle exists.
+    """
+    if os.path.isdir(po_path):
+        return po_path
+    bundle_file = bundle_path_for(po_path)
+    if not os.path.isfile(bundle_file):
+        return po_path
+    bundle = PoBundle.open(bundle_file)
+    cache_root = cache_root or os.path.join(os.getcwd(), ".cache", "po_bundles")
+    dest = os.path.join(cache_root, bundle.digest, os.path.basename(os.path.normpath(po_path)))
+    if not os.path.isfile(os.path.join(os.path.dirname(dest), _EXTRACTED_MARKER)):
+        staging = f"{os.path.dirname(dest)}.tmp{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        bundle.extract_to(os.path.join(staging, os.path.basename(dest)))
+        with open(os.path.join(staging, _EXTRACTED_MARKER), "w", encoding="utf-8") as handle:
+            handle.write(bundle_file + "\n")
+        shutil.rmtree(os.path.dirname(dest), ignore_errors=True)
+        os.makedirs(cache_root, exist_ok=True)
+        os.replace(staging, os.path.dirname(dest))
+    _register_listing(dest, bundle.files())
+    return dest
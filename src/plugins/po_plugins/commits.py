@@ -5,9 +5,8 @@ PO plugin: commits (git format-patch + git am -k --keep-cr).
 from __future__ import annotations
 
 import os
-import re
 import subprocess
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 
 from src.log_manager import log, summarize_output
 
@@ -17,18 +16,11 @@ from .registry import (
     register_simple_plugin,
 )
 from .runtime import PoPluginContext, PoPluginRuntime
-from .utils import extract_patch_targets
+from .utils import list_po_files, read_patch_header
 
 SKIPPED_COMMIT_STATUSES = {"already_applied", "already_in_history"}
 
 
-def _extract_original_commit_sha(patch_text: str) -> Optional[str]:
-    match = re.search(r"^From ([0-9a-fA-F]{7,40})\b", patch_text, re.MULTILINE)
-    if not match:
-        return None
-    return match.group(1).lower()
-
-
 def _repo_history_contains_commit(repo_path: str, commit_sha: str) -> bool:
     result = subprocess.run(
         ["git", "merge-base", "--is-ancestor", commit_sha, "HEAD"],
@@ -47,14 +39,10 @@ def _apply_commits(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
         return True
     log.debug("applying commits for po: '%s'", ctx.po_name)
 
-    commit_files: List[Tuple[str, str]] = []
-    for current_dir, _, files in os.walk(ctx.po_commit_dir):
-        for fname in files:
-            if fname == ".gitkeep":
-                continue
-            patch_file = os.path.join(current_dir, fname)
-            rel_path = os.path.relpath(patch_file, ctx.po_commit_dir)
-            commit_files.append((rel_path, patch_file))
+    commit_files: List[Tuple[str, str]] = [
+        (rel_path, os.path.join(ctx.po_commit_dir, rel_path))
+        for rel_path in ctx.po_files("commits", ctx.po_commit_dir)
+    ]
 
     for rel_path, patch_file in sorted(commit_files, key=lambda item: item[0]):
         path_parts = rel_path.split(os.sep)
@@ -88,15 +76,19 @@ def _apply_commits(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
             )
             continue
 
-        try:
-            with open(patch_file, "r", encoding="utf-8") as f:
-                patch_text = f.read()
-        except OSError as e:
-            log.error("Failed to read commit patch '%s': %s", patch_file, e)
-            return False
+        planned = ctx.planned_meta.get(f"commits/{rel_path}")
+        if planned is not None and planned.get("targets") is not None:
+            patch_targets = list(planned["targets"])
+            original_commit_sha = planned.get("original_commit_sha") or None
+        else:
+            try:
+                header = read_patch_header(patch_file, ctx.patch_headers)
+            except OSError as e:
+                log.error("Failed to read commit patch '%s': %s", patch_file, e)
+                return False
 
-        patch_targets = extract_patch_targets(patch_text)
-        original_commit_sha = _extract_original_commit_sha(patch_text)
+            patch_targets = header["targets"]
+            original_commit_sha = header["original_commit_sha"]
 
         if original_commit_sha and _repo_history_contains_commit(patch_target, original_commit_sha):
             log.info(
@@ -220,6 +212,8 @@ def _apply_commits(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
 def _revert_commits(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
     """Revert commits applied by PO (git revert)."""
     for repo_root, repo_name in runtime.repositories or []:
+        if ctx.repo_filter is not None and repo_name not in ctx.repo_filter:
+            continue
         record = runtime.load_applied_record(repo_root, ctx.po_name)
         if not record:
             continue
@@ -279,16 +273,7 @@ def _revert_commits(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
 
 
 def _list_commits(po_path: str, _runtime: PoPluginRuntime) -> Dict[str, Any]:
-    commits_dir = os.path.join(po_path, "commits")
-    commit_files: List[str] = []
-    if os.path.isdir(commits_dir):
-        for root, _, files in os.walk(commits_dir):
-            for f in files:
-                if f == ".gitkeep":
-                    continue
-                rel_path = os.path.relpath(os.path.join(root, f), commits_dir)
-                commit_files.append(rel_path)
-    return {"commit_files": sorted(commit_files)}
+    return {"commit_files": list_po_files(os.path.join(po_path, "commits"))}
 
 
 def _ensure_commits_dir(po_path: str, force: bool) -> None:
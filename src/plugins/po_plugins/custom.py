@@ -13,10 +13,28 @@ from src.log_manager import log
 
 from .registry import APPLY_PHASE_PER_PO, REVERT_PHASE_PER_PO, register_simple_plugin
 from .runtime import PoPluginContext, PoPluginRuntime
+from .utils import file_fingerprint
+
+
+def _fingerprint_copied(dest_abs: str) -> List[Dict[str, Any]]:
+    """Fingerprint a copied file, or every regular file below a copied directory."""
+    if os.path.isdir(dest_abs) and not os.path.islink(dest_abs):
+        paths = [
+            os.path.join(root, fname)
+            for root, _dirs, files in os.walk(dest_abs)
+            for fname in sorted(files)
+            if not os.path.islink(os.path.join(root, fname))
+        ]
+    else:
+        paths = [dest_abs]
+    return [{"path": path, **file_fingerprint(path)} for path in paths]
 
 
 def _apply_custom(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
     log.debug("po_name: '%s', po_custom_dir: '%s'", ctx.po_name, ctx.po_custom_dir)
+    if ctx.repo_filter is not None:
+        log.info("po '%s': skipping custom copies for a repository-scoped apply", ctx.po_name)
+        return True
     if not os.path.isdir(ctx.po_custom_dir):
         log.debug("No custom dir for po: '%s'", ctx.po_name)
         return True
@@ -83,12 +101,14 @@ def _apply_custom(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
             return True
 
         record = runtime.get_repo_record(ctx, record_repo_root, record_repo_name)
+        copied_files: List[Dict[str, Any]] = []
         record["custom"].append(
             {
                 "section": section_name,
                 "source": source_pattern,
                 "target": target_path,
                 "path_in_repo": path_in_repo,
+                "files": copied_files,
             }
         )
 
@@ -160,6 +180,7 @@ def _apply_custom(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
                     continue
 
                 _copy_path(src, dest)
+                copied_files.extend(_fingerprint_copied(_resolve_target_abs(dest)))
                 runtime.record_command(
                     ctx,
                     record_repo_root,
@@ -242,6 +263,8 @@ def _apply_custom(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
 
 def _revert_custom(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
     # For custom po, we can't easily revert file copies: log a warning that manual cleanup may be needed.
+    if ctx.repo_filter is not None:
+        return True
     for section_name, section_config in runtime.po_configs.items():
         if not section_name.startswith("po-"):
             continue
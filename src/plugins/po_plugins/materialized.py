@@ -0,0 +1,100 @@
+"""
+Content-addressed cache of patched file contents (po_apply --po-cache).
+
+Applying a patch to a given base blob always yields the same bytes, so the
+result is stored under `<workspace>/.cache/po_materialized/` keyed by
+(base blob SHA, patch sha256, target path, direction). A changed base file or
+patch produces a different key, so stale entries are never hit; they simply
+age out through size-bounded LRU eviction (file mtime is the access time).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from typing import List, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Base blob used for files a patch creates.
+NULL_BLOB = "0" * 40
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Return the git blob SHA-1 of file contents (same value as `git hash-object`)."""
+    digest = hashlib.sha1()
+    digest.update(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class MaterializedCache:
+    """Patched file bytes keyed by base blob and patch hash, with LRU eviction."""
+
+    VERSION = 1
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def key(cls, base_blob: str, patch_sha256: str, path: str, reverse: bool = False) -> str:
+        raw = f"{cls.VERSION}\0{base_blob}\0{patch_sha256}\0{path}\0{'R' if reverse else 'F'}"
+        return hashlib.sha256(raw.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "rb") as handle:
+                data = handle.read()
+            os.utime(entry)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        entry = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp.", dir=os.path.dirname(entry))
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, entry)
+        except OSError:
+            # The cache is best effort; a failed store only costs a later miss.
+            return
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits max_bytes; return the number removed."""
+        entries: List[Tuple[int, int, str]] = []
+        total = 0
+        if not os.path.isdir(self.root):
+            return 0
+        for shard in os.scandir(self.root):
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            for item in os.scandir(shard.path):
+                try:
+                    st = item.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, item.path))
+                total += st.st_size
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
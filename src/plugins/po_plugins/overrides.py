@@ -13,6 +13,7 @@ from src.log_manager import log, summarize_output
 
 from .registry import APPLY_PHASE_PER_PO, REVERT_PHASE_PER_PO, register_simple_plugin
 from .runtime import PoPluginContext, PoPluginRuntime
+from .utils import file_fingerprint, list_po_files
 
 
 def _apply_overrides(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
@@ -70,38 +71,35 @@ def _apply_overrides(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
 
     # 1) Group files by repo_root before copying/deleting
     repo_to_files: Dict[str, List[Tuple[str, str, bool]]] = {}  # (src_file, dest_rel, is_remove)
-    for current_dir, _, files in os.walk(ctx.po_override_dir):
-        for fname in files:
-            if fname == ".gitkeep":
-                continue
-            rel_path = os.path.relpath(os.path.join(current_dir, fname), ctx.po_override_dir)
-            log.debug("override rel_path: '%s'", rel_path)
-            if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
-                log.debug(
-                    "override file '%s' in po '%s' is excluded by config",
-                    rel_path,
-                    ctx.po_name,
-                )
-                continue
-            src_file = os.path.join(current_dir, fname)
-
-            # Check if this is a remove operation
-            is_remove = fname.endswith(".remove")
-            repo_name, dest_rel = _split_repo_prefix(rel_path)
-            if is_remove:
-                dest_rel = dest_rel[:-7]  # Remove '.remove' suffix
-                log.debug("remove operation detected for file: '%s'", dest_rel)
-            dest_rel = _safe_dest_rel(dest_rel)
-            if not dest_rel:
-                log.error("Invalid override target path derived from '%s'", rel_path)
-                return False
-
-            repo_root = runtime.repo_map.get(repo_name)
-            if not repo_root:
-                log.error("Cannot find repo path for override target repo '%s' (from '%s')", repo_name, rel_path)
-                return False
-
-            repo_to_files.setdefault(repo_root, []).append((src_file, dest_rel, is_remove))
+    for rel_path in ctx.po_files("overrides", ctx.po_override_dir):
+        fname = os.path.basename(rel_path)
+        log.debug("override rel_path: '%s'", rel_path)
+        if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
+            log.debug(
+                "override file '%s' in po '%s' is excluded by config",
+                rel_path,
+                ctx.po_name,
+            )
+            continue
+        src_file = os.path.join(ctx.po_override_dir, rel_path)
+
+        # Check if this is a remove operation
+        is_remove = fname.endswith(".remove")
+        repo_name, dest_rel = _split_repo_prefix(rel_path)
+        if is_remove:
+            dest_rel = dest_rel[:-7]  # Remove '.remove' suffix
+            log.debug("remove operation detected for file: '%s'", dest_rel)
+        dest_rel = _safe_dest_rel(dest_rel)
+        if not dest_rel:
+            log.error("Invalid override target path derived from '%s'", rel_path)
+            return False
+
+        repo_root = runtime.repo_map.get(repo_name)
+        if not repo_root:
+            log.error("Cannot find repo path for override target repo '%s' (from '%s')", repo_name, rel_path)
+            return False
+
+        repo_to_files.setdefault(repo_root, []).append((src_file, dest_rel, is_remove))
 
     # 2) Perform copies/deletes per repo_root (with applied record gating)
     for repo_root, file_list in repo_to_files.items():
@@ -121,13 +119,12 @@ def _apply_overrides(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
                 return False
 
             record = runtime.get_repo_record(ctx, repo_root_abs, record_repo_name)
-            record["overrides"].append(
-                {
-                    "operation": "remove" if is_remove else "copy",
-                    "po_source": os.path.relpath(src_file, start=ctx.po_path),
-                    "path_in_repo": dest_rel,
-                }
-            )
+            override_entry = {
+                "operation": "remove" if is_remove else "copy",
+                "po_source": os.path.relpath(src_file, start=ctx.po_path),
+                "path_in_repo": dest_rel,
+            }
+            record["overrides"].append(override_entry)
 
             if is_remove:
                 # Perform delete operation
@@ -171,6 +168,7 @@ def _apply_overrides(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
                         continue
 
                     shutil.copy2(src_file, dest_abs)
+                    override_entry.update(file_fingerprint(dest_abs))
                     runtime.record_command(
                         ctx,
                         repo_root_abs,
@@ -231,105 +229,93 @@ def _revert_overrides(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
         if os.path.commonpath([repo_root_real, dest_abs]) != repo_root_real:
             raise ValueError(f"override target escapes repo_root: {dest_rel}")
 
-    for current_dir, _, files in os.walk(ctx.po_override_dir):
-        for fname in files:
-            if fname == ".gitkeep":
-                continue
-            rel_path = os.path.relpath(os.path.join(current_dir, fname), ctx.po_override_dir)
-            log.debug("override rel_path: '%s'", rel_path)
-            if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
-                log.debug(
-                    "override file '%s' in po '%s' is excluded by config",
-                    rel_path,
-                    ctx.po_name,
-                )
-                continue
-
-            repo_name, dest_rel = _split_repo_prefix(rel_path)
-            if fname.endswith(".remove"):
-                dest_rel = dest_rel[:-7]
-            dest_rel = _safe_dest_rel(dest_rel)
-            if not dest_rel:
-                log.error("Invalid override target path derived from '%s'", rel_path)
-                return False
-
-            repo_root = runtime.repo_map.get(repo_name)
-            if not repo_root:
-                log.error("Cannot find repo path for override target repo '%s' (from '%s')", repo_name, rel_path)
-                return False
+    for rel_path in ctx.po_files("overrides", ctx.po_override_dir):
+        fname = os.path.basename(rel_path)
+        log.debug("override rel_path: '%s'", rel_path)
+        if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
+            log.debug(
+                "override file '%s' in po '%s' is excluded by config",
+                rel_path,
+                ctx.po_name,
+            )
+            continue
 
-            try:
-                _validate_in_repo(repo_root, dest_rel)
-            except ValueError as e:
-                log.error("%s", e)
-                return False
+        repo_name, dest_rel = _split_repo_prefix(rel_path)
+        if fname.endswith(".remove"):
+            dest_rel = dest_rel[:-7]
+        dest_rel = _safe_dest_rel(dest_rel)
+        if not dest_rel:
+            log.error("Invalid override target path derived from '%s'", rel_path)
+            return False
+
+        repo_root = runtime.repo_map.get(repo_name)
+        if not repo_root:
+            log.error("Cannot find repo path for override target repo '%s' (from '%s')", repo_name, rel_path)
+            return False
+
+        try:
+            _validate_in_repo(repo_root, dest_rel)
+        except ValueError as e:
+            log.error("%s", e)
+            return False
+
+        dest_abs = os.path.join(repo_root, dest_rel)
+        log.debug("override dest_abs: '%s'", dest_abs)
+        log.info("reverting override file: '%s' (repo_root=%s)", dest_rel, repo_root)
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "--error-unmatch", dest_rel],
+                cwd=repo_root,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
 
-            dest_abs = os.path.join(repo_root, dest_rel)
-            log.debug("override dest_abs: '%s'", dest_abs)
-            log.info("reverting override file: '%s' (repo_root=%s)", dest_rel, repo_root)
-            try:
+            if result.returncode == 0:
+                if ctx.dry_run:
+                    log.info("DRY-RUN: cd %s && git checkout -- %s", repo_root, dest_rel)
+                    continue
                 result = subprocess.run(
-                    ["git", "ls-files", "--error-unmatch", dest_rel],
+                    ["git", "checkout", "--", dest_rel],
                     cwd=repo_root,
                     capture_output=True,
                     text=True,
                     check=False,
                 )
-
-                if result.returncode == 0:
-                    if ctx.dry_run:
-                        log.info("DRY-RUN: cd %s && git checkout -- %s", repo_root, dest_rel)
-                        continue
-                    result = subprocess.run(
-                        ["git", "checkout", "--", dest_rel],
-                        cwd=repo_root,
-                        capture_output=True,
-                        text=True,
-                        check=False,
-                    )
-                    log.debug(
-                        "git checkout result: returncode=%s stdout=%s stderr=%s",
-                        result.returncode,
-                        summarize_output(result.stdout),
-                        summarize_output(result.stderr),
-                    )
-                    if result.returncode != 0:
-                        log.error("Failed to revert override file '%s': %s", dest_rel, summarize_output(result.stderr))
-                        return False
-                elif os.path.exists(dest_abs):
-                    log.debug("File '%s' is not tracked by git, deleting directly", dest_rel)
-                    if ctx.dry_run:
-                        log.info("DRY-RUN: remove %s", dest_abs)
-                        continue
-                    if os.path.isdir(dest_abs):
-                        shutil.rmtree(dest_abs)
-                    else:
-                        os.remove(dest_abs)
-                else:
-                    log.debug("Override file '%s' does not exist, skipping", dest_abs)
+                log.debug(
+                    "git checkout result: returncode=%s stdout=%s stderr=%s",
+                    result.returncode,
+                    summarize_output(result.stdout),
+                    summarize_output(result.stderr),
+                )
+                if result.returncode != 0:
+                    log.error("Failed to revert override file '%s': %s", dest_rel, summarize_output(result.stderr))
+                    return False
+            elif os.path.exists(dest_abs):
+                log.debug("File '%s' is not tracked by git, deleting directly", dest_rel)
+                if ctx.dry_run:
+                    log.info("DRY-RUN: remove %s", dest_abs)
                     continue
+                if os.path.isdir(dest_abs):
+                    shutil.rmtree(dest_abs)
+                else:
+                    os.remove(dest_abs)
+            else:
+                log.debug("Override file '%s' does not exist, skipping", dest_abs)
+                continue
 
-                log.info("override reverted for dir: '%s', file: '%s'", repo_root, dest_rel)
-            except subprocess.SubprocessError as e:
-                log.error("Subprocess error reverting override file '%s': '%s'", dest_rel, e)
-                return False
-            except OSError as e:
-                log.error("OS error reverting override file '%s': '%s'", dest_rel, e)
-                return False
+            log.info("override reverted for dir: '%s', file: '%s'", repo_root, dest_rel)
+        except subprocess.SubprocessError as e:
+            log.error("Subprocess error reverting override file '%s': '%s'", dest_rel, e)
+            return False
+        except OSError as e:
+            log.error("OS error reverting override file '%s': '%s'", dest_rel, e)
+            return False
     return True
 
 
 def _list_overrides(po_path: str, _runtime: PoPluginRuntime) -> Dict[str, Any]:
-    overrides_dir = os.path.join(po_path, "overrides")
-    override_files: List[str] = []
-    if os.path.isdir(overrides_dir):
-        for root, _, files in os.walk(overrides_dir):
-            for f in files:
-                if f == ".gitkeep":
-                    continue
-                rel_path = os.path.relpath(os.path.join(root, f), overrides_dir)
-                override_files.append(rel_path)
-    return {"override_files": sorted(override_files)}
+    return {"override_files": list_po_files(os.path.join(po_path, "overrides"))}
 
 
 def _ensure_overrides_dir(po_path: str, force: bool) -> None:
@@ -6,17 +6,70 @@ from __future__ import annotations
 
 import os
 import subprocess
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from src.log_manager import log, summarize_output
 
 from .registry import APPLY_PHASE_PER_PO, REVERT_PHASE_PER_PO, register_simple_plugin
 from .runtime import PoPluginContext, PoPluginRuntime
-from .utils import extract_patch_targets
+from .unidiff import UnsupportedPatch, apply_patch
+from .utils import list_po_files, read_patch_header
 
 SKIPPED_PATCH_STATUSES = {"already_applied"}
 
 
+def _apply_patch_in_process(
+    ctx: PoPluginContext, runtime: PoPluginRuntime, patch_target: str, repo_name: str, patch_file: str
+) -> str:
+    """
+    Apply a patch without spawning git; return "applied", "already_applied" or ""
+    when the caller must fall back to `git apply`.
+
+    Commands are recorded exactly as the git path would record them.
+    """
+    try:
+        ok, message = apply_patch(patch_target, patch_file, cache=ctx.materialized_cache)
+        if ok:
+            runtime.record_command(
+                ctx,
+                patch_target,
+                repo_name,
+                ["git", "apply", patch_file],
+                cwd=patch_target,
+                description=f"Apply patch {os.path.basename(patch_file)} to {repo_name}",
+            )
+            return "applied"
+        reverse_ok, _ = apply_patch(patch_target, patch_file, reverse=True, check=True)
+    except UnsupportedPatch as e:
+        log.debug("patch '%s' needs git apply: %s", patch_file, e)
+        return ""
+    except OSError as e:
+        log.debug("in-process apply of '%s' failed, falling back to git apply: %s", patch_file, e)
+        return ""
+    if not reverse_ok:
+        # Let git apply produce its usual diagnostics.
+        return ""
+    runtime.record_command(
+        ctx,
+        patch_target,
+        repo_name,
+        ["git", "apply", patch_file],
+        cwd=patch_target,
+        description=f"Apply patch {os.path.basename(patch_file)} to {repo_name}",
+        returncode=1,
+        stderr=message,
+    )
+    runtime.record_command(
+        ctx,
+        patch_target,
+        repo_name,
+        ["git", "apply", "--reverse", "--check", patch_file],
+        cwd=patch_target,
+        description=f"Check patch already applied {os.path.basename(patch_file)} to {repo_name}",
+    )
+    return "already_applied"
+
+
 def _apply_patches(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
     log.debug("po_name: '%s', po_patch_dir: '%s'", ctx.po_name, ctx.po_patch_dir)
     if not os.path.isdir(ctx.po_patch_dir):
@@ -24,100 +77,128 @@ def _apply_patches(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
         return True
     log.debug("applying patches for po: '%s'", ctx.po_name)
 
-    for current_dir, _, files in os.walk(ctx.po_patch_dir):
-        for fname in files:
-            if fname == ".gitkeep":
-                continue
-            rel_path = os.path.relpath(os.path.join(current_dir, fname), ctx.po_patch_dir)
-            path_parts = rel_path.split(os.sep)
-            if len(path_parts) == 1:
-                repo_name = "root"
-            elif len(path_parts) >= 2:
-                repo_name = os.path.join(*path_parts[:-1])
-            else:
-                log.error("Invalid patch file path: '%s'", rel_path)
-                return False
+    for rel_path in ctx.po_files("patches", ctx.po_patch_dir):
+        path_parts = rel_path.split(os.sep)
+        if len(path_parts) == 1:
+            repo_name = "root"
+        elif len(path_parts) >= 2:
+            repo_name = os.path.join(*path_parts[:-1])
+        else:
+            log.error("Invalid patch file path: '%s'", rel_path)
+            return False
 
-            if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
-                log.debug(
-                    "patch file '%s' in po '%s' is excluded by config",
-                    rel_path,
-                    ctx.po_name,
-                )
-                continue
+        if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
+            log.debug(
+                "patch file '%s' in po '%s' is excluded by config",
+                rel_path,
+                ctx.po_name,
+            )
+            continue
 
-            patch_target = runtime.repo_map.get(repo_name)
-            if not patch_target:
-                log.error("Cannot find repo path for '%s'", repo_name)
-                return False
+        patch_target = runtime.repo_map.get(repo_name)
+        if not patch_target:
+            log.error("Cannot find repo path for '%s'", repo_name)
+            return False
 
-            patch_file = os.path.join(current_dir, fname)
-            log.debug("will apply patch: '%s' to repo: '%s'", patch_file, patch_target)
-            if not ctx.reapply and runtime.applied_record_exists(patch_target, ctx.po_name):
-                log.info(
-                    "po '%s' already applied for repo '%s', skipping patch '%s'",
-                    ctx.po_name,
-                    repo_name,
-                    rel_path,
-                )
-                continue
+        patch_file = os.path.join(ctx.po_patch_dir, rel_path)
+        log.debug("will apply patch: '%s' to repo: '%s'", patch_file, patch_target)
+        if not ctx.reapply and runtime.applied_record_exists(patch_target, ctx.po_name):
+            log.info(
+                "po '%s' already applied for repo '%s', skipping patch '%s'",
+                ctx.po_name,
+                repo_name,
+                rel_path,
+            )
+            continue
 
+        planned = ctx.planned_meta.get(f"patches/{rel_path}")
+        if planned is not None and planned.get("targets") is not None:
+            patch_targets = list(planned["targets"])
+        else:
             try:
-                with open(patch_file, "r", encoding="utf-8") as f:
-                    patch_targets = extract_patch_targets(f.read())
+                patch_targets = read_patch_header(patch_file, ctx.patch_headers)["targets"]
             except OSError as e:
                 log.error("Failed to read patch '%s': %s", patch_file, e)
                 return False
 
-            record = runtime.get_repo_record(ctx, patch_target, repo_name)
-            patch_entry = {
-                "patch_file": os.path.relpath(patch_file, start=ctx.po_path),
-                "targets": patch_targets,
-                "status": "applied",
-            }
-            record["patches"].append(patch_entry)
+        record = runtime.get_repo_record(ctx, patch_target, repo_name)
+        patch_entry = {
+            "patch_file": os.path.relpath(patch_file, start=ctx.po_path),
+            "targets": patch_targets,
+            "status": "applied",
+        }
+        record["patches"].append(patch_entry)
+
+        if ctx.in_process_patch and not ctx.dry_run:
+            status = _apply_patch_in_process(ctx, runtime, patch_target, repo_name, patch_file)
+            if status == "already_applied":
+                log.info(
+                    "Patch '%s' already applied for repo '%s' (record missing); skipping.",
+                    rel_path,
+                    repo_name,
+                )
+                patch_entry["status"] = "already_applied"
+                continue
+            if status == "applied":
+                log.info("patch applied in-process for repo: '%s'", patch_target)
+                continue
 
-            result = runtime.execute_command(
+        result = runtime.execute_command(
+            ctx,
+            patch_target,
+            repo_name,
+            ["git", "apply", patch_file],
+            cwd=patch_target,
+            description=f"Apply patch {os.path.basename(patch_file)} to {repo_name}",
+        )
+        log.info("applying patch: '%s' to repo: '%s'", patch_file, patch_target)
+        log.debug(
+            "git apply result: returncode=%s stdout=%s stderr=%s",
+            result.returncode,
+            summarize_output(result.stdout),
+            summarize_output(result.stderr),
+        )
+        if result.returncode != 0:
+            already_applied = runtime.execute_command(
                 ctx,
                 patch_target,
                 repo_name,
-                ["git", "apply", patch_file],
+                ["git", "apply", "--reverse", "--check", patch_file],
                 cwd=patch_target,
-                description=f"Apply patch {os.path.basename(patch_file)} to {repo_name}",
-            )
-            log.info("applying patch: '%s' to repo: '%s'", patch_file, patch_target)
-            log.debug(
-                "git apply result: returncode=%s stdout=%s stderr=%s",
-                result.returncode,
-                summarize_output(result.stdout),
-                summarize_output(result.stderr),
+                description=f"Check patch already applied {os.path.basename(patch_file)} to {repo_name}",
             )
-            if result.returncode != 0:
-                already_applied = runtime.execute_command(
-                    ctx,
-                    patch_target,
+            if already_applied.returncode == 0:
+                log.info(
+                    "Patch '%s' already applied for repo '%s' (record missing); skipping.",
+                    rel_path,
                     repo_name,
-                    ["git", "apply", "--reverse", "--check", patch_file],
-                    cwd=patch_target,
-                    description=f"Check patch already applied {os.path.basename(patch_file)} to {repo_name}",
                 )
-                if already_applied.returncode == 0:
-                    log.info(
-                        "Patch '%s' already applied for repo '%s' (record missing); skipping.",
-                        rel_path,
-                        repo_name,
-                    )
-                    patch_entry["status"] = "already_applied"
-                    continue
-
-                log.error("Failed to apply patch '%s': %s", patch_file, summarize_output(result.stderr))
-                return False
+                patch_entry["status"] = "already_applied"
+                continue
+
+            log.error("Failed to apply patch '%s': %s", patch_file, summarize_output(result.stderr))
+            return False
 
-            log.info("patch applied successfully for repo: '%s'", patch_target)
+        log.info("patch applied successfully for repo: '%s'", patch_target)
 
     return True
 
 
+def _revert_patch_in_process(patch_target: str, patch_file: str) -> bool:
+    """Reverse-apply a plain text patch without git; False means use `git apply --reverse`."""
+    try:
+        ok, message = apply_patch(patch_target, patch_file, reverse=True)
+    except UnsupportedPatch as e:
+        log.debug("patch '%s' needs git apply --reverse: %s", patch_file, e)
+        return False
+    except OSError as e:
+        log.debug("in-process revert of '%s' failed, falling back to git apply: %s", patch_file, e)
+        return False
+    if not ok:
+        log.debug("in-process revert of '%s' did not apply: %s", patch_file, message)
+    return ok
+
+
 def _revert_patches(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
     log.debug("po_name: '%s', po_patch_dir: '%s'", ctx.po_name, ctx.po_patch_dir)
     if not os.path.isdir(ctx.po_patch_dir):
@@ -125,94 +206,82 @@ def _revert_patches(ctx: PoPluginContext, runtime: PoPluginRuntime) -> bool:
         return True
     log.debug("reverting patches for po: '%s'", ctx.po_name)
 
-    for current_dir, _, files in os.walk(ctx.po_patch_dir):
-        log.debug("current_dir: '%s', files: '%s'", current_dir, files)
-        for fname in files:
-            if fname == ".gitkeep":
-                continue
-            log.debug("current_dir: '%s', fname: '%s'", current_dir, fname)
-            rel_path = os.path.relpath(os.path.join(current_dir, fname), ctx.po_patch_dir)
-            log.debug("patch rel_path: '%s'", rel_path)
-            if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
-                log.debug(
-                    "patch file '%s' in po '%s' is excluded by config",
-                    rel_path,
-                    ctx.po_name,
-                )
-                continue
-            path_parts = rel_path.split(os.sep)
-            if len(path_parts) == 1:
-                repo_name = "root"
-            elif len(path_parts) >= 2:
-                repo_name = os.path.join(*path_parts[:-1])
-            else:
-                log.error("Invalid patch file path: '%s'", rel_path)
-                return False
+    for rel_path in ctx.po_files("patches", ctx.po_patch_dir):
+        log.debug("patch rel_path: '%s'", rel_path)
+        if ctx.po_name in ctx.exclude_files and rel_path in ctx.exclude_files[ctx.po_name]:
+            log.debug(
+                "patch file '%s' in po '%s' is excluded by config",
+                rel_path,
+                ctx.po_name,
+            )
+            continue
+        path_parts = rel_path.split(os.sep)
+        if len(path_parts) == 1:
+            repo_name = "root"
+        elif len(path_parts) >= 2:
+            repo_name = os.path.join(*path_parts[:-1])
+        else:
+            log.error("Invalid patch file path: '%s'", rel_path)
+            return False
 
-            patch_target = runtime.repo_map.get(repo_name)
-            if not patch_target:
-                log.error("Cannot find repo path for '%s'", repo_name)
-                return False
-            patch_file = os.path.join(current_dir, fname)
-            record = runtime.load_applied_record(patch_target, ctx.po_name)
-            patches = (record or {}).get("patches") or []
-            patch_record = next(
-                (
-                    item
-                    for item in patches
-                    if item.get("patch_file") == os.path.join("patches", rel_path) or item.get("patch_file") == rel_path
-                ),
-                None,
+        patch_target = runtime.repo_map.get(repo_name)
+        if not patch_target:
+            log.error("Cannot find repo path for '%s'", repo_name)
+            return False
+        patch_file = os.path.join(ctx.po_patch_dir, rel_path)
+        record = runtime.load_applied_record(patch_target, ctx.po_name)
+        patches = (record or {}).get("patches") or []
+        patch_record = next(
+            (
+                item
+                for item in patches
+                if item.get("patch_file") == os.path.join("patches", rel_path) or item.get("patch_file") == rel_path
+            ),
+            None,
+        )
+        if patch_record and patch_record.get("status") in SKIPPED_PATCH_STATUSES:
+            log.info(
+                "patch '%s' was already applied before po_apply for repo '%s'; skipping revert.",
+                rel_path,
+                repo_name,
             )
-            if patch_record and patch_record.get("status") in SKIPPED_PATCH_STATUSES:
-                log.info(
-                    "patch '%s' was already applied before po_apply for repo '%s'; skipping revert.",
-                    rel_path,
-                    repo_name,
-                )
+            continue
+        log.info("reverting patch: '%s' from dir: '%s'", patch_file, patch_target)
+        try:
+            if ctx.dry_run:
+                log.info("DRY-RUN: cd %s && git apply --reverse %s", patch_target, patch_file)
                 continue
-            log.info("reverting patch: '%s' from dir: '%s'", patch_file, patch_target)
-            try:
-                if ctx.dry_run:
-                    log.info("DRY-RUN: cd %s && git apply --reverse %s", patch_target, patch_file)
-                    continue
-                result = subprocess.run(
-                    ["git", "apply", "--reverse", patch_file],
-                    cwd=patch_target,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-                log.debug(
-                    "git apply --reverse result: returncode=%s stdout=%s stderr=%s",
-                    result.returncode,
-                    summarize_output(result.stdout),
-                    summarize_output(result.stderr),
-                )
-                if result.returncode != 0:
-                    log.error("Failed to revert patch '%s': %s", patch_file, summarize_output(result.stderr))
-                    return False
-                log.info("patch reverted for dir: '%s'", patch_target)
-            except subprocess.SubprocessError as e:
-                log.error("Subprocess error reverting patch '%s': '%s'", patch_file, e)
-                return False
-            except OSError as e:
-                log.error("OS error reverting patch '%s': '%s'", patch_file, e)
+            if ctx.in_process_patch and _revert_patch_in_process(patch_target, patch_file):
+                log.info("patch reverted in-process for dir: '%s'", patch_target)
+                continue
+            result = subprocess.run(
+                ["git", "apply", "--reverse", patch_file],
+                cwd=patch_target,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            log.debug(
+                "git apply --reverse result: returncode=%s stdout=%s stderr=%s",
+                result.returncode,
+                summarize_output(result.stdout),
+                summarize_output(result.stderr),
+            )
+            if result.returncode != 0:
+                log.error("Failed to revert patch '%s': %s", patch_file, summarize_output(result.stderr))
                 return False
+            log.info("patch reverted for dir: '%s'", patch_target)
+        except subprocess.SubprocessError as e:
+            log.error("Subprocess error reverting patch '%s': '%s'", patch_file, e)
+            return False
+        except OSError as e:
+            log.error("OS error reverting patch '%s': '%s'", patch_file, e)
+            return False
     return True
 
 
 def _list_patches(po_path: str, _runtime: PoPluginRuntime) -> Dict[str, Any]:
-    patches_dir = os.path.join(po_path, "patches")
-    patch_files: List[str] = []
-    if os.path.isdir(patches_dir):
-        for root, _, files in os.walk(patches_dir):
-            for f in files:
-                if f == ".gitkeep":
-                    continue
-                rel_path = os.path.relpath(os.path.join(root, f), patches_dir)
-                patch_files.append(rel_path)
-    return {"patch_files": sorted(patch_files)}
+    return {"patch_files": list_po_files(os.path.join(po_path, "patches"))}
 
 
 def _ensure_patches_dir(po_path: str, force: bool) -> None:
@@ -12,13 +12,14 @@ from __future__ import annotations
 import json
 import os
 import subprocess
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from src.log_manager import log, log_cmd_event
 
-from .utils import po_applied_record_path, write_json_atomic
+from .materialized import MaterializedCache
+from .utils import PatchHeaderCache, list_po_files, po_applied_record_path, write_json_atomic
 
 
 @dataclass
@@ -37,6 +38,26 @@ class PoPluginContext:
     applied_records: Dict[str, Dict[str, Any]]
     # When True, ignore existing applied record markers and apply again.
     reapply: bool = False
+    # When set (po_apply/po_revert --from-plan), plugins iterate these files per
+    # kind ("commits", "patches", "overrides") instead of scanning PO directories.
+    planned_files: Optional[Dict[str, List[str]]] = None
+    # Plan metadata keyed by PO-relative source (e.g. "patches/repo1/fix.patch").
+    planned_meta: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # When True, the patches plugin applies plain text diffs in-process and only
+    # runs `git apply` for patches it cannot handle (binary, rename, mode change).
+    in_process_patch: bool = False
+    # po_apply --po-cache: reuse patched file contents keyed by base blob and patch hash.
+    materialized_cache: Optional[MaterializedCache] = None
+    # --repo: when set, plugins only touch these repositories (custom copies are skipped).
+    repo_filter: Optional[Set[str]] = None
+    # Parsed patch headers shared by every PO of one command (persisted under the workspace .cache).
+    patch_headers: Optional[PatchHeaderCache] = None
+
+    def po_files(self, kind: str, base_dir: str) -> List[str]:
+        """Return PO files of one kind, relative to base_dir (planned list when executing a plan)."""
+        if self.planned_files is not None:
+            return list(self.planned_files.get(kind) or [])
+        return list_po_files(base_dir)
 
 
 class PoPluginRuntime:
@@ -0,0 +1,270 @@
+"""
+In-process applier for plain unified text diffs (git diff format).
+
+Supports modifications, new files (mode 100644) and deletions with exact
+context matching (fuzz 0, hunks may be offset). Line endings are kept byte
+for byte, so CRLF files stay CRLF. Binary, rename, copy and mode-change
+patches are reported as unsupported so callers can fall back to `git apply`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from .materialized import NULL_BLOB, MaterializedCache, git_blob_sha
+
+_HUNK_RE = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_NEW_FILE_MODE = b"new file mode 100644"
+_DELETED_FILE_MODE = b"deleted file mode 100644"
+_UNSUPPORTED_HEADERS = (
+    b"old mode",
+    b"new mode",
+    b"new file mode",
+    b"deleted file mode",
+    b"similarity index",
+    b"dissimilarity index",
+    b"rename ",
+    b"copy ",
+    b"GIT binary patch",
+    b"Binary files",
+)
+
+
+class UnsupportedPatch(Exception):
+    """Raised for patches the in-process applier does not handle."""
+
+
+@dataclass
+class Hunk:
+    old_start: int
+    new_start: int
+    old_lines: List[bytes] = field(default_factory=list)
+    new_lines: List[bytes] = field(default_factory=list)
+
+
+@dataclass
+class FilePatch:
+    path: str
+    is_new: bool = False
+    is_deleted: bool = False
+    hunks: List[Hunk] = field(default_factory=list)
+
+
+def _split_lines(data: bytes) -> List[bytes]:
+    """Split on LF only, keeping line endings (a lone CR stays part of its line)."""
+    lines = data.split(b"\n")
+    out = [line + b"\n" for line in lines[:-1]]
+    if lines[-1]:
+        out.append(lines[-1])
+    return out
+
+
+def _header_path(line: bytes, prefix: bytes) -> Optional[str]:
+    value = line[4:].rstrip(b"\r\n")
+    if value.endswith(b"\t"):
+        value = value[:-1]
+    if value == b"/dev/null":
+        return None
+    if not value.startswith(prefix):
+        raise UnsupportedPatch(f"unexpected path header: {line!r}")
+    return value[len(prefix) :].decode("utf-8", errors="surrogateescape")
+
+
+def parse_patch(data: bytes) -> List[FilePatch]:
+    """Parse a git style unified diff into file patches; raise UnsupportedPatch otherwise."""
+    lines = _split_lines(data)
+    files: List[FilePatch] = []
+    i = 0
+    while i < len(lines):
+        if not lines[i].startswith(b"diff --git "):
+            i += 1
+            continue
+        i += 1
+        is_new = is_deleted = False
+        while i < len(lines) and not lines[i].startswith((b"--- ", b"diff --git ")):
+            header = lines[i].rstrip(b"\r\n")
+            if header == _NEW_FILE_MODE:
+                is_new = True
+            elif header == _DELETED_FILE_MODE:
+                is_deleted = True
+            elif header.startswith(_UNSUPPORTED_HEADERS):
+                raise UnsupportedPatch(header.decode("utf-8", errors="replace"))
+            i += 1
+        if i + 1 >= len(lines) or not lines[i].startswith(b"--- ") or not lines[i + 1].startswith(b"+++ "):
+            raise UnsupportedPatch("file section without ---/+++ headers")
+        old_path = _header_path(lines[i], b"a/")
+        new_path = _header_path(lines[i + 1], b"b/")
+        if old_path and new_path and old_path != new_path:
+            raise UnsupportedPatch("rename without git rename headers")
+        path = new_path or old_path
+        if any(existing.path == path for existing in files):
+            raise UnsupportedPatch(f"{path}: patched more than once")
+        if not path or (old_path is None) != is_new or (new_path is None) != is_deleted:
+            raise UnsupportedPatch("inconsistent file headers")
+        file_patch = FilePatch(path=path, is_new=is_new, is_deleted=is_deleted)
+        i += 2
+
+        while i < len(lines) and lines[i].startswith(b"@@"):
+            match = _HUNK_RE.match(lines[i])
+            if not match:
+                raise UnsupportedPatch(f"bad hunk header: {lines[i]!r}")
+            old_count = int(match.group(2) if match.group(2) is not None else 1)
+            new_count = int(match.group(4) if match.group(4) is not None else 1)
+            hunk = Hunk(old_start=int(match.group(1)), new_start=int(match.group(3)))
+            i += 1
+            last: List[List[bytes]] = []
+            while i < len(lines) and (len(hunk.old_lines) < old_count or len(hunk.new_lines) < new_count):
+                line = lines[i]
+                tag, body = line[:1], line[1:]
+                if tag == b" ":
+                    hunk.old_lines.append(body)
+                    hunk.new_lines.append(body)
+                    last = [hunk.old_lines, hunk.new_lines]
+                elif tag == b"-":
+                    hunk.old_lines.append(body)
+                    last = [hunk.old_lines]
+                elif tag == b"+":
+                    hunk.new_lines.append(body)
+                    last = [hunk.new_lines]
+                else:
+                    raise UnsupportedPatch(f"unexpected hunk line: {line!r}")
+                i += 1
+                if i < len(lines) and lines[i].startswith(b"\\"):
+                    for side in last:
+                        side[-1] = side[-1][:-1] if side[-1].endswith(b"\n") else side[-1]
+                    i += 1
+            if len(hunk.old_lines) != old_count or len(hunk.new_lines) != new_count:
+                raise UnsupportedPatch("truncated hunk")
+            file_patch.hunks.append(hunk)
+        files.append(file_patch)
+    if not files:
+        raise UnsupportedPatch("no diff --git sections")
+    return files
+
+
+def _find_block(lines: List[bytes], block: List[bytes], expected: int, lower: int) -> int:
+    """Return the start of `block` in `lines` at or after `lower`, nearest to `expected`, or -1."""
+    size = len(block)
+    last_start = len(lines) - size
+    if last_start < lower:
+        return -1
+    expected = min(max(expected, lower), last_start)
+    for distance in range(0, max(expected - lower, last_start - expected) + 1):
+        for start in (expected - distance, expected + distance):
+            if lower <= start <= last_start and lines[start : start + size] == block:
+                return start
+    return -1
+
+
+def _apply_hunks(content: bytes, hunks: List[Hunk], reverse: bool) -> Optional[bytes]:
+    lines = _split_lines(content)
+    out: List[bytes] = []
+    pos = 0
+    for hunk in hunks:
+        old_block, new_block = (hunk.new_lines, hunk.old_lines) if reverse else (hunk.old_lines, hunk.new_lines)
+        old_start = hunk.new_start if reverse else hunk.old_start
+        if not old_block:
+            # Pure insertion: "-a,0" inserts after line a.
+            start = old_start
+            if start < pos or start > len(lines):
+                return None
+        else:
+            start = _find_block(lines, old_block, old_start - 1, pos)
+            if start < 0:
+                return None
+        out.extend(lines[pos:start])
+        out.extend(new_block)
+        pos = start + len(old_block)
+    out.extend(lines[pos:])
+    return b"".join(out)
+
+
+def _write_atomic(path: str, data: bytes, mode: int) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".po_apply.", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _default_file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def apply_patch(
+    repo_root: str,
+    patch_path: str,
+    *,
+    reverse: bool = False,
+    check: bool = False,
+    cache: Optional[MaterializedCache] = None,
+) -> Tuple[bool, str]:
+    """
+    Apply (or with `check` only test) a patch file against `repo_root`.
+
+    All files are patched in memory first; nothing is written unless every
+    hunk of every file matches. Returns (ok, message). Raises UnsupportedPatch
+    for patches that need `git apply` (binary, rename, mode changes, ...).
+    With a cache, results are looked up by (base blob, patch sha256) first.
+    """
+    with open(patch_path, "rb") as handle:
+        patch_data = handle.read()
+    file_patches = parse_patch(patch_data)
+    patch_sha256 = hashlib.sha256(patch_data).hexdigest() if cache is not None else ""
+
+    results: List[Tuple[str, Optional[bytes], int]] = []
+    for file_patch in file_patches:
+        target = os.path.join(repo_root, file_patch.path)
+        creates = file_patch.is_deleted if reverse else file_patch.is_new
+        deletes = file_patch.is_new if reverse else file_patch.is_deleted
+        if creates:
+            if os.path.lexists(target):
+                return False, f"{file_patch.path}: already exists in working directory"
+            content, mode = b"", _default_file_mode()
+        else:
+            if os.path.islink(target) or not os.path.isfile(target):
+                return False, f"{file_patch.path}: does not exist in working directory"
+            with open(target, "rb") as handle:
+                content = handle.read()
+            mode = os.stat(target).st_mode & 0o7777
+        key = ""
+        patched = None
+        if cache is not None and not deletes:
+            base_blob = NULL_BLOB if creates else git_blob_sha(content)
+            key = cache.key(base_blob, patch_sha256, file_patch.path, reverse)
+            patched = cache.get(key)
+        if patched is None:
+            patched = _apply_hunks(content, file_patch.hunks, reverse)
+            if patched is None:
+                return False, f"{file_patch.path}: patch does not apply"
+            if cache is not None and key:
+                cache.put(key, patched)
+        if deletes:
+            if patched:
+                return False, f"{file_patch.path}: removal patch leaves file contents"
+            results.append((target, None, mode))
+        else:
+            results.append((target, patched, mode))
+
+    if check:
+        return True, ""
+    for target, data, mode in results:
+        if data is None:
+            os.unlink(target)
+        else:
+            _write_atomic(target, data, mode)
+    return True, ""
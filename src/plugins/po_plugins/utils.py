@@ -4,10 +4,18 @@ Shared helpers for PO (Patch/Override) plugin implementations.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional
+
+from .bundle import bundle_listing
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_ORIGINAL_COMMIT_RE = re.compile(r"^From ([0-9a-fA-F]{7,40})\b")
+_HUNK_HEADER_RE = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
 
 
 def safe_cache_segment(value: str) -> str:
@@ -45,22 +53,217 @@ def write_json_atomic(path: str, payload: Dict[str, Any]) -> None:
     os.replace(tmp_path, path)
 
 
-def extract_patch_targets(patch_text: str) -> List[str]:
-    targets: List[str] = []
-    for line in patch_text.splitlines():
-        if not line.startswith("diff --git "):
-            continue
-        parts = line.split()
-        if len(parts) < 4:
-            continue
-        a_path = parts[2]
-        b_path = parts[3]
-        if a_path.startswith("a/"):
-            a_path = a_path[2:]
-        if b_path.startswith("b/"):
-            b_path = b_path[2:]
-        if b_path and b_path != "/dev/null":
-            targets.append(b_path)
-        elif a_path and a_path != "/dev/null":
-            targets.append(a_path)
-    return sorted(set(targets))
+def file_sha256(path: str) -> str:
+    """Return the hex sha256 of a file, reading it in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """Return size, mtime_ns and sha256 of a file, as recorded for po_verify drift checks."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(path)}
+
+
+def list_po_files(base_dir: str) -> List[str]:
+    """Return sorted file paths under a PO subdirectory, relative to it (skipping .gitkeep)."""
+    bundled = bundle_listing(base_dir)
+    if bundled is not None:
+        return bundled
+    rel_paths: List[str] = []
+    if not os.path.isdir(base_dir):
+        return rel_paths
+    for root, _, files in os.walk(base_dir):
+        for fname in files:
+            if fname == ".gitkeep":
+                continue
+            rel_paths.append(os.path.relpath(os.path.join(root, fname), base_dir))
+    return sorted(rel_paths)
+
+
+def _original_commit_sha_from_line(line: str) -> Optional[str]:
+    match = _ORIGINAL_COMMIT_RE.match(line)
+    if not match:
+        return None
+    return match.group(1).lower()
+
+
+def _target_from_diff_git_line(line: str) -> Optional[str]:
+    if not line.startswith("diff --git "):
+        return None
+    parts = line.split()
+    if len(parts) < 4:
+        return None
+    a_path = parts[2]
+    b_path = parts[3]
+    if a_path.startswith("a/"):
+        a_path = a_path[2:]
+    if b_path.startswith("b/"):
+        b_path = b_path[2:]
+    if b_path and b_path != "/dev/null":
+        return b_path
+    if a_path and a_path != "/dev/null":
+        return a_path
+    return None
+
+
+def _scan_patch_header(path: str) -> Dict[str, Any]:
+    """
+    Stream a patch file and collect `diff --git` targets, the first `From <sha>`
+    line and the old-side line range of every hunk header.
+
+    Hunks are stored per target as [start, end] (1-based, inclusive); a pure
+    insertion (`-a,0`) is recorded as [a, a].
+    """
+    targets = set()
+    hunks: Dict[str, List[List[int]]] = {}
+    current: Optional[str] = None
+    original_commit_sha: Optional[str] = None
+    with open(path, "rb") as handle:
+        for raw in handle:
+            if raw.startswith(b"diff --git "):
+                current = _target_from_diff_git_line(raw.decode("utf-8", errors="replace"))
+                if current:
+                    targets.add(current)
+                    hunks.setdefault(current, [])
+            elif raw.startswith(b"@@ -"):
+                match = _HUNK_HEADER_RE.match(raw)
+                if current and match:
+                    start = int(match.group(1))
+                    length = int(match.group(2)) if match.group(2) is not None else 1
+                    hunks[current].append([start, start + max(length, 1) - 1])
+            elif original_commit_sha is None and raw.startswith(b"From "):
+                original_commit_sha = _original_commit_sha_from_line(raw.decode("utf-8", errors="replace"))
+    return {"targets": sorted(targets), "original_commit_sha": original_commit_sha, "hunks": hunks}
+
+
+def _copy_header(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "targets": list(entry["targets"]),
+        "original_commit_sha": entry["original_commit_sha"],
+        "hunks": {target: [list(r) for r in ranges] for target, ranges in (entry.get("hunks") or {}).items()},
+    }
+
+
+class PatchHeaderCache:
+    """
+    Parsed patch header metadata keyed by (path, size, mtime_ns).
+
+    Entries are persisted to `<workspace>/.cache/po_patch_headers.json` so
+    large patches are only scanned again after they change on disk.
+    """
+
+    VERSION = 2
+
+    def __init__(self, workspace_root: Optional[str] = None) -> None:
+        self._lock = threading.Lock()
+        self._workspace_root = workspace_root or os.getcwd()
+        self._path = os.path.join(self._workspace_root, ".cache", "po_patch_headers.json")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            with open(self._path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == self.VERSION:
+            entries = payload.get("entries")
+            if isinstance(entries, dict):
+                self._entries = entries
+
+    def get(self, path: str) -> Dict[str, Any]:
+        abs_path = os.path.abspath(path)
+        st = os.stat(abs_path)
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                return _copy_header(entry)
+
+        parsed = _scan_patch_header(abs_path)
+        with self._lock:
+            self._entries[abs_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, **parsed}
+            self._dirty = True
+        return _copy_header(parsed)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or not os.path.isdir(self._workspace_root):
+                return
+            # Drop entries for patches that no longer exist.
+            entries = {key: value for key, value in self._entries.items() if os.path.isfile(key)}
+            try:
+                write_json_atomic(self._path, {"version": self.VERSION, "entries": entries})
+            except OSError:
+                return
+            self._entries = entries
+            self._dirty = False
+
+
+def read_patch_header(path: str, cache: Optional[PatchHeaderCache] = None) -> Dict[str, Any]:
+    """
+    Return {"targets": [...], "original_commit_sha": str|None, "hunks": {target: [[start, end], ...]}}
+    for a patch file.
+
+    The file is streamed line by line and only header lines are decoded;
+    with a cache, results are reused until the file's size or mtime changes.
+    Raises OSError if the patch cannot be read.
+    """
+    if cache is None:
+        return _scan_patch_header(os.path.abspath(path))
+    return cache.get(path)
+
+
+class FileHashCache:
+    """
+    sha256 of files keyed by (path, size, mtime_ns).
+
+    Persisted to `<workspace>/.cache/<name>.json` so a file whose stat no
+    longer matches its applied record is hashed once, not on every check.
+    """
+
+    VERSION = 1
+
+    def __init__(self, name: str, workspace_root: Optional[str] = None) -> None:
+        self._lock = threading.Lock()
+        root = workspace_root or os.getcwd()
+        self._path = os.path.join(root, ".cache", f"{name}.json")
+        self._entries: Dict[str, List[Any]] = {}
+        self._dirty = False
+        self.hashed = 0
+        try:
+            with open(self._path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == self.VERSION:
+            entries = payload.get("entries")
+            if isinstance(entries, dict):
+                self._entries = entries
+
+    def sha256(self, path: str, st: os.stat_result) -> str:
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(abs_path)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return str(entry[2])
+        digest = file_sha256(abs_path)
+        with self._lock:
+            self._entries[abs_path] = [st.st_size, st.st_mtime_ns, digest]
+            self._dirty = True
+            self.hashed += 1
+        return digest
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {key: value for key, value in self._entries.items() if os.path.isfile(key)}
+            try:
+                write_json_atomic(self._path, {"version": self.VERSION, "entries": entries})
+            except OSError:
+                return
+            self._entries = entries
+            self._dirty = False
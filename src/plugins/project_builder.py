@@ -2,25 +2,59 @@
 Project build utility class for CLI operations.
 """
 
+import codecs
+import fnmatch
 import glob
+import hashlib
 import json
 import os
 import re
 import shlex
 import shutil
+import stat
 import subprocess
 import tarfile
-from dataclasses import dataclass, field
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from src.build_fingerprint import (
+    artifact_files,
+    build_fingerprint,
+    find_reusable_build,
+    po_inputs,
+    repository_inputs,
+    write_record,
+)
+from src.diff_archive import (
+    INSTALL_HINT,
+    MANIFEST_SUFFIX,
+    DiffArchive,
+    DiffObjectStore,
+    DiffSink,
+    archive_suffix,
+    compression_available,
+    export_manifest,
+    normalise_compression,
+)
 from src.hooks import HookType, execute_hooks_with_fallback
 from src.log_manager import log, summarize_output
 from src.operations.registry import register
 from src.plan_utils import emit_plan_json, parse_emit_plan
 
 # from src.profiler import auto_profile  # unused
-from src.plugins.patch_override import build_po_apply_plan, po_apply
+from src.plugins.patch_override import build_po_apply_plan, parse_po_config, po_apply
+from src.plugins.po_plugins.utils import FileHashCache
+from src.repo_state import scan_repositories
+from src.utils import parse_jobs
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
 
 def _coerce_bool(value: Any, default: bool = False) -> bool:
@@ -72,6 +106,16 @@ def _split_multiline_rules(value: str) -> List[str]:
     return parts
 
 
+def _configured_jobs(value: Any, project_cfg: Dict[str, Any], key: str) -> int:
+    """Return a job count from a CLI value or the project config `key`: 0 when neither is set, -1 when invalid."""
+    if value is None or value is False or value == "":
+        value = str(project_cfg.get(key, "")).strip()
+        if not value:
+            return 0
+    count = parse_jobs(value)
+    return count if count >= 1 else -1
+
+
 def _safe_project_name(project_name: Any) -> str:
     return "".join(c if c.isalnum() or c in ("-", "_") else "_" for c in str(project_name))
 
@@ -139,9 +183,28 @@ class BuildContext:
     profile: str
     repo: str
     target: str
+    sync_jobs: int = 0
+    clean_jobs: int = 0
+    artifact_jobs: int = 0
     run_log: Dict[str, Any] = field(default_factory=dict)
 
 
+def _build_cmd_for_profile(project_cfg: Dict[str, Any], profile_norm: str) -> str:
+    """Return the build command configured for a profile, falling back to PROJECT_BUILD_CMD."""
+    cmd = ""
+    if profile_norm == "single":
+        cmd = (
+            str(project_cfg.get("PROJECT_BUILD_SINGLE_CMD", "")).strip()
+            or str(project_cfg.get("PROJECT_BUILD_CMD_SINGLE", "")).strip()
+        )
+    elif profile_norm == "full":
+        cmd = (
+            str(project_cfg.get("PROJECT_BUILD_FULL_CMD", "")).strip()
+            or str(project_cfg.get("PROJECT_BUILD_CMD_FULL", "")).strip()
+        )
+    return cmd or str(project_cfg.get("PROJECT_BUILD_CMD", "")).strip()
+
+
 def _format_cmd_template(cmd: str, ctx: BuildContext) -> str:
     fmt_ctx = {
         "project": ctx.project_name,
@@ -160,12 +223,201 @@ def _format_cmd_template(cmd: str, ctx: BuildContext) -> str:
         return cmd
 
 
+_LS_TREE_PATH_CHUNK = 500
+_CAT_FILE_READ_SIZE = 1024 * 1024
+
+
+def _ls_tree_entries(repo_path: str, file_paths: List[str], ref: str) -> List[Tuple[str, str, str]]:
+    """Return (mode, object, path) for each of file_paths present in `ref`, via `git ls-tree -r -z`."""
+    entries: List[Tuple[str, str, str]] = []
+    for start in range(0, len(file_paths), _LS_TREE_PATH_CHUNK):
+        chunk = file_paths[start : start + _LS_TREE_PATH_CHUNK]
+        result = subprocess.run(
+            ["git", "ls-tree", "-r", "-z", "--full-tree", ref, "--"] + chunk,
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        if result.returncode != 0:
+            # No such ref (for example an unborn HEAD): nothing existed before.
+            return []
+        for record in result.stdout.split(b"\0"):
+            if not record:
+                continue
+            meta, _, path = record.partition(b"\t")
+            mode, _obj_type, obj = meta.split(b" ", 2)
+            entries.append((mode.decode(), obj.decode(), path.decode("utf-8", errors="surrogateescape")))
+    return entries
+
+
+def _iter_ref_blobs(repo_path: str, blobs: List[Tuple[str, str]]) -> Iterator[Tuple[str, int, IO[bytes]]]:
+    """
+    Yield (path, size, stream) for each (object, path) in blobs from one `git cat-file --batch`.
+
+    The consumer must read exactly `size` bytes from stream before advancing.
+    Objects git reports as missing are skipped like `git show` would.
+    """
+    with subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=repo_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as proc:
+        try:
+            for obj, path in blobs:
+                proc.stdin.write(obj.encode() + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline().split()
+                if len(header) != 3:
+                    continue
+                yield path, int(header[2]), proc.stdout
+                proc.stdout.read(1)
+        finally:
+            proc.stdin.close()
+
+
+def _save_ref_snapshots(repo_path: str, file_paths: List[str], out_dir: str, ref: str = "HEAD") -> int:
+    """
+    Write the `ref` version of file_paths below out_dir; return the number of files written.
+
+    One `git ls-tree` lists the paths and one `git cat-file --batch` streams every
+    blob straight into its output file. Submodule entries (mode 160000) are written
+    in-process as "Subproject commit <sha>". Paths missing from `ref` are skipped.
+    """
+    entries = _ls_tree_entries(repo_path, file_paths, ref)
+    written = 0
+    blobs: List[Tuple[str, str]] = []
+    for mode, obj, path in entries:
+        out_file = os.path.join(out_dir, path)
+        os.makedirs(os.path.dirname(out_file), exist_ok=True)
+        if mode == "160000":
+            with open(out_file, "w", encoding="utf-8") as handle:
+                handle.write(f"Subproject commit {obj}\n")
+            written += 1
+        else:
+            blobs.append((obj, out_file))
+    if not blobs:
+        return written
+
+    for out_file, remaining, stream in _iter_ref_blobs(repo_path, blobs):
+        with open(out_file, "wb") as handle:
+            while remaining:
+                data = stream.read(min(remaining, _CAT_FILE_READ_SIZE))
+                if not data:
+                    raise OSError(f"git cat-file stream ended early in {repo_path}")
+                handle.write(data)
+                remaining -= len(data)
+        written += 1
+    return written
+
+
+def _archive_ref_snapshots(
+    repo_path: str, file_paths: List[str], sink: DiffSink, arc_dir: str, ref: str = "HEAD"
+) -> int:
+    """Like _save_ref_snapshots, but stream each blob straight into an archive or object store below arc_dir."""
+    entries = _ls_tree_entries(repo_path, file_paths, ref)
+    written = 0
+    blobs: List[Tuple[str, str]] = []
+    modes: Dict[str, int] = {}
+    for mode, obj, path in entries:
+        arcname = f"{arc_dir}/{path}"
+        if mode == "160000":
+            sink.add_bytes(arcname, f"Subproject commit {obj}\n".encode())
+            written += 1
+        else:
+            blobs.append((obj, arcname))
+            modes[arcname] = 0o755 if mode == "100755" else 0o644
+    if not blobs:
+        return written
+
+    for arcname, size, stream in _iter_ref_blobs(repo_path, blobs):
+        sink.add_stream(arcname, size, stream, mode=modes[arcname])
+        written += 1
+    return written
+
+
+def _git_diff_bytes(repo_path: str, file_paths: List[str], staged: bool) -> bytes:
+    """Return `git diff [--cached] -- <file_paths>` output."""
+    cmd = ["git", "diff", "--cached", "--"] if staged else ["git", "diff", "--"]
+    result = subprocess.run(
+        cmd + file_paths,
+        cwd=repo_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+    return result.stdout
+
+
+def _unpushed_range(repo_path: str) -> str:
+    """Return "<upstream>..HEAD" when HEAD has commits its upstream lacks, else ""."""
+    try:
+        upstream = (
+            subprocess.check_output(
+                ["git", "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"],
+                cwd=repo_path,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+        commits = subprocess.check_output(
+            ["git", "rev-list", f"{upstream}..HEAD"],
+            cwd=repo_path,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return f"{upstream}..HEAD" if commits else ""
+
+
+_MBOX_FROM_RE = re.compile(rb"^From [0-9a-f]{40} Mon Sep 17 00:00:00 2001\n", re.MULTILINE)
+_PATCH_NAME_MAX = 64
+
+
+def _format_patch_name(number: int, subject: str) -> str:
+    """Mirror the file names `git format-patch` picks: NNNN-<sanitized subject>.patch."""
+    slug = re.sub(r"[^A-Za-z0-9._]+", "-", subject)
+    slug = re.sub(r"\.\.+", ".", slug).strip("-").rstrip(".-")
+    return f"{number:04d}-{slug}"[: _PATCH_NAME_MAX - len(".patch") - 1] + ".patch"
+
+
+def _format_patches(repo_path: str, rev_range: str) -> List[Tuple[str, bytes]]:
+    """Return (file name, content) per commit of `git format-patch --stdout <rev_range>`."""
+    mbox = subprocess.run(
+        ["git", "format-patch", "--stdout", rev_range],
+        cwd=repo_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    ).stdout
+    subjects = subprocess.run(
+        ["git", "log", "--no-merges", "--reverse", "-z", "--format=%s", rev_range],
+        cwd=repo_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    ).stdout.split(b"\0")
+    starts = [match.start() for match in _MBOX_FROM_RE.finditer(mbox)]
+    patches: List[Tuple[str, bytes]] = []
+    for number, start in enumerate(starts, start=1):
+        end = starts[number] if number < len(starts) else len(mbox)
+        subject = subjects[number - 1].decode("utf-8", errors="replace") if number <= len(subjects) else ""
+        patches.append((_format_patch_name(number, subject), mbox[start:end]))
+    return patches
+
+
 def build_project_diff_plan(
     env: Dict[str, Any],
     project_name: str,
     *,
     keep_diff_dir: bool = False,
     timestamp: Optional[str] = None,
+    compress: str = "gz",
+    stream: bool = False,
+    store: bool = False,
 ) -> Dict[str, Any]:
     """Build a machine-readable plan for project_diff without writing files/directories."""
     ts = str(timestamp).strip() if timestamp else datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -175,8 +427,10 @@ def build_project_diff_plan(
     root_dir = os.path.abspath(str(env.get("root_path") or os.getcwd()))
     diff_root = os.path.join(root_dir, ".cache", "build", safe_project_name, ts, "diff")
     timestamp_dir = os.path.dirname(diff_root)
-    archive_name = f"diff_{safe_project_name}_{ts}.tar.gz"
+    archive_name = f"diff_{safe_project_name}_{ts}{archive_suffix(compress)}"
     archive_path = os.path.join(timestamp_dir, archive_name)
+    if store:
+        archive_path = os.path.join(timestamp_dir, f"diff_{safe_project_name}_{ts}{MANIFEST_SUFFIX}")
 
     repositories = sorted(_normalise_repositories(env.get("repositories", [])), key=lambda item: item[1])
 
@@ -231,6 +485,9 @@ def build_project_diff_plan(
         "diff_root": os.path.relpath(diff_root, start=root_dir),
         "archive_path": os.path.relpath(archive_path, start=root_dir),
         "keep_diff_dir": bool(keep_diff_dir),
+        "compress": compress,
+        "stream": bool(stream),
+        "store": bool(store),
         "repositories": repo_plans,
     }
 
@@ -248,6 +505,10 @@ def project_diff(
     dry_run: bool = False,
     emit_plan: Any = False,
     timestamp: Optional[str] = None,
+    jobs: str = "",
+    compress: str = "gz",
+    stream: bool = False,
+    store: bool = False,
 ) -> bool:
     """
     Generate after, before, patch, commit directories for all repositories or current repo, under a timestamped diff directory.
@@ -260,18 +521,49 @@ def project_diff(
         projects_info: Project information dictionary
         project_name: Name of the project
         timestamp (str): Override timestamp directory name (default: now)
-        keep_diff_dir (bool): If True, preserve the diff directory after creating tar.gz archive (default: False)
+        keep_diff_dir (bool): If True, preserve the diff directory after creating the archive (default: False)
         dry_run (bool): If True, only print planned actions without creating files/directories (default: False)
         emit_plan (bool|str): Emit a machine-readable JSON plan to stdout (true) or to the given path.
+        jobs (str): Number of repositories captured in parallel (default: CPU count).
+        compress (str): Archive compression: none, gz, xz or zstd (default: gz).
+        stream (bool): Write entries straight into the archive without a diff directory (default: False).
+        store (bool): Keep files once in .cache/build/objects and write a manifest, not an archive (default: False).
     """
     _ = projects_info  # Mark as intentionally unused
 
+    max_workers = parse_jobs(jobs)
+    if max_workers < 1:
+        log.error("Invalid --jobs value: '%s'", jobs)
+        return False
+    compression = normalise_compression(compress)
+    if not compression:
+        log.error("Invalid --compress value: '%s' (expected none, gz, xz or zstd)", compress)
+        return False
+    stream = _coerce_bool(stream, False)
+    store = _coerce_bool(store, False)
+    if (stream or store) and keep_diff_dir:
+        flag = "--store" if store else "--stream"
+        log.error("%s writes no diff directory; it cannot be combined with --keep-diff-dir", flag)
+        return False
+
     emit_enabled, _ = parse_emit_plan(emit_plan)
     if emit_enabled:
-        payload = build_project_diff_plan(env, project_name, keep_diff_dir=keep_diff_dir, timestamp=timestamp)
+        payload = build_project_diff_plan(
+            env,
+            project_name,
+            keep_diff_dir=keep_diff_dir,
+            timestamp=timestamp,
+            compress=compression,
+            stream=stream,
+            store=store,
+        )
         emit_plan_json(payload, emit_plan)
         return True
 
+    if not store and not compression_available(compression):
+        log.error("--compress zstd needs the 'zstandard' package (%s)", INSTALL_HINT)
+        return False
+
     ts = str(timestamp).strip() if timestamp else datetime.now().strftime("%Y%m%d_%H%M%S")
     ts = re.sub(r"[^0-9A-Za-z_-]+", "_", ts) or datetime.now().strftime("%Y%m%d_%H%M%S")
     safe_project_name = _safe_project_name(project_name)
@@ -280,6 +572,11 @@ def project_diff(
     root_dir = env.get("root_path") or os.getcwd()  # Store project root directory
     diff_root = os.path.join(root_dir, ".cache", "build", safe_project_name, ts, "diff")
     log.debug("Diff root directory: %s", diff_root)
+    timestamp_dir = os.path.dirname(diff_root)
+    archive_name = f"diff_{safe_project_name}_{ts}{archive_suffix(compression)}"
+    archive_path = os.path.join(timestamp_dir, archive_name)
+    manifest_path = os.path.join(timestamp_dir, f"diff_{safe_project_name}_{ts}{MANIFEST_SUFFIX}")
+    objects_dir = os.path.join(root_dir, ".cache", "build", "objects")
 
     repositories = _normalise_repositories(env.get("repositories", []))
     single_repo = len(repositories) == 1
@@ -288,103 +585,64 @@ def project_diff(
         log.info("DRY-RUN: --keep-diff-dir is set, but no diff output will be generated in dry-run mode.")
 
     if dry_run:
-        log.info("DRY-RUN: would create diff root: %s", diff_root)
+        if store:
+            log.info("DRY-RUN: would store diff objects in %s with manifest %s", objects_dir, manifest_path)
+        elif stream:
+            log.info("DRY-RUN: would stream diff archive: %s", archive_path)
+        else:
+            log.info("DRY-RUN: would create diff root: %s", diff_root)
         for repo_path, repo_name in repositories:
             log.info("DRY-RUN: would diff repo '%s' at '%s'", repo_name, repo_path)
         return True
 
-    os.makedirs(diff_root, exist_ok=True)
-
-    # repositories/single_repo defined above
-
-    def is_tracked(repo_path, file_path):
+    # With --stream or --store, every entry goes straight into the sink instead of the diff directory.
+    sink: Optional[DiffSink] = None
+    hash_cache: Optional[FileHashCache] = None
+    if store:
+        os.makedirs(timestamp_dir, exist_ok=True)
+        log.info("Storing diff objects in %s", objects_dir)
+        hash_cache = FileHashCache("diff_store_hashes", root_dir)
+        sink = DiffObjectStore(
+            objects_dir, manifest_path, {"project_name": project_name, "timestamp": ts}, hash_cache=hash_cache
+        )
+    elif stream:
+        os.makedirs(timestamp_dir, exist_ok=True)
+        log.info("Streaming diff archive: %s", archive_path)
         try:
-            result = subprocess.run(
-                ["git", "ls-files", "--error-unmatch", file_path],
-                cwd=repo_path,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-            )
-            return result.returncode == 0
-        except (OSError, subprocess.SubprocessError):
+            sink = DiffArchive(archive_path, compression)
+        except (OSError, tarfile.TarError) as e:
+            log.error("Failed to create archive %s: %s", archive_path, e)
             return False
+    if sink is not None:
+        for d in ["", "/after", "/before", "/patch", "/commit"]:
+            sink.add_dir(f"diff{d}")
+    else:
+        os.makedirs(diff_root, exist_ok=True)
+
+    # repositories/single_repo defined above
 
-    def save_file_snapshot(repo_path, file_path, out_dir, ref=None):
+    def save_file_snapshot(repo_path, file_path, out_dir):
         abs_file = os.path.join(repo_path, file_path)
         out_file = os.path.join(out_dir, file_path)
         os.makedirs(os.path.dirname(out_file), exist_ok=True)
-        if ref is None:
-            if os.path.exists(abs_file):
-                if os.path.isfile(abs_file):
-                    shutil.copy2(abs_file, out_file)
-                elif os.path.isdir(abs_file):
-                    # For directories, copy the entire directory tree
-                    if os.path.exists(out_file):
-                        shutil.rmtree(out_file)
-
-                    # Exclude .git directory when copying
-                    def ignore_git(directory, files):
-                        _ = directory
-                        _ = files
-                        return [".git"]
-
-                    shutil.copytree(abs_file, out_file, ignore=ignore_git)
-        else:
-            if is_tracked(repo_path, file_path):
-                try:
-                    # Check if this is a submodule
-                    result = subprocess.run(
-                        ["git", "ls-files", "--stage", file_path],
-                        cwd=repo_path,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.DEVNULL,
-                        check=True,
-                    )
-                    mode = result.stdout.decode().split()[0]
-
-                    if mode == "160000":  # This is a submodule
-                        # For submodules, create a file with the commit hash
-                        commit_hash = (
-                            subprocess.check_output(
-                                ["git", "rev-parse", f"{ref}:{file_path}"],
-                                cwd=repo_path,
-                                stderr=subprocess.DEVNULL,
-                            )
-                            .decode()
-                            .strip()
-                        )
-                        with open(out_file, "w", encoding="utf-8") as f:
-                            f.write(f"Subproject commit {commit_hash}\n")
-                    else:
-                        # Regular file
-                        with open(out_file, "wb") as f:
-                            subprocess.run(
-                                ["git", "show", f"{ref}:{file_path}"],
-                                cwd=repo_path,
-                                stdout=f,
-                                stderr=subprocess.DEVNULL,
-                                check=True,
-                            )
-                except subprocess.CalledProcessError:
-                    # File doesn't exist in the specified ref, skip it
-                    pass
+        if os.path.exists(abs_file):
+            if os.path.isfile(abs_file):
+                shutil.copy2(abs_file, out_file)
+            elif os.path.isdir(abs_file):
+                # For directories, copy the entire directory tree
+                if os.path.exists(out_file):
+                    shutil.rmtree(out_file)
+
+                # Exclude .git directory when copying
+                def ignore_git(directory, files):
+                    _ = directory
+                    _ = files
+                    return [".git"]
+
+                shutil.copytree(abs_file, out_file, ignore=ignore_git)
 
     def save_patch(repo_path, file_paths, out_dir, patch_name, staged=False):
-        if staged:
-            cmd = ["git", "diff", "--cached"] + file_paths
-        else:
-            cmd = ["git", "diff"] + file_paths
-
-        # Get diff content first
-        result = subprocess.run(
-            cmd,
-            cwd=repo_path,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            check=True,
-        )
-        patch_content = result.stdout.decode("utf-8")
+        patch_content = _git_diff_bytes(repo_path, file_paths, staged).decode("utf-8")
 
         # Only create file if patch content is not empty
         if patch_content.strip():
@@ -394,37 +652,13 @@ def project_diff(
                 f.write(patch_content)
 
     def save_commits(repo_path, out_dir):
+        rev_range = _unpushed_range(repo_path)
+        if not rev_range:
+            return
         try:
-            upstream = (
-                subprocess.check_output(
-                    [
-                        "git",
-                        "rev-parse",
-                        "--abbrev-ref",
-                        "--symbolic-full-name",
-                        "@{u}",
-                    ],
-                    cwd=repo_path,
-                    stderr=subprocess.DEVNULL,
-                )
-                .decode()
-                .strip()
-            )
-            commits = (
-                subprocess.check_output(
-                    ["git", "rev-list", f"{upstream}..HEAD"],
-                    cwd=repo_path,
-                    stderr=subprocess.DEVNULL,
-                )
-                .decode()
-                .strip()
-                .splitlines()
-            )
-            if not commits:
-                return
             os.makedirs(out_dir, exist_ok=True)
             subprocess.run(
-                ["git", "format-patch", f"{upstream}..HEAD", "-o", out_dir],
+                ["git", "format-patch", rev_range, "-o", out_dir],
                 cwd=repo_path,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
@@ -433,14 +667,37 @@ def project_diff(
         except (OSError, subprocess.SubprocessError):
             pass
 
-    for d in ["after", "before", "patch", "commit"]:
-        dpath = os.path.join(diff_root, d)
-        if os.path.exists(dpath):
-            shutil.rmtree(dpath)
-        os.makedirs(dpath, exist_ok=True)
+    def stream_repo(repo_path, file_list, sub):
+        # Same layout as the diff directory, written entry by entry into the sink.
+        def arc(kind):
+            return f"diff/{kind}/{sub}" if sub else f"diff/{kind}"
 
-    for idx, (repo_path, repo_name) in enumerate(repositories):
-        print(f"Processing repo {idx + 1}/{len(repositories)}: {repo_name}")
+        for file_path in sorted(file_list):
+            abs_file = os.path.join(repo_path, file_path)
+            if os.path.exists(abs_file):
+                sink.add_path(f"{arc('after')}/{file_path}", abs_file)
+        if file_list:
+            _archive_ref_snapshots(repo_path, sorted(file_list), sink, arc("before"))
+            for patch_name, staged in (("changes_worktree.patch", False), ("changes_staged.patch", True)):
+                patch_content = _git_diff_bytes(repo_path, file_list, staged)
+                if patch_content.strip():
+                    sink.add_bytes(f"{arc('patch')}/{patch_name}", patch_content)
+        rev_range = _unpushed_range(repo_path)
+        if rev_range:
+            try:
+                for patch_name, content in _format_patches(repo_path, rev_range):
+                    sink.add_bytes(f"{arc('commit')}/{patch_name}", content)
+            except subprocess.SubprocessError:
+                pass
+
+    if sink is None:
+        for d in ["after", "before", "patch", "commit"]:
+            dpath = os.path.join(diff_root, d)
+            if os.path.exists(dpath):
+                shutil.rmtree(dpath)
+            os.makedirs(dpath, exist_ok=True)
+
+    def capture_repo(repo_path, repo_name):
         staged_files = (
             subprocess.check_output(
                 ["git", "diff", "--name-only", "--cached"],
@@ -461,6 +718,9 @@ def project_diff(
         )
         all_files = set(staged_files) | set(working_files)
         file_list = [f for f in all_files if f.strip()]
+        if sink is not None:
+            stream_repo(repo_path, file_list, "" if single_repo else repo_name)
+            return
         # Target directory: single repo put files directly under diff_root/after, etc.; multi-repo use repo_name subdirectory
         if single_repo:
             after_dir = os.path.join(diff_root, "after")
@@ -474,8 +734,8 @@ def project_diff(
             commit_dir = os.path.join(diff_root, "commit", repo_name)
         for file_path in file_list:
             save_file_snapshot(repo_path, file_path, after_dir)
-            save_file_snapshot(repo_path, file_path, before_dir, ref="HEAD")
         if file_list:
+            _save_ref_snapshots(repo_path, sorted(file_list), before_dir)
             save_patch(
                 repo_path,
                 file_list,
@@ -486,36 +746,134 @@ def project_diff(
             save_patch(repo_path, file_list, patch_dir, "changes_staged.patch", staged=True)
         save_commits(repo_path, commit_dir)
 
-    # Create tar.gz archive of the diff directory
-    try:
-        # Get the parent directory of diff_root (the timestamp directory)
-        timestamp_dir = os.path.dirname(diff_root)
-        archive_name = f"diff_{safe_project_name}_{ts}.tar.gz"
-        archive_path = os.path.join(timestamp_dir, archive_name)
+    # Clean repositories (nothing staged, modified, untracked or unpushed) produce no output; skip them.
+    states = scan_repositories(repositories, max_workers)
+    dirty_repos = [(path, name) for path, name in repositories if states.get(path) is None or not states[path].clean]
+    repo_status = {name: "clean" for _path, name in repositories}
+
+    # Repositories are independent; capture them concurrently but report progress in repo order.
+    errors: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(dirty_repos)))) as executor:
+        futures = {name: executor.submit(capture_repo, path, name) for path, name in dirty_repos}
+        for idx, (_repo_path, repo_name) in enumerate(repositories):
+            future = futures.get(repo_name)
+            if future is None:
+                print(f"Processing repo {idx + 1}/{len(repositories)}: {repo_name} (clean)")
+                continue
+            try:
+                future.result()
+            except (OSError, subprocess.SubprocessError, ValueError, tarfile.TarError) as exc:
+                errors.append(f"{repo_name}: {exc}")
+                repo_status[repo_name] = "failed"
+                print(f"Processing repo {idx + 1}/{len(repositories)}: {repo_name} (failed)")
+                continue
+            repo_status[repo_name] = "captured"
+            print(f"Processing repo {idx + 1}/{len(repositories)}: {repo_name}")
 
-        log.info("Creating tar.gz archive: %s", archive_path)
+    manifest = {
+        "schema_version": 1,
+        "project_name": project_name,
+        "repositories": [
+            {"repo": name, "path": os.path.relpath(os.path.abspath(path), start=root_dir), "status": repo_status[name]}
+            for path, name in repositories
+        ],
+    }
+    manifest_bytes = (json.dumps(manifest, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
 
-        with tarfile.open(archive_path, "w:gz") as tar:
-            # Add the diff directory to the archive
-            tar.add(diff_root, arcname=os.path.basename(diff_root))
+    if sink is not None:
+        try:
+            sink.add_bytes("diff/manifest.json", manifest_bytes)
+            sink.close()
+        except (OSError, tarfile.TarError) as e:
+            log.error("Failed to write %s: %s", manifest_path if store else archive_path, e)
+            return False
+        if isinstance(sink, DiffObjectStore):
+            hash_cache.save()
+            log.info(
+                "Wrote diff manifest %s: %d new object(s), %d byte(s) written, %d reused",
+                manifest_path,
+                sink.stored,
+                sink.bytes_written,
+                sink.reused,
+            )
+        else:
+            log.info("Successfully created %s archive: %s", compression, archive_path)
+    else:
+        with open(os.path.join(diff_root, "manifest.json"), "wb") as handle:
+            handle.write(manifest_bytes)
 
-        log.info("Successfully created tar.gz archive: %s", archive_path)
+        # Create the archive of the diff directory
+        try:
+            log.info("Creating %s archive: %s", compression, archive_path)
 
-        # Check keep_diff_dir parameter to determine whether to delete the diff directory
-        # Default behavior: delete the diff directory after archiving
-        # Use --keep-diff-dir flag to preserve the diff directory
+            with DiffArchive(archive_path, compression) as tree_archive:
+                # Add the diff directory to the archive
+                tree_archive.add_path(os.path.basename(diff_root), diff_root)
 
-        if not keep_diff_dir:
-            # Remove the original diff directory after archiving (default behavior)
-            shutil.rmtree(diff_root)
-            log.info("Removed original diff directory after archiving")
-        else:
-            log.info("Keeping original diff directory as per --keep-diff-dir flag")
+            log.info("Successfully created %s archive: %s", compression, archive_path)
+
+            # Check keep_diff_dir parameter to determine whether to delete the diff directory
+            # Default behavior: delete the diff directory after archiving
+            # Use --keep-diff-dir flag to preserve the diff directory
+
+            if not keep_diff_dir:
+                # Remove the original diff directory after archiving (default behavior)
+                shutil.rmtree(diff_root)
+                log.info("Removed original diff directory after archiving")
+            else:
+                log.info("Keeping original diff directory as per --keep-diff-dir flag")
+
+        except (OSError, tarfile.TarError, RuntimeError) as e:
+            log.error("Failed to create %s archive: %s", compression, e)
+            # Continue execution even if archiving fails
 
-    except (OSError, tarfile.TarError, RuntimeError) as e:
-        log.error("Failed to create tar.gz archive: %s", e)
-        # Continue execution even if archiving fails
+    if errors:
+        log.error("project_diff failed for %d of %d repositories:", len(errors), len(repositories))
+        for message in errors:
+            log.error("  %s", message)
+        return False
+    return True
+
+
+@register(
+    "project_diff_export",
+    needs_projects=False,
+    needs_repositories=False,
+    desc="Rebuild a diff tarball from a project_diff --store manifest.",
+)
+def project_diff_export(
+    env: Dict,
+    projects_info: Dict,
+    manifest: str,
+    out: str = "",
+    compress: str = "gz",
+) -> bool:
+    """
+    Rebuild the tarball described by a project_diff --store manifest from .cache/build/objects.
 
+    manifest (str): Path to diff_<project>_<timestamp>.manifest.json.
+    out (str): Output archive path (default: next to the manifest, named like a project_diff archive).
+    compress (str): Archive compression: none, gz, xz or zstd (default: gz).
+    """
+    _ = env, projects_info
+    compression = normalise_compression(compress)
+    if not compression:
+        log.error("Invalid --compress value: '%s' (expected none, gz, xz or zstd)", compress)
+        return False
+    if not compression_available(compression):
+        log.error("--compress zstd needs the 'zstandard' package (%s)", INSTALL_HINT)
+        return False
+    manifest_path = os.path.expanduser(str(manifest or "").strip())
+    out_path = str(out or "").strip()
+    if not out_path:
+        base = manifest_path[: -len(MANIFEST_SUFFIX)] if manifest_path.endswith(MANIFEST_SUFFIX) else manifest_path
+        out_path = base + archive_suffix(compression)
+    try:
+        count = export_manifest(manifest_path, out_path, compression)
+    except (OSError, ValueError, tarfile.TarError) as exc:
+        log.error("Failed to export diff manifest '%s': %s", manifest_path, exc)
+        return False
+    print(f"Exported {count} entries to {out_path}")
     return True
 
 
@@ -536,29 +894,38 @@ def _repo_sync(ctx: BuildContext) -> bool:
 
     manifest = os.path.join(ctx.root_path, ".repo", "manifest.xml")
     if os.path.exists(manifest) and shutil.which("repo"):
-        result = _run_cmd(["repo", "sync"], cwd=ctx.root_path, dry_run=ctx.dry_run, description="repo sync")
+        repo_cmd = ["repo", "sync"] + ([f"-j{ctx.sync_jobs}"] if ctx.sync_jobs else [])
+        result = _run_cmd(repo_cmd, cwd=ctx.root_path, dry_run=ctx.dry_run, description="repo sync")
         if result.returncode != 0:
             log.error("repo sync failed (code=%s): %s", result.returncode, summarize_output(result.stderr))
             return False
         return True
 
+    git_repos = []
     for repo_path, repo_name in ctx.repositories:
         if not os.path.isdir(os.path.join(repo_path, ".git")):
             log.debug("Skipping sync for non-git repo '%s' at '%s'", repo_name, repo_path)
             continue
-
-        if not ctx.force:
-            dirty = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if dirty.returncode == 0 and dirty.stdout.strip():
+        git_repos.append((repo_path, repo_name))
+    if not git_repos:
+        return True
+    max_workers = ctx.sync_jobs or parse_jobs("")
+
+    # Dirty checks run in parallel up front, so nothing is pulled when any repository would refuse.
+    if not ctx.force:
+        states = scan_repositories(git_repos, max_workers)
+        dirty = [name for path, name in git_repos if states.get(path) is not None and states[path].dirty]
+        if dirty:
+            for repo_name in dirty:
                 log.error("Repo '%s' is dirty; use --force or --clean first.", repo_name)
-                return False
+            return False
+
+    failed = threading.Event()
 
+    def sync_repo(repo_path: str, repo_name: str) -> Tuple[str, float, str]:
+        if failed.is_set():
+            return "cancelled", 0.0, ""
+        started = time.monotonic()
         upstream = subprocess.run(
             ["git", "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"],
             cwd=repo_path,
@@ -568,8 +935,7 @@ def _repo_sync(ctx: BuildContext) -> bool:
         )
         if upstream.returncode != 0:
             log.info("Repo '%s' has no upstream; skipping git pull.", repo_name)
-            continue
-
+            return "no-upstream", time.monotonic() - started, ""
         result = _run_cmd(
             ["git", "pull", "--rebase"],
             cwd=repo_path,
@@ -577,15 +943,94 @@ def _repo_sync(ctx: BuildContext) -> bool:
             description=f"git pull {repo_name}",
         )
         if result.returncode != 0:
-            log.error(
-                "git pull failed for '%s' (code=%s): %s",
-                repo_name,
-                result.returncode,
-                summarize_output(result.stderr),
-            )
-            return False
+            failed.set()
+            message = f"code={result.returncode}: {summarize_output(result.stderr)}"
+            return "failed", time.monotonic() - started, message
+        return "synced", time.monotonic() - started, ""
 
-    return True
+    # Pulls are network bound; run them concurrently and stop starting new ones after the first failure.
+    rows: List[Tuple[str, str, float, str]] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(git_repos)))) as executor:
+        futures = [(name, executor.submit(sync_repo, path, name)) for path, name in git_repos]
+        for repo_name, future in futures:
+            status, duration, message = future.result()
+            rows.append((repo_name, status, duration, message))
+
+    table = [("REPO", "STATUS", "SECONDS")] + [(name, status, f"{duration:.1f}") for name, status, duration, _ in rows]
+    _print_table(f"Sync summary ({len(rows)} repositories, jobs={max_workers}):", table)
+
+    failures = [(name, message) for name, status, _duration, message in rows if status == "failed"]
+    for repo_name, message in failures:
+        log.error("git pull failed for '%s' (%s)", repo_name, message)
+    return not failures
+
+
+def _print_table(title: str, table: List[Tuple[str, ...]]) -> None:
+    widths = [max(len(line[col]) for line in table) for col in range(len(table[0]) - 1)]
+    print(title)
+    for line in table:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)) + "  " + line[-1])
+
+
+def _clean_excludes(project_cfg: Dict[str, Any]) -> List[str]:
+    excludes = [
+        "projects",
+        ".repo",
+        os.path.join(".cache", "po_applied"),
+    ]
+    excludes.extend(_split_multiline_rules(str(project_cfg.get("PROJECT_CLEAN_EXCLUDE", ""))))
+    return [e for e in excludes if e]
+
+
+def _tree_bytes(path: str) -> int:
+    """Return the apparent size of a file, or of everything below a directory (symlinks are not followed)."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_size
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+def _unquote_git_path(path: str) -> str:
+    if len(path) >= 2 and path[0] == path[-1] == '"':
+        raw = codecs.escape_decode(path[1:-1].encode("utf-8"))[0]
+        return raw.decode("utf-8", errors="surrogateescape")
+    return path
+
+
+def _clean_estimate(repo_path: str, exclude_args: List[str]) -> Tuple[int, int]:
+    """Return (entries, bytes) that `git clean -fdx` with exclude_args would remove, from `git clean -n`."""
+    result = subprocess.run(
+        ["git", "-c", "core.quotepath=false", "clean", "-ndx"] + exclude_args,
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise OSError(f"git clean -n failed (code={result.returncode}): {summarize_output(result.stderr)}")
+    entries = 0
+    freed = 0
+    prefix = "Would remove "
+    for line in result.stdout.splitlines():
+        if line.startswith(prefix):
+            entries += 1
+            freed += _tree_bytes(os.path.join(repo_path, _unquote_git_path(line[len(prefix) :]).rstrip("/")))
+    return entries, freed
 
 
 def _repo_clean(ctx: BuildContext) -> bool:
@@ -597,20 +1042,22 @@ def _repo_clean(ctx: BuildContext) -> bool:
         log.error("Refusing to clean repositories without --force.")
         return False
 
-    excludes = [
-        "projects",
-        ".repo",
-        os.path.join(".cache", "po_applied"),
-    ]
-    extra_excludes = _split_multiline_rules(str(ctx.project_cfg.get("PROJECT_CLEAN_EXCLUDE", "")))
-    excludes.extend(extra_excludes)
-    excludes = [e for e in excludes if e]
+    exclude_args: List[str] = []
+    for pattern in _clean_excludes(ctx.project_cfg):
+        exclude_args.extend(["-e", pattern])
 
+    git_repos = []
     for repo_path, repo_name in ctx.repositories:
         if not os.path.isdir(os.path.join(repo_path, ".git")):
             log.debug("Skipping clean for non-git repo '%s' at '%s'", repo_name, repo_path)
             continue
+        git_repos.append((repo_path, repo_name))
+    if not git_repos:
+        return True
+    max_workers = ctx.clean_jobs or parse_jobs("")
 
+    def clean_repo(repo_path: str, repo_name: str) -> Tuple[str, float, int, int, str]:
+        started = time.monotonic()
         reset_result = _run_cmd(
             ["git", "reset", "--hard", "HEAD"],
             cwd=repo_path,
@@ -618,33 +1065,46 @@ def _repo_clean(ctx: BuildContext) -> bool:
             description=f"Clean reset {repo_name}",
         )
         if reset_result.returncode != 0:
-            log.error(
-                "git reset failed for '%s' (code=%s): %s",
-                repo_name,
-                reset_result.returncode,
-                summarize_output(reset_result.stderr),
-            )
-            return False
+            message = f"git reset failed (code={reset_result.returncode}): {summarize_output(reset_result.stderr)}"
+            return "failed", time.monotonic() - started, 0, 0, message
 
-        clean_cmd = ["git", "clean", "-fdx"]
-        for pattern in excludes:
-            clean_cmd.extend(["-e", pattern])
         clean_result = _run_cmd(
-            clean_cmd,
+            ["git", "clean", "-fdx"] + exclude_args,
             cwd=repo_path,
             dry_run=ctx.dry_run,
             description=f"Clean untracked {repo_name}",
         )
         if clean_result.returncode != 0:
-            log.error(
-                "git clean failed for '%s' (code=%s): %s",
-                repo_name,
-                clean_result.returncode,
-                summarize_output(clean_result.stderr),
-            )
-            return False
+            message = f"git clean failed (code={clean_result.returncode}): {summarize_output(clean_result.stderr)}"
+            return "failed", time.monotonic() - started, 0, 0, message
+        if not ctx.dry_run:
+            return "cleaned", time.monotonic() - started, 0, 0, ""
+        try:
+            entries, freed = _clean_estimate(repo_path, exclude_args)
+        except OSError as exc:
+            return "failed", time.monotonic() - started, 0, 0, str(exc)
+        return "would-clean", time.monotonic() - started, entries, freed, ""
+
+    # Repositories are independent and cleaning is disk bound; run them all and report failures together.
+    rows: List[Tuple[str, str, float, int, int, str]] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(git_repos)))) as executor:
+        futures = [(name, executor.submit(clean_repo, path, name)) for path, name in git_repos]
+        for repo_name, future in futures:
+            rows.append((repo_name,) + future.result())
 
-    return True
+    if ctx.dry_run:
+        table = [("REPO", "STATUS", "SECONDS", "ENTRIES", "BYTES")]
+        table += [(row[0], row[1], f"{row[2]:.1f}", str(row[3]), str(row[4])) for row in rows]
+        total = sum(row[4] for row in rows)
+        _print_table(f"Clean estimate ({len(rows)} repositories, jobs={max_workers}, {total} bytes to free):", table)
+    else:
+        table = [("REPO", "STATUS", "SECONDS")] + [(row[0], row[1], f"{row[2]:.1f}") for row in rows]
+        _print_table(f"Clean summary ({len(rows)} repositories, jobs={max_workers}):", table)
+
+    failures = [(row[0], row[5]) for row in rows if row[1] == "failed"]
+    for repo_name, message in failures:
+        log.error("Clean failed for '%s': %s", repo_name, message)
+    return not failures
 
 
 def _glob_base_dir(pattern: str) -> str:
@@ -655,21 +1115,343 @@ def _glob_base_dir(pattern: str) -> str:
     return os.path.dirname(prefix) if prefix else ""
 
 
-def _copy_artifact(src_path: str, dest_path: str) -> None:
+_ARTIFACT_LINK_MODES = ("copy", "reflink", "hardlink")
+_ARTIFACT_CHUNK_SIZE = 1024 * 1024
+# FICLONE from <linux/fs.h>: share the source extents (btrfs, XFS, bcachefs) instead of copying them.
+_FICLONE = 0x40049409
+
+
+def _artifact_link_mode(project_cfg: Dict[str, Any]) -> str:
+    """Return PROJECT_ARTIFACT_LINK ("copy" when unset), or "" for an unknown value."""
+    text = str(project_cfg.get("PROJECT_ARTIFACT_LINK", "")).strip().lower() or "copy"
+    return text if text in _ARTIFACT_LINK_MODES else ""
+
+
+def _reflink(src_path: str, dest_path: str) -> bool:
+    """Clone src_path into dest_path with FICLONE; False where the filesystem cannot share extents."""
+    if fcntl is None:
+        return False
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            return False
+    return True
+
+
+def _hash_artifact(path: str) -> Dict[str, Any]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_ARTIFACT_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return {"size": size, "sha256": digest.hexdigest()}
+
+
+def _place_artifact(src_path: str, dest_path: str, link: str) -> Dict[str, Any]:
+    """Put one file at dest_path (hardlink, reflink or copy); return its size, sha256 and method."""
+    if os.path.lexists(dest_path):
+        os.unlink(dest_path)
+    # A later directory rule may have replaced the tree an earlier file rule prepared.
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    if link == "hardlink":
+        try:
+            os.link(src_path, dest_path)
+        except OSError:
+            pass
+        else:
+            return {"method": "hardlink", **_hash_artifact(dest_path)}
+    if link == "reflink" and _reflink(src_path, dest_path):
+        shutil.copystat(src_path, dest_path)
+        return {"method": "reflink", **_hash_artifact(dest_path)}
+
+    # Plain copy: hash on the way through so every byte is read once.
+    digest = hashlib.sha256()
+    size = 0
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+        for chunk in iter(lambda: src.read(_ARTIFACT_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            dest.write(chunk)
+            size += len(chunk)
+    shutil.copystat(src_path, dest_path)
+    return {"method": "copy", "size": size, "sha256": digest.hexdigest()}
+
+
+def _expand_artifact(src_abs: str, dest_abs: str) -> List[Tuple[str, str, str]]:
+    """
+    Prepare the destination of one artifact and return its (relpath, src, dest) file copies.
 
-    if os.path.isdir(src_path):
-        if os.path.exists(dest_path):
-            shutil.rmtree(dest_path)
+    A file yields a single copy with an empty relpath; a directory replaces any
+    previous copy at dest_abs and yields every file below it, skipping .git.
+    """
+    if not os.path.isdir(src_abs):
+        os.makedirs(os.path.dirname(dest_abs), exist_ok=True)
+        return [("", src_abs, dest_abs)]
+    if os.path.exists(dest_abs):
+        shutil.rmtree(dest_abs)
+    files: List[Tuple[str, str, str]] = []
+    for current_root, dirs, names in os.walk(src_abs, followlinks=True):
+        dirs[:] = sorted(name for name in dirs if name != ".git")
+        rel_root = os.path.relpath(current_root, src_abs)
+        dest_root = os.path.normpath(os.path.join(dest_abs, rel_root))
+        os.makedirs(dest_root, exist_ok=True)
+        for name in sorted(names):
+            if name == ".git":
+                continue
+            rel = os.path.normpath(os.path.join(rel_root, name)).replace(os.sep, "/")
+            files.append((rel, os.path.join(current_root, name), os.path.join(dest_root, name)))
+    return files
 
-        def _ignore(directory: str, names: List[str]) -> List[str]:
-            _ = directory
-            return [".git"] if ".git" in names else []
 
-        shutil.copytree(src_path, dest_path, ignore=_ignore)
-        return
+def _copy_artifacts(planned: List[Tuple[Dict[str, Any], str, str]], link: str, jobs: int) -> int:
+    """
+    Copy resolved artifacts on a thread pool and return the bytes collected.
 
-    shutil.copy2(src_path, dest_path)
+    Each manifest item gains the method, size and sha256 of its file, or for a
+    directory the per-file list, total size and the method its files share
+    ("mixed" when they differ). When two items write the same file the later
+    one wins, as it did when rules were copied one after another.
+    """
+    layouts = [(item, _expand_artifact(src_abs, dest_abs)) for item, src_abs, dest_abs in planned]
+    copies: Dict[str, str] = {}
+    for _item, files in layouts:
+        for _rel, src, dest in files:
+            copies.pop(dest, None)
+            copies[dest] = src
+    placed: Dict[str, Dict[str, Any]] = {}
+    if copies:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(copies)))) as executor:
+            results = executor.map(lambda dest: _place_artifact(copies[dest], dest, link), list(copies))
+            placed = dict(zip(copies, results))
+
+    for item, files in layouts:
+        if len(files) == 1 and not files[0][0]:
+            item.update(placed[files[0][2]])
+            continue
+        item["files"] = [
+            {"path": rel, "size": placed[dest]["size"], "sha256": placed[dest]["sha256"]} for rel, _src, dest in files
+        ]
+        item["size"] = sum(entry["size"] for entry in item["files"])
+        methods = {placed[dest]["method"] for _rel, _src, dest in files}
+        item["method"] = methods.pop() if len(methods) == 1 else ("mixed" if methods else link)
+    return sum(result["size"] for result in placed.values())
+
+
+def _regex_class_end(pattern: str, start: int) -> int:
+    """Return the index just past the character class opening at `start`, or -1 when it is unterminated."""
+    index = start + 1
+    if pattern[index : index + 1] == "^":
+        index += 1
+    if pattern[index : index + 1] == "]":
+        index += 1
+    while index < len(pattern):
+        if pattern[index] == "\\":
+            index += 2
+        elif pattern[index] == "]":
+            return index + 1
+        else:
+            index += 1
+    return -1
+
+
+def _regex_segments(pattern: str) -> Optional[List[str]]:
+    """
+    Split an anchored regex at its top-level `/` separators.
+
+    Returns None when the pattern is not anchored with `^` or `\\A`, has an
+    alternation or a quantified separator, because then a match need not
+    follow the directory layout the segments describe.
+    """
+    if pattern.startswith("^"):
+        index = 1
+    elif pattern.startswith("\\A"):
+        index = 2
+    else:
+        return None
+    segments: List[str] = []
+    current: List[str] = []
+    depth = 0
+    while index < len(pattern):
+        ch = pattern[index]
+        if ch == "[":
+            end = _regex_class_end(pattern, index)
+            if end < 0:
+                return None
+            current.append(pattern[index:end])
+            index = end
+            continue
+        token = pattern[index : index + 2] if ch == "\\" else ch
+        index += len(token)
+        if token == "|":
+            return None
+        if token in ("/", "\\/") and depth == 0:
+            if pattern[index : index + 1] in ("*", "+", "?", "{"):
+                return None
+            segments.append("".join(current))
+            current = []
+            continue
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        current.append(token)
+    segments.append("".join(current))
+    return segments
+
+
+def _regex_segment_literal(segment: str) -> Optional[str]:
+    """Return the name a regex segment matches when it is plain text (escapes allowed), else None."""
+    literal: List[str] = []
+    index = 0
+    while index < len(segment):
+        ch = segment[index]
+        if ch == "\\" and index + 1 < len(segment) and not segment[index + 1].isalnum():
+            literal.append(segment[index + 1])
+            index += 2
+        elif ch.isalnum() or ch in "-_ ,=@%~!#&'\"":
+            literal.append(ch)
+            index += 1
+        else:
+            return None
+    return "".join(literal)
+
+
+# Escapes that may match `/` or spell it as a code point (\x2f, \u002f, \N{SOLIDUS}, \057).
+_REGEX_SLASH_ESCAPES = ("", "/", "S", "W", "D", "x", "u", "U", "N")
+_REGEX_CHAR_ESCAPES = {"a": 0x07, "b": 0x08, "f": 0x0C, "n": 0x0A, "r": 0x0D, "t": 0x09, "v": 0x0B}
+
+
+def _regex_class_may_match_slash(body: str) -> bool:
+    """True unless the body of a non-negated character class certainly excludes `/`."""
+    low: Optional[int] = None
+    in_range = False
+    index = 0
+    while index < len(body):
+        ch = body[index]
+        if ch == "-" and low is not None and not in_range and index + 1 < len(body):
+            in_range = True
+            index += 1
+            continue
+        if ch == "\\":
+            escaped = body[index + 1 : index + 2]
+            if escaped in _REGEX_SLASH_ESCAPES or escaped.isdigit():
+                return True
+            point = _REGEX_CHAR_ESCAPES.get(escaped) if escaped.isalnum() else ord(escaped)
+            index += 2
+        else:
+            point = ord(ch)
+            index += 1
+        if in_range:
+            if low is None or point is None or low <= ord("/") <= point:
+                return True
+            in_range = False
+            low = None
+            continue
+        if point == ord("/"):
+            return True
+        low = point
+    return False
+
+
+def _regex_segment_slash_free(segment: str) -> bool:
+    """True when a regex segment can never match `/`, so it always spans exactly one path component."""
+    index = 0
+    while index < len(segment):
+        ch = segment[index]
+        if ch == "\\":
+            escaped = segment[index + 1 : index + 2]
+            if escaped in _REGEX_SLASH_ESCAPES or escaped in ("A", "Z") or escaped.isdigit():
+                return False
+            index += 2
+            continue
+        if ch == "[":
+            end = _regex_class_end(segment, index)
+            if end < 0:
+                return False
+            body = segment[index + 1 : end - 1]
+            if body.startswith("^"):
+                if "/" not in body:
+                    return False
+            elif _regex_class_may_match_slash(body):
+                return False
+            index = end
+            continue
+        if ch in ".()|^$":
+            return False
+        index += 1
+    return True
+
+
+def _regex_walk_plan(pattern: str) -> Tuple[str, List["re.Pattern[str]"]]:
+    """
+    Derive (start directory, per-depth directory filters) from an artifact regex.
+
+    Only anchored patterns can be pruned: their leading plain-text components
+    become the directory the walk starts from, and each following component
+    that cannot match `/` must match the directory name at that depth. Both
+    are empty when the whole tree has to be searched.
+    """
+    segments = _regex_segments(pattern)
+    if not segments:
+        return "", []
+    directories = segments[:-1]
+    start: List[str] = []
+    for segment in directories:
+        name = _regex_segment_literal(segment)
+        if not name or name in (".", ".."):
+            break
+        start.append(name)
+    filters: List["re.Pattern[str]"] = []
+    for segment in directories[len(start) :]:
+        if not segment or not _regex_segment_slash_free(segment):
+            break
+        try:
+            filters.append(re.compile(segment))
+        except re.error:
+            break
+    return "/".join(start), filters
+
+
+def _artifact_excluded(name: str, rel_posix: str, excludes: List[str]) -> bool:
+    """Globs containing `/` match the path below the regex root, others match the entry name."""
+    return any(fnmatch.fnmatchcase(rel_posix if "/" in pattern else name, pattern) for pattern in excludes)
+
+
+def _regex_artifact_matches(root_abs: str, compiled: "re.Pattern[str]", excludes: List[str]) -> List[str]:
+    """
+    Return the files below root_abs whose `/`-separated relative path matches compiled.
+
+    Uses os.scandir and prunes directories that the pattern's leading components
+    or the exclude globs rule out, instead of testing every file in the tree.
+    Like os.walk, symlinked directories are not followed.
+    """
+    start, filters = _regex_walk_plan(compiled.pattern)
+    if start and not os.path.isdir(os.path.join(root_abs, start)):
+        return []
+    matches: List[str] = []
+    stack: List[Tuple[str, str, int]] = [(os.path.join(root_abs, start) if start else root_abs, start, 0)]
+    while stack:
+        dir_path, dir_rel, depth = stack.pop()
+        try:
+            with os.scandir(dir_path) as iterator:
+                entries = list(iterator)
+        except OSError:
+            continue
+        for entry in entries:
+            rel_posix = f"{dir_rel}/{entry.name}" if dir_rel else entry.name
+            if excludes and _artifact_excluded(entry.name, rel_posix, excludes):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                if compiled.search(rel_posix):
+                    matches.append(rel_posix)
+            elif not entry.is_symlink() and (depth >= len(filters) or filters[depth].fullmatch(entry.name)):
+                stack.append((entry.path, rel_posix, depth + 1))
+    return matches
 
 
 def _collect_artifacts(ctx: BuildContext, rules_override: Optional[str] = None) -> bool:
@@ -680,13 +1462,19 @@ def _collect_artifacts(ctx: BuildContext, rules_override: Optional[str] = None)
     if not rules:
         return True
 
+    link = _artifact_link_mode(ctx.project_cfg)
+    if not link:
+        log.error("Invalid PROJECT_ARTIFACT_LINK value: '%s'", ctx.project_cfg.get("PROJECT_ARTIFACT_LINK"))
+        return False
+
     artifacts_root = os.path.join(ctx.build_root, "artifacts")
     if ctx.dry_run:
         log.info("DRY-RUN: would collect artifacts into: %s", artifacts_root)
-    else:
-        os.makedirs(artifacts_root, exist_ok=True)
 
-    copied: List[Dict[str, str]] = []
+    excludes = _split_multiline_rules(str(ctx.project_cfg.get("PROJECT_ARTIFACT_EXCLUDE", "")))
+
+    # Resolve every rule before copying anything, so a bad rule leaves no partial artifacts.
+    planned: List[Tuple[Dict[str, Any], str, str]] = []
 
     for rule in rules:
         if rule.startswith("path:"):
@@ -724,9 +1512,7 @@ def _collect_artifacts(ctx: BuildContext, rules_override: Optional[str] = None)
 
             if ctx.dry_run:
                 log.info("DRY-RUN: would copy %s -> %s", src_abs, dest_abs)
-            else:
-                _copy_artifact(src_abs, dest_abs)
-            copied.append({"rule": rule, "src": src_rel_safe, "dest": dest_rel_safe})
+            planned.append(({"rule": rule, "src": src_rel_safe, "dest": dest_rel_safe}, src_abs, dest_abs))
             continue
 
         if rule.startswith("glob:"):
@@ -765,15 +1551,13 @@ def _collect_artifacts(ctx: BuildContext, rules_override: Optional[str] = None)
                     return False
                 dest_abs = os.path.join(artifacts_root, dest_rel_safe)
 
-                if ctx.dry_run:
-                    log.info("DRY-RUN: would copy %s -> %s", match, dest_abs)
-                else:
-                    _copy_artifact(match, dest_abs)
                 src_rel = _safe_relpath(os.path.relpath(match, ctx.root_path))
                 if not src_rel:
                     log.error("Unsafe artifact match path: %s", match)
                     return False
-                copied.append({"rule": rule, "src": src_rel, "dest": dest_rel_safe})
+                if ctx.dry_run:
+                    log.info("DRY-RUN: would copy %s -> %s", match, dest_abs)
+                planned.append(({"rule": rule, "src": src_rel, "dest": dest_rel_safe}, match, dest_abs))
             continue
 
         if rule.startswith("manifest:"):
@@ -817,9 +1601,7 @@ def _collect_artifacts(ctx: BuildContext, rules_override: Optional[str] = None)
 
                 if ctx.dry_run:
                     log.info("DRY-RUN: would copy %s -> %s", src_abs, dest_abs)
-                else:
-                    _copy_artifact(src_abs, dest_abs)
-                copied.append({"rule": rule, "src": entry_safe, "dest": dest_rel_safe})
+                planned.append(({"rule": rule, "src": entry_safe, "dest": dest_rel_safe}, src_abs, dest_abs))
             continue
 
         if rule.startswith("regex@"):
@@ -857,14 +1639,7 @@ def _collect_artifacts(ctx: BuildContext, rules_override: Optional[str] = None)
                 log.error("Invalid regex pattern '%s': %s", pattern, exc)
                 return False
 
-            matches: List[str] = []
-            for current_root, _, files in os.walk(root_abs):
-                for fname in files:
-                    abs_path = os.path.join(current_root, fname)
-                    rel_from_root = os.path.relpath(abs_path, root_abs)
-                    rel_posix = rel_from_root.replace(os.sep, "/")
-                    if compiled.search(rel_posix):
-                        matches.append(rel_from_root)
+            matches = _regex_artifact_matches(root_abs, compiled, excludes)
 
             if not matches:
                 log.warning("No artifact matches for regex rule: %s", rule)
@@ -885,26 +1660,139 @@ def _collect_artifacts(ctx: BuildContext, rules_override: Optional[str] = None)
 
                 if ctx.dry_run:
                     log.info("DRY-RUN: would copy %s -> %s", src_abs, dest_abs)
-                else:
-                    _copy_artifact(src_abs, dest_abs)
-                copied.append({"rule": rule, "src": os.path.join(root_rel_safe, rel_safe), "dest": dest_rel_safe})
+                item = {"rule": rule, "src": os.path.join(root_rel_safe, rel_safe), "dest": dest_rel_safe}
+                planned.append((item, src_abs, dest_abs))
             continue
 
         log.error("Unknown artifact rule type: %s", rule)
         return False
 
-    if copied and not ctx.dry_run:
-        manifest_path = os.path.join(artifacts_root, "manifest.json")
+    if planned and not ctx.dry_run:
+        jobs = ctx.artifact_jobs or parse_jobs("")
+        started = time.monotonic()
+        try:
+            os.makedirs(artifacts_root, exist_ok=True)
+            total = _copy_artifacts(planned, link, jobs)
+        except OSError as exc:
+            log.error("Failed to collect artifacts: %s", exc)
+            return False
+        log.info(
+            "Collected %d artifact(s), %d bytes in %.1fs (jobs=%d, link=%s)",
+            len(planned),
+            total,
+            time.monotonic() - started,
+            jobs,
+            link,
+        )
         payload = {
             "schema_version": 1,
             "project": ctx.project_name,
             "timestamp": ctx.build_ts,
-            "items": copied,
+            "items": [item for item, _src_abs, _dest_abs in planned],
         }
-        with open(manifest_path, "w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2, ensure_ascii=False)
-            handle.write("\n")
+        _write_artifacts_manifest(artifacts_root, payload)
+
+    return True
+
+
+def _write_artifacts_manifest(artifacts_root: str, payload: Dict[str, Any]) -> None:
+    with open(os.path.join(artifacts_root, "manifest.json"), "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, ensure_ascii=False)
+        handle.write("\n")
+
+
+def _fingerprint_inputs(ctx: BuildContext, hash_cache: FileHashCache) -> Optional[Dict[str, Any]]:
+    """Collect the build fingerprint inputs, or None when a repository's state cannot be read."""
+    repositories = repository_inputs(ctx.repositories, parse_jobs(""), hash_cache)
+    if repositories is None:
+        return None
+    pos: List[Dict[str, str]] = []
+    project_info = ctx.projects_info.get(ctx.project_name, {}) if isinstance(ctx.projects_info, dict) else {}
+    board_name = project_info.get("board_name") if isinstance(project_info, dict) else None
+    projects_path = ctx.env.get("projects_path")
+    if board_name and projects_path:
+        apply_pos, _exclude_pos, _exclude_files = parse_po_config(str(ctx.project_cfg.get("PROJECT_PO_CONFIG", "")))
+        pos = po_inputs(os.path.join(str(projects_path), board_name, "po"), apply_pos, hash_cache)
+
+    # Resolve the commands without the per-build placeholders, which change on every run.
+    stable = replace(ctx, build_ts="{timestamp}", build_root="{build_root}")
+    post_cmd = str(ctx.project_cfg.get("PROJECT_POST_BUILD_CMD", "")).strip()
+    return {
+        "repositories": repositories,
+        "pos": pos,
+        "config": ctx.project_cfg,
+        "command": {
+            "build": _format_cmd_template(_build_cmd_for_profile(ctx.project_cfg, ctx.profile), stable),
+            "post_build": _format_cmd_template(post_cmd, stable) if post_cmd else "",
+            "platform": ctx.platform,
+            "profile": ctx.profile,
+            "repo": ctx.repo,
+            "target": ctx.target,
+        },
+    }
+
+
+def _relink_artifact(src_path: str, dest_path: str, link: str) -> None:
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    if os.path.lexists(dest_path):
+        os.unlink(dest_path)
+    if link == "reflink" and _reflink(src_path, dest_path):
+        shutil.copystat(src_path, dest_path)
+        return
+    if link == "hardlink":
+        try:
+            os.link(src_path, dest_path)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src_path, dest_path)
+
+
+def _record_fingerprint(ctx: BuildContext, fingerprint: str, summary: Dict[str, Any], reused_from: str = "") -> None:
+    payload = {"project": ctx.project_name, "timestamp": ctx.build_ts, "fingerprint": fingerprint}
+    write_record(ctx.build_root, {**payload, "reused_from": reused_from, "inputs": summary})
+
+
+def _reuse_previous_build(
+    ctx: BuildContext, fingerprint: str, summary: Dict[str, Any], hash_cache: FileHashCache
+) -> bool:
+    """
+    Link the artifacts of an earlier build with the same fingerprint into this build.
+
+    Returns False when there is no such build with intact artifacts, or when
+    linking fails, so the caller builds as usual.
+    """
+    found = find_reusable_build(os.path.dirname(ctx.build_root), fingerprint, ctx.build_root, hash_cache)
+    if found is None:
+        log.info("No earlier build matches fingerprint %s", fingerprint[:12])
+        return False
+    previous_root, manifest = found
+    previous_ts = os.path.basename(previous_root)
+    previous_artifacts = os.path.join(previous_root, "artifacts")
+    artifacts_root = os.path.join(ctx.build_root, "artifacts")
+    link = _artifact_link_mode(ctx.project_cfg)
+    link = link if link == "reflink" else "hardlink"
+    files = [rel for rel, _size, _sha256 in artifact_files(manifest)]
+
+    def _link(rel: str) -> None:
+        _relink_artifact(os.path.join(previous_artifacts, rel), os.path.join(artifacts_root, rel), link)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(ctx.artifact_jobs or parse_jobs(""), len(files)))) as executor:
+            list(executor.map(_link, files))
+        _write_artifacts_manifest(artifacts_root, {**manifest, "timestamp": ctx.build_ts, "reused_from": previous_ts})
+        _record_fingerprint(ctx, fingerprint, summary, reused_from=previous_ts)
+    except OSError as exc:
+        log.warning("Could not reuse the artifacts of build %s (%s); building instead", previous_ts, exc)
+        shutil.rmtree(artifacts_root, ignore_errors=True)
+        return False
 
+    log.info(
+        "Build inputs match build %s (fingerprint %s); linked %d artifact file(s) instead of building",
+        previous_ts,
+        fingerprint[:12],
+        len(files),
+    )
     return True
 
 
@@ -949,7 +1837,16 @@ def project_pre_build(
         log.info("Skipping po_apply (--no-po).")
 
     if not _coerce_bool(no_diff, False):
-        project_diff(env, projects_info, project_name, timestamp=timestamp, dry_run=_coerce_bool(dry_run, False))
+        project_info = projects_info.get(project_name, {}) if isinstance(projects_info, dict) else {}
+        project_cfg = project_info.get("config", {}) if isinstance(project_info, dict) else {}
+        project_diff(
+            env,
+            projects_info,
+            project_name,
+            timestamp=timestamp,
+            dry_run=_coerce_bool(dry_run, False),
+            store=_coerce_bool(project_cfg.get("PROJECT_DIFF_STORE"), False),
+        )
     else:
         log.info("Skipping project_diff (--no-diff).")
     return True
@@ -985,18 +1882,7 @@ def project_do_build(
     repo_text = str(repo or "")
     target_text = str(target or "")
 
-    cmd = ""
-    if profile_norm == "single":
-        cmd = (
-            str(project_cfg.get("PROJECT_BUILD_SINGLE_CMD", "")).strip()
-            or str(project_cfg.get("PROJECT_BUILD_CMD_SINGLE", "")).strip()
-        )
-    elif profile_norm == "full":
-        cmd = (
-            str(project_cfg.get("PROJECT_BUILD_FULL_CMD", "")).strip()
-            or str(project_cfg.get("PROJECT_BUILD_CMD_FULL", "")).strip()
-        )
-    cmd = cmd or str(project_cfg.get("PROJECT_BUILD_CMD", "")).strip()
+    cmd = _build_cmd_for_profile(project_cfg, profile_norm)
     if not cmd:
         # Debug-friendly hint without leaking full command content (commands may contain tokens).
         full_cmd = str(project_cfg.get("PROJECT_BUILD_FULL_CMD", "")).strip()
@@ -1162,6 +2048,10 @@ def build_project_build_plan(
     force: bool = False,
     no_po: bool = False,
     no_diff: bool = False,
+    sync_jobs: str = "",
+    clean_jobs: str = "",
+    artifact_jobs: str = "",
+    no_cache: bool = False,
 ) -> Dict[str, Any]:
     """Build a machine-readable plan for project_build without executing hooks/commands."""
     project_info = projects_info.get(project_name, {}) if isinstance(projects_info, dict) else {}
@@ -1188,19 +2078,16 @@ def build_project_build_plan(
         profile=_normalise_profile(profile),
         repo=str(repo or ""),
         target=str(target or ""),
+        sync_jobs=max(0, _configured_jobs(sync_jobs, project_cfg, "PROJECT_SYNC_JOBS")),
+        clean_jobs=max(0, _configured_jobs(clean_jobs, project_cfg, "PROJECT_CLEAN_JOBS")),
+        artifact_jobs=max(0, _configured_jobs(artifact_jobs, project_cfg, "PROJECT_ARTIFACT_JOBS")),
     )
 
     steps: List[Dict[str, Any]] = []
 
     # Clean plan
     if _coerce_bool(clean, False):
-        excludes = [
-            "projects",
-            ".repo",
-            os.path.join(".cache", "po_applied"),
-        ]
-        excludes.extend(_split_multiline_rules(str(project_cfg.get("PROJECT_CLEAN_EXCLUDE", ""))))
-        excludes = [e for e in excludes if e]
+        excludes = _clean_excludes(project_cfg)
 
         per_repo: List[Dict[str, Any]] = []
         for repo_path, repo_name in ctx.repositories:
@@ -1225,6 +2112,7 @@ def build_project_build_plan(
                 "name": "repo_clean",
                 "requires_force": True,
                 "force_enabled": bool(_coerce_bool(force, False)),
+                "jobs": ctx.clean_jobs or parse_jobs(""),
                 "excludes": excludes,
                 "repositories": per_repo,
             }
@@ -1247,7 +2135,8 @@ def build_project_build_plan(
         else:
             manifest = os.path.join(ctx.root_path, ".repo", "manifest.xml")
             if os.path.exists(manifest) and shutil.which("repo"):
-                steps.append({"name": "repo_sync", "mode": "repo", "cwd": ".", "cmd": "repo sync"})
+                repo_cmd = f"repo sync -j{ctx.sync_jobs}" if ctx.sync_jobs else "repo sync"
+                steps.append({"name": "repo_sync", "mode": "repo", "cwd": ".", "cmd": repo_cmd})
             else:
                 per_repo = []
                 for repo_path, repo_name in ctx.repositories:
@@ -1269,7 +2158,14 @@ def build_project_build_plan(
                             "cmd": "git pull --rebase" if has_upstream else "(skip: no upstream)",
                         }
                     )
-                steps.append({"name": "repo_sync", "mode": "git", "repositories": per_repo})
+                steps.append(
+                    {
+                        "name": "repo_sync",
+                        "mode": "git",
+                        "jobs": ctx.sync_jobs or parse_jobs(""),
+                        "repositories": per_repo,
+                    }
+                )
 
     # Pre-build plan (po_apply + project_diff)
     pre_build: Dict[str, Any] = {"name": "pre_build", "timestamp": build_ts, "steps": []}
@@ -1287,7 +2183,12 @@ def build_project_build_plan(
         pre_build["steps"].append(
             {
                 "operation": "project_diff",
-                "plan": build_project_diff_plan(env, project_name, timestamp=build_ts),
+                "plan": build_project_diff_plan(
+                    env,
+                    project_name,
+                    timestamp=build_ts,
+                    store=_coerce_bool(project_cfg.get("PROJECT_DIFF_STORE"), False),
+                ),
             }
         )
     else:
@@ -1297,18 +2198,7 @@ def build_project_build_plan(
 
     # Build stage plan
     profile_norm = _normalise_profile(profile)
-    cmd = ""
-    if profile_norm == "single":
-        cmd = (
-            str(project_cfg.get("PROJECT_BUILD_SINGLE_CMD", "")).strip()
-            or str(project_cfg.get("PROJECT_BUILD_CMD_SINGLE", "")).strip()
-        )
-    elif profile_norm == "full":
-        cmd = (
-            str(project_cfg.get("PROJECT_BUILD_FULL_CMD", "")).strip()
-            or str(project_cfg.get("PROJECT_BUILD_CMD_FULL", "")).strip()
-        )
-    cmd = cmd or str(project_cfg.get("PROJECT_BUILD_CMD", "")).strip()
+    cmd = _build_cmd_for_profile(project_cfg, profile_norm)
     if cmd:
         build_cwd = _resolve_cwd(root_path, str(project_cfg.get("PROJECT_BUILD_CWD", "")).strip())
         steps.append(
@@ -1345,6 +2235,8 @@ def build_project_build_plan(
         {
             "name": "collect_artifacts",
             "artifacts_root": os.path.relpath(os.path.join(build_root, "artifacts"), start=root_path),
+            "jobs": ctx.artifact_jobs or parse_jobs(""),
+            "link": _artifact_link_mode(project_cfg),
             "rules": rules,
         }
     )
@@ -1367,6 +2259,7 @@ def build_project_build_plan(
             "force": bool(_coerce_bool(force, False)),
             "no_po": bool(_coerce_bool(no_po, False)),
             "no_diff": bool(_coerce_bool(no_diff, False)),
+            "no_cache": bool(_coerce_bool(no_cache, False)),
         },
         "repositories": [
             {"name": repo_name, "path": os.path.relpath(os.path.abspath(repo_path), start=root_path)}
@@ -1395,6 +2288,10 @@ def project_build(
     force: bool = False,
     no_po: bool = False,
     no_diff: bool = False,
+    sync_jobs: str = "",
+    clean_jobs: str = "",
+    artifact_jobs: str = "",
+    no_cache: bool = False,
 ) -> bool:
     """
     Build the specified project, including pre-build, build, and post-build stages.
@@ -1414,10 +2311,26 @@ def project_build(
     force (bool): Allow destructive actions (needed for --clean) (default: False).
     no_po (bool): Skip po_apply stage (default: False).
     no_diff (bool): Skip project_diff stage (default: False).
+    sync_jobs (str): Repositories synced in parallel, passed to `repo sync` as -jN (default: PROJECT_SYNC_JOBS).
+    clean_jobs (str): Repositories cleaned in parallel (default: PROJECT_CLEAN_JOBS or CPU count).
+    artifact_jobs (str): Artifact files copied in parallel (default: PROJECT_ARTIFACT_JOBS or CPU count).
+    no_cache (bool): Always build, even when an earlier build had the same fingerprint (default: False).
     """
     project_info = projects_info.get(project_name, {}) if isinstance(projects_info, dict) else {}
     project_cfg = project_info.get("config", {}) if isinstance(project_info, dict) else {}
     platform = str(project_cfg.get("PROJECT_PLATFORM", "")).strip() or None
+    sync_job_count = _configured_jobs(sync_jobs, project_cfg, "PROJECT_SYNC_JOBS")
+    if sync_job_count < 0:
+        log.error("Invalid --sync-jobs value: '%s'", sync_jobs or project_cfg.get("PROJECT_SYNC_JOBS"))
+        return False
+    clean_job_count = _configured_jobs(clean_jobs, project_cfg, "PROJECT_CLEAN_JOBS")
+    if clean_job_count < 0:
+        log.error("Invalid --clean-jobs value: '%s'", clean_jobs or project_cfg.get("PROJECT_CLEAN_JOBS"))
+        return False
+    artifact_job_count = _configured_jobs(artifact_jobs, project_cfg, "PROJECT_ARTIFACT_JOBS")
+    if artifact_job_count < 0:
+        log.error("Invalid --artifact-jobs value: '%s'", artifact_jobs or project_cfg.get("PROJECT_ARTIFACT_JOBS"))
+        return False
 
     root_path = os.path.abspath(str(env.get("root_path") or os.getcwd()))
     build_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1439,6 +2352,9 @@ def project_build(
         profile=_normalise_profile(profile),
         repo=str(repo or ""),
         target=str(target or ""),
+        sync_jobs=sync_job_count,
+        clean_jobs=clean_job_count,
+        artifact_jobs=artifact_job_count,
     )
 
     emit_enabled, _ = parse_emit_plan(emit_plan)
@@ -1455,6 +2371,10 @@ def project_build(
             force=force,
             no_po=no_po,
             no_diff=no_diff,
+            sync_jobs=sync_jobs,
+            clean_jobs=clean_jobs,
+            artifact_jobs=artifact_jobs,
+            no_cache=no_cache,
         )
         emit_plan_json(payload, emit_plan)
         return True
@@ -1525,6 +2445,24 @@ def project_build(
             log.error("Pre-build hooks failed, aborting build")
             return False
 
+    # Fingerprint the inputs once pre-build has applied POs; only builds that collect artifacts can be reused.
+    fingerprint = ""
+    fingerprint_summary: Dict[str, Any] = {}
+    hash_cache: Optional[FileHashCache] = None
+    if not ctx.dry_run and _split_multiline_rules(str(project_cfg.get("PROJECT_BUILD_ARTIFACTS", ""))):
+        hash_cache = FileHashCache("build_fingerprint_hashes", root_path)
+        inputs = _fingerprint_inputs(ctx, hash_cache)
+        if inputs is None:
+            log.info("Build fingerprint skipped: a repository is not a readable git work tree")
+        else:
+            fingerprint, fingerprint_summary = build_fingerprint(inputs)
+            if not _coerce_bool(no_cache, False) and _reuse_previous_build(
+                ctx, fingerprint, fingerprint_summary, hash_cache
+            ):
+                hash_cache.save()
+                log.info("Build succeeded for project: %s", project_name)
+                return True
+
     # Execute build hooks if platform is specified and has hooks
     if platform and has_platform_hooks(HookType.BUILD, platform):
         build_result = execute_hooks_with_fallback(HookType.BUILD, shared_context, platform)
@@ -1568,5 +2506,13 @@ def project_build(
     if not _collect_artifacts(ctx):
         return False
 
+    if fingerprint and os.path.isfile(os.path.join(ctx.build_root, "artifacts", "manifest.json")):
+        try:
+            _record_fingerprint(ctx, fingerprint, fingerprint_summary)
+        except OSError as exc:
+            log.warning("Failed to record the build fingerprint: %s", exc)
+    if hash_cache is not None:
+        hash_cache.save()
+
     log.info("Build succeeded for project: %s", project_name)
     return True
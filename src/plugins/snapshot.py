@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from src.log_manager import log
 from src.operations.registry import register
 from src.plugins.patch_override import parse_po_config
+from src.repo_state import scan_repositories
 
 
 def _repo_head_sha(repo_path: str) -> str:
@@ -57,7 +58,7 @@ def snapshot_create(
 ) -> bool:
     """
     Create a deterministic JSON snapshot of:
-    - repository HEAD SHAs (for repositories discovered in the workspace)
+    - repository HEAD SHAs and clean flags (for repositories discovered in the workspace)
     - enabled POs (resolved from PROJECT_PO_CONFIG) for the given project
 
     out (str): Optional output path. When empty, prints JSON to stdout.
@@ -72,13 +73,18 @@ def snapshot_create(
     po_config = str(project_cfg.get("PROJECT_PO_CONFIG", "") or "").strip()
     apply_pos, _exclude_pos, _exclude_files = parse_po_config(po_config)
 
+    # One parallel `git status --branch` per repository yields both HEAD and the clean flag.
+    repositories = sorted(repositories, key=lambda item: item[1])
+    states = scan_repositories(repositories, os.cpu_count() or 1)
     repo_items = []
-    for repo_path, repo_name in sorted(repositories, key=lambda item: item[1]):
+    for repo_path, repo_name in repositories:
+        state = states.get(repo_path)
         repo_items.append(
             {
                 "name": repo_name,
                 "path": _safe_relpath(repo_path, start=root_path),
-                "head": _repo_head_sha(repo_path),
+                "head": state.head if state is not None else _repo_head_sha(repo_path),
+                "clean": bool(state is not None and state.clean),
             }
         )
 
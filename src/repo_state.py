@@ -0,0 +1,65 @@
+"""
+Cheap per-repository state scan (HEAD, dirty, commits ahead of upstream).
+
+One `git status --porcelain=v2 -z --branch` per repository answers all three,
+so callers can skip clean repositories before forking anything else.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RepoState:
+    head: str
+    dirty: bool
+    ahead: int
+
+    @property
+    def clean(self) -> bool:
+        """No staged, modified or untracked files and nothing to push."""
+        return not self.dirty and self.ahead == 0
+
+
+def repo_state(repo_path: str) -> Optional[RepoState]:
+    """Return the state of a repository, or None when it is not a git work tree git can read."""
+    git_marker = os.path.join(repo_path, ".git")
+    if not (os.path.isdir(git_marker) or os.path.isfile(git_marker)):
+        return None
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain=v2", "-z", "--branch", "--untracked-files=normal"],
+            cwd=repo_path,
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    head = ""
+    ahead = 0
+    dirty = False
+    for record in result.stdout.split(b"\0"):
+        if record.startswith(b"# branch.oid "):
+            oid = record[len(b"# branch.oid ") :].decode("ascii", errors="replace")
+            head = "" if oid == "(initial)" else oid
+        elif record.startswith(b"# branch.ab "):
+            ahead = int(record.split()[2].lstrip(b"+") or 0)
+        elif record[:1] in (b"1", b"2", b"u", b"?"):
+            dirty = True
+    return RepoState(head=head, dirty=dirty, ahead=ahead)
+
+
+def scan_repositories(repositories: List[Tuple[str, str]], max_workers: int) -> Dict[str, Optional[RepoState]]:
+    """Scan repositories in parallel; return {repo_path: RepoState or None}."""
+    if not repositories:
+        return {}
+    paths = [repo_path for repo_path, _repo_name in repositories]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths)))) as executor:
+        return dict(zip(paths, executor.map(repo_state, paths)))
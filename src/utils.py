@@ -26,6 +26,24 @@ def path_from_root(*args):
     return os.path.join(os.getcwd(), *args)
 
 
+def parse_jobs(jobs):
+    """
+    Parses a --jobs value into a worker count.
+
+    Args:
+        jobs (str | int | bool | None): The raw option value; unset (None, True or "") means the CPU count.
+
+    Returns:
+        int: The worker count, or 0 when the value is not a non-negative integer.
+    """
+    if jobs is None or jobs is True or jobs == "":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(jobs))
+    except (TypeError, ValueError):
+        return 0
+
+
 def get_filename(prefix, suffix, path):
     """
     Generates a unique filename with a timestamp.
@@ -566,6 +566,140 @@ class TestPatchOverrideApply:
             with open(tracked, "r", encoding="utf-8") as f:
                 assert f.read() == "modified\n"
 
+    def test_po_apply_and_revert_from_plan(self):
+        """PLAN-005: --from-plan executes an emitted plan and rejects stale plans."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_root = os.path.join(tmpdir, "repo_root")
+            os.makedirs(repo_root, exist_ok=True)
+
+            def _git(*args: str) -> None:
+                subprocess.run(
+                    ["git", *args], cwd=repo_root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+
+            _git("init")
+            _git("config", "user.email", "test@example.com")
+            _git("config", "user.name", "Test User")
+
+            target_abs = os.path.join(repo_root, "hello.txt")
+            with open(target_abs, "w", encoding="utf-8") as f:
+                f.write("a\n")
+            _git("add", "hello.txt")
+            _git("commit", "-m", "base")
+            with open(target_abs, "w", encoding="utf-8") as f:
+                f.write("a\nb\n")
+            patch_content = subprocess.check_output(["git", "diff"], cwd=repo_root).decode("utf-8")
+            _git("checkout", "--", "hello.txt")
+
+            projects_path = os.path.join(tmpdir, "projects")
+            board_name = "board"
+            po_name = "po1"
+            project_name = "proj"
+            patches_dir = os.path.join(projects_path, board_name, "po", po_name, "patches")
+            os.makedirs(patches_dir, exist_ok=True)
+            patch_file = os.path.join(patches_dir, "root.patch")
+            with open(patch_file, "w", encoding="utf-8") as f:
+                f.write(patch_content)
+
+            env = {"projects_path": projects_path, "repositories": [(repo_root, "root")], "po_configs": {}}
+            projects_info = {project_name: {"board_name": board_name, "config": {"PROJECT_PO_CONFIG": po_name}}}
+            apply_plan = os.path.join(tmpdir, "apply_plan.json")
+            revert_plan = os.path.join(tmpdir, "revert_plan.json")
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                assert self.PatchOverride.po_apply(env, projects_info, project_name, emit_plan=apply_plan) is True
+                with open(apply_plan, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+                assert payload["repositories"][0]["head"]
+                assert payload["per_repo_actions"][0]["actions"][0]["sha256"]
+
+                # The plan is authoritative: PROJECT_PO_CONFIG is not consulted.
+                no_config = {project_name: {"board_name": board_name, "config": {}}}
+                assert self.PatchOverride.po_apply(env, no_config, project_name, from_plan=apply_plan) is True
+                with open(target_abs, "r", encoding="utf-8") as f:
+                    assert f.read() == "a\nb\n"
+
+                assert self.PatchOverride.po_revert(env, projects_info, project_name, emit_plan=revert_plan) is True
+                assert self.PatchOverride.po_revert(env, no_config, project_name, from_plan=revert_plan) is True
+                with open(target_abs, "r", encoding="utf-8") as f:
+                    assert f.read() == "a\n"
+
+                # Editing a PO file after emitting the plan makes it stale.
+                with open(patch_file, "a", encoding="utf-8") as f:
+                    f.write("\n")
+                assert self.PatchOverride.po_apply(env, projects_info, project_name, from_plan=apply_plan) is False
+                # A plan for another operation is rejected.
+                assert self.PatchOverride.po_revert(env, projects_info, project_name, from_plan=apply_plan) is False
+            finally:
+                os.chdir(old_cwd)
+
+            with open(target_abs, "r", encoding="utf-8") as f:
+                assert f.read() == "a\n"
+
+    def test_patch_header_cache_parses_headers_and_invalidates_on_change(self):
+        """Patch headers are parsed by streaming and cached by (path, size, mtime_ns)."""
+        from src.plugins.po_plugins import utils as po_utils
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            patch_file = os.path.join(tmpdir, "0001-change.patch")
+            with open(patch_file, "w", encoding="utf-8") as f:
+                f.write(
+                    "From 0123456789abcdef0123456789abcdef01234567 Mon Sep 17 00:00:00 2001\n"
+                    "Subject: [PATCH] change\n\n"
+                    "diff --git a/b.txt b/b.txt\n--- a/b.txt\n+++ b/b.txt\n@@ -1 +1 @@\n-x\n+y\n"
+                    "diff --git a/a.txt b/a.txt\ndeleted file mode 100644\n--- a/a.txt\n+++ /dev/null\n"
+                )
+
+            cache = po_utils.PatchHeaderCache(tmpdir)
+            header = cache.get(patch_file)
+            assert header == {
+                "targets": ["a.txt", "b.txt"],
+                "original_commit_sha": "0123456789abcdef0123456789abcdef01234567",
+                "hunks": {"a.txt": [], "b.txt": [[1, 1]]},
+            }
+            cache.save()
+            assert os.path.isfile(os.path.join(tmpdir, ".cache", "po_patch_headers.json"))
+            assert po_utils.read_patch_header(patch_file) == header
+
+            reloaded = po_utils.PatchHeaderCache(tmpdir)
+            with patch.object(po_utils, "_scan_patch_header", side_effect=AssertionError("rescanned")):
+                assert po_utils.read_patch_header(patch_file, reloaded) == header
+
+            with open(patch_file, "a", encoding="utf-8") as f:
+                f.write("diff --git a/c.txt b/c.txt\n")
+            assert reloaded.get(patch_file)["targets"] == ["a.txt", "b.txt", "c.txt"]
+
+    def test_patch_header_cache_follows_workspace_root(self, capsys):
+        """po_analyze keeps parsed patch headers under env root_path, not the current directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            workspace = os.path.join(tmpdir, "ws")
+            elsewhere = os.path.join(tmpdir, "elsewhere")
+            patch_path = os.path.join(workspace, "projects", "board", "po", "po1", "patches", "fix.patch")
+            os.makedirs(os.path.dirname(patch_path))
+            os.makedirs(elsewhere)
+            with open(patch_path, "w", encoding="utf-8") as f:
+                f.write("diff --git a/a.txt b/a.txt\n--- a/a.txt\n+++ b/a.txt\n@@ -1 +1 @@\n-x\n+y\n")
+            env = {
+                "root_path": workspace,
+                "projects_path": os.path.join(workspace, "projects"),
+                "repositories": [(workspace, "root")],
+                "po_configs": {},
+            }
+            projects_info = {"proj": {"board_name": "board", "config": {"PROJECT_PO_CONFIG": "po1"}}}
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(elsewhere)
+                assert self.PatchOverride.po_analyze(env, projects_info, "proj", json=True) is True
+            finally:
+                os.chdir(old_cwd)
+            capsys.readouterr()
+
+            assert os.path.isfile(os.path.join(workspace, ".cache", "po_patch_headers.json"))
+            assert not os.path.exists(os.path.join(elsewhere, ".cache"))
+
     def test_po_analyze_detects_patch_and_override_conflicts(self, capsys):
         """po_analyze reports overlapping override targets and patch targets (including repo prefixes)."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -650,6 +784,341 @@ class TestPatchOverrideApply:
                 os.chdir(old_cwd)
             assert strict_result is False
 
+    def test_po_analyze_uses_hunk_ranges_and_level(self, capsys):
+        """po_analyze only reports overlapping/adjacent hunks and honours --level."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects_path = os.path.join(tmpdir, "projects")
+            board_name = "board"
+            project_name = "proj"
+            repo_root = os.path.join(tmpdir, "repo_root")
+            os.makedirs(repo_root, exist_ok=True)
+
+            def _write(path: str, content: str) -> None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+
+            def _patch(path: str, start: int, length: int) -> str:
+                body = "".join(f" line{start + i}\n" for i in range(length))
+                return (
+                    f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n"
+                    f"@@ -{start},{length} +{start},{length + 1} @@\n{body}+added\n"
+                )
+
+            po_root = os.path.join(projects_path, board_name, "po")
+            # far.txt: hunks far apart; near.txt: po2 starts right after po1 ends.
+            _write(os.path.join(po_root, "po1", "patches", "far.patch"), _patch("far.txt", 10, 7))
+            _write(os.path.join(po_root, "po2", "patches", "far.patch"), _patch("far.txt", 200, 7))
+            _write(os.path.join(po_root, "po1", "patches", "near.patch"), _patch("near.txt", 10, 7))
+            _write(os.path.join(po_root, "po2", "patches", "near.patch"), _patch("near.txt", 17, 7))
+            _write(os.path.join(po_root, "po2", "overrides", "far.txt"), "replaced\n")
+
+            env = {"projects_path": projects_path, "repositories": [(repo_root, "root")], "po_configs": {}}
+            projects_info = {project_name: {"board_name": board_name, "config": {"PROJECT_PO_CONFIG": "po1 po2"}}}
+
+            def _analyze(level: str):
+                old_cwd = os.getcwd()
+                try:
+                    os.chdir(tmpdir)
+                    result = self.PatchOverride.po_analyze(env, projects_info, project_name, json=True, level=level)
+                finally:
+                    os.chdir(old_cwd)
+                return result, json.loads(capsys.readouterr().out)
+
+            result, payload = _analyze("adjacent")
+            assert result is True
+            patches = {item["path"]: item for item in payload["conflicts"]["patches"]}
+            assert set(patches) == {"near.txt"}
+            hunk = patches["near.txt"]["hunks"][0]
+            assert hunk["kind"] == "adjacent"
+            assert hunk["a"] == {"po": "po1", "source": "patches/near.patch", "range": [10, 16]}
+            assert hunk["b"]["range"] == [17, 23]
+            assert payload["conflicts"]["override_patch"] == [
+                {"path": "far.txt", "override_pos": ["po2"], "patch_pos": ["po1", "po2"]}
+            ]
+
+            _result, payload = _analyze("overlap")
+            assert payload["conflicts"]["patches"] == []
+
+            _result, payload = _analyze("file")
+            assert {item["path"] for item in payload["conflicts"]["patches"]} == {"far.txt", "near.txt"}
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                assert self.PatchOverride.po_analyze(env, projects_info, project_name, level="bogus") is False
+            finally:
+                os.chdir(old_cwd)
+
+    def test_po_analyze_board_builds_conflict_matrix(self, capsys):
+        """po_analyze_board aggregates conflicting PO pairs across the projects of a board."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects_path = os.path.join(tmpdir, "projects")
+            board_name = "board"
+            repo_root = os.path.join(tmpdir, "repo_root")
+            os.makedirs(repo_root, exist_ok=True)
+
+            po_root = os.path.join(projects_path, board_name, "po")
+            for po_name, content in (("po1", "a"), ("po2", "b"), ("po3", "c")):
+                path = os.path.join(po_root, po_name, "overrides", "shared.txt" if po_name != "po3" else "own.txt")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(f"{content}\n")
+
+            env = {"projects_path": projects_path, "repositories": [(repo_root, "root")], "po_configs": {}}
+            projects_info = {
+                "p1": {"board_name": board_name, "config": {"PROJECT_PO_CONFIG": "po1 po2"}},
+                "p2": {"board_name": board_name, "config": {"PROJECT_PO_CONFIG": "po1 po3"}},
+                "p3": {"board_name": board_name, "config": {"PROJECT_PO_CONFIG": "po2 po1"}},
+                "p4": {"board_name": "other", "config": {"PROJECT_PO_CONFIG": "po1 po2"}},
+            }
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                hashed = []
+                original = self.PatchOverride._file_sha256_best_effort
+
+                def _counting_sha256(path):
+                    hashed.append(path)
+                    return original(path)
+
+                with patch.object(self.PatchOverride, "_file_sha256_best_effort", side_effect=_counting_sha256):
+                    result = self.PatchOverride.po_analyze_board(env, projects_info, board_name, json=True)
+                payload = json.loads(capsys.readouterr().out)
+
+                table_result = self.PatchOverride.po_analyze_board(env, projects_info, board_name, strict=True)
+                table = capsys.readouterr().out
+            finally:
+                os.chdir(old_cwd)
+
+            assert result is True
+            assert [item["project_name"] for item in payload["projects"]] == ["p1", "p2", "p3"]
+            assert payload["matrix"] == [
+                {
+                    "board_name": board_name,
+                    "pos": ["po1", "po2"],
+                    "projects": ["p1", "p3"],
+                    "conflicts": [{"kind": "override", "path": "shared.txt", "projects": ["p1", "p3"]}],
+                }
+            ]
+            # po1 is enabled by three projects but each PO file is hashed once.
+            assert len(hashed) == len(set(hashed)) == 3
+            assert table_result is False
+            assert "po1 x po2" in table
+            assert "p1,p3" in table
+
+    def test_po_apply_revert_status_repo_scope(self):
+        """PO-011f: --repo limits po_apply/po_revert/po_status to POs and files touching the selected repositories."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repos = {name: os.path.join(tmpdir, "ws", name) for name in ("repo1", "repo2")}
+            for repo_dir in repos.values():
+                os.makedirs(repo_dir)
+            with open(os.path.join(repos["repo1"], "a.txt"), "w", encoding="utf-8") as f:
+                f.write("a\n")
+            po_dir = os.path.join(tmpdir, "projects", "board", "po")
+
+            def _write(rel: str, content: str) -> None:
+                path = os.path.join(po_dir, rel)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+
+            _write(
+                "po_a/patches/repo1/a.patch",
+                "diff --git a/a.txt b/a.txt\n--- a/a.txt\n+++ b/a.txt\n@@ -1 +1,2 @@\n a\n+b\n",
+            )
+            _write("po_b/overrides/repo2/x.txt", "x\n")
+            _write("po_c/overrides/repo1/c.txt", "c\n")
+            _write("po_c/overrides/repo2/y.txt", "y\n")
+            env = {
+                "projects_path": os.path.join(tmpdir, "projects"),
+                "repositories": [(os.path.join(tmpdir, "ws"), "root")] + [(path, name) for name, path in repos.items()],
+                "po_configs": {},
+            }
+            projects_info = {"proj": {"board_name": "board", "config": {"PROJECT_PO_CONFIG": "po_a po_b po_c"}}}
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                assert self.PatchOverride.po_apply(env, projects_info, "proj", repo="nope") is False
+                assert self.PatchOverride.po_apply(env, projects_info, "proj", repo="repo1") is True
+                with open(os.path.join(repos["repo1"], "a.txt"), "r", encoding="utf-8") as f:
+                    assert f.read() == "a\nb\n"
+                assert os.path.isfile(os.path.join(repos["repo1"], "c.txt"))
+                assert not os.path.exists(os.path.join(repos["repo2"], "x.txt"))
+                assert not os.path.exists(os.path.join(repos["repo2"], "y.txt"))
+                assert not os.path.exists(os.path.join(repos["repo2"], ".cache"))
+
+                with patch("builtins.print"):
+                    items = self.PatchOverride.po_status(env, projects_info, "proj", repo="repo1", json=True)
+                assert [item["name"] for item in items] == ["po_a", "po_c"]
+                assert all([row["repo_name"] for row in item["repos"]] == ["repo1"] for item in items)
+                assert all(item["applied_record_count"] == 1 for item in items)
+
+                assert self.PatchOverride.po_revert(env, projects_info, "proj", repo="repo1") is True
+                with open(os.path.join(repos["repo1"], "a.txt"), "r", encoding="utf-8") as f:
+                    assert f.read() == "a\n"
+                assert not os.path.exists(os.path.join(repos["repo1"], "c.txt"))
+            finally:
+                os.chdir(old_cwd)
+
+    def test_po_verify_reports_drift_without_rehashing_unchanged_files(self):
+        """PO-011g: po_verify checks recorded overrides/custom copies by stat and hashes only on mismatch."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects_path = os.path.join(tmpdir, "projects")
+            repo_root = os.path.join(tmpdir, "repo_root")
+            os.makedirs(repo_root)
+            with open(os.path.join(repo_root, "gone.txt"), "w", encoding="utf-8") as f:
+                f.write("gone\n")
+            po_root = os.path.join(projects_path, "board", "po", "po1")
+            os.makedirs(os.path.join(po_root, "overrides"))
+            os.makedirs(os.path.join(po_root, "custom"))
+            with open(os.path.join(po_root, "overrides", "target.txt"), "w", encoding="utf-8") as f:
+                f.write("override\n")
+            with open(os.path.join(po_root, "overrides", "gone.txt.remove"), "w", encoding="utf-8") as f:
+                f.write("")
+            with open(os.path.join(po_root, "custom", "test_custom.txt"), "w", encoding="utf-8") as f:
+                f.write("custom\n")
+            env = {
+                "projects_path": projects_path,
+                "repositories": [(repo_root, "root")],
+                "po_configs": {
+                    "po-po1": {"PROJECT_PO_DIR": "custom", "PROJECT_PO_FILE_COPY": "test_custom.txt:custom_dest.txt"}
+                },
+            }
+            projects_info = {"proj": {"board_name": "board", "config": {"PROJECT_PO_CONFIG": "po1"}}}
+            target = os.path.join(repo_root, "target.txt")
+            report_path = os.path.join(tmpdir, "out", "drift.json")
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                assert self.PatchOverride.po_apply(env, projects_info, "proj", force=True) is True
+                with patch("builtins.print"):
+                    assert self.PatchOverride.po_verify(env, projects_info, "proj", report=report_path) is True
+                with open(report_path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+                assert payload["checked"] == 3
+                assert payload["hashed"] == 0
+                assert payload["drift"] == []
+
+                # Touched but identical: hashed once, then served from the hash cache.
+                os.utime(target, ns=(1, 1))
+                with patch("builtins.print"):
+                    assert self.PatchOverride.po_verify(env, projects_info, "proj", report=report_path) is True
+                with open(report_path, "r", encoding="utf-8") as f:
+                    assert json.load(f)["hashed"] == 1
+                with patch("builtins.print"):
+                    assert self.PatchOverride.po_verify(env, projects_info, "proj", report=report_path) is True
+                with open(report_path, "r", encoding="utf-8") as f:
+                    assert json.load(f)["hashed"] == 0
+
+                with open(target, "w", encoding="utf-8") as f:
+                    f.write("edited!!\n")
+                with open(os.path.join(repo_root, "gone.txt"), "w", encoding="utf-8") as f:
+                    f.write("back\n")
+                os.remove(os.path.join(tmpdir, "custom_dest.txt"))
+                with patch("builtins.print"):
+                    assert self.PatchOverride.po_verify(env, projects_info, "proj", report=report_path) is False
+                with open(report_path, "r", encoding="utf-8") as f:
+                    drift = {(item["kind"], item["status"]) for item in json.load(f)["drift"]}
+                assert drift == {("override", "modified"), ("override", "reappeared"), ("custom", "missing")}
+            finally:
+                os.chdir(old_cwd)
+
+    def test_po_verify_checks_single_repo_once_and_tolerates_old_records(self):
+        """PO-011i: po_verify checks a workspace-root repo once; unfingerprinted records are listed, not drift."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects_path = os.path.join(tmpdir, "projects")
+            po_root = os.path.join(projects_path, "board", "po", "po1")
+            os.makedirs(os.path.join(po_root, "overrides"))
+            with open(os.path.join(po_root, "overrides", "target.txt"), "w", encoding="utf-8") as f:
+                f.write("override\n")
+            env = {"projects_path": projects_path, "repositories": [(tmpdir, "root")], "po_configs": {}}
+            projects_info = {"proj": {"board_name": "board", "config": {"PROJECT_PO_CONFIG": "po1"}}}
+            report_path = os.path.join(tmpdir, "out", "drift.json")
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                assert self.PatchOverride.po_apply(env, projects_info, "proj", force=True) is True
+                with patch("builtins.print"):
+                    assert self.PatchOverride.po_verify(env, projects_info, "proj", report=report_path) is True
+                with open(report_path, "r", encoding="utf-8") as f:
+                    assert json.load(f)["checked"] == 1
+
+                # Simulate a record written before fingerprints were stored.
+                for root, _dirs, files in os.walk(os.path.join(tmpdir, ".cache", "po_applied")):
+                    for name in files:
+                        record_path = os.path.join(root, name)
+                        with open(record_path, "r", encoding="utf-8") as f:
+                            record = json.load(f)
+                        for entry in record.get("overrides") or []:
+                            entry.pop("sha256", None)
+                        with open(record_path, "w", encoding="utf-8") as f:
+                            json.dump(record, f)
+                with patch("builtins.print"):
+                    assert self.PatchOverride.po_verify(env, projects_info, "proj", report=report_path) is True
+                with open(report_path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+                assert payload["drift"] == []
+                assert [item["kind"] for item in payload["unrecorded"]] == ["override"]
+            finally:
+                os.chdir(old_cwd)
+
+    def test_po_status_all_aggregates_records_across_projects(self, capsys):
+        """PO-011h: po_status_all scans applied record trees once and reports per project, PO and repo."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repos = {name: os.path.join(tmpdir, name) for name in ("repo1", "repo2")}
+            env = {"repositories": [(path, name) for name, path in repos.items()]}
+            projects_info = {
+                "alpha": {"board_name": "b1", "config": {"PROJECT_PO_CONFIG": "po_a po_b"}},
+                "beta": {"board_name": "b1", "config": {"PROJECT_PO_CONFIG": "po_a"}},
+                "gamma": {"board_name": "b2", "config": {"PROJECT_PO_CONFIG": "po_a"}},
+            }
+
+            def _record(repo: str, board: str, project: str, po_name: str, payload) -> None:
+                path = self.PatchOverride._po_applied_record_path(repos[repo], board, project, po_name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(payload if isinstance(payload, str) else json.dumps(payload))
+
+            _record("repo1", "b1", "alpha", "po_a", {"status": "applied", "overrides": [{}, {}]})
+            _record("repo2", "b1", "alpha", "po_a", "{broken")
+            _record("repo2", "b1", "alpha", "po_old", {"status": "applied"})
+            _record("repo1", "b1", "beta", "po_a", {"status": "applied"})
+            _record("repo1", "b2", "gamma", "po_a", {"status": "applied"})
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                capsys.readouterr()
+                assert self.PatchOverride.po_status_all(env, projects_info, "b1", project="al*", ndjson=True) is True
+                lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+                assert [(item["project_name"], item["po"], item["configured"]) for item in lines] == [
+                    ("alpha", "po_a", True),
+                    ("alpha", "po_b", True),
+                    ("alpha", "po_old", False),
+                ]
+                po_a_rows = {row["repo_name"]: row for row in lines[0]["repos"]}
+                assert po_a_rows["repo1"]["counts"]["overrides"] == 2
+                assert po_a_rows["repo2"]["status"] == "unreadable"
+                assert lines[1]["applied_record_count"] == 0
+
+                assert self.PatchOverride.po_status_all(env, projects_info, summary=True, json=True) is True
+                payload = json.loads(capsys.readouterr().out)
+                assert payload["project_count"] == 3
+                counts = {(item["project_name"], item["po"]): item["applied_record_count"] for item in payload["items"]}
+                assert counts[("alpha", "po_a")] == 2
+                assert counts[("beta", "po_a")] == 1
+                assert counts[("gamma", "po_a")] == 1
+                assert all("status" not in row for item in payload["items"] for row in item["repos"])
+
+                assert self.PatchOverride.po_status_all(env, projects_info, "nope") is False
+            finally:
+                os.chdir(old_cwd)
+
     def test_po_apply_with_excluded_po(self):
         """Test po_apply when PO is excluded in config."""
         # Arrange
@@ -1470,6 +1939,130 @@ class TestPatchOverrideRevert:
             with open(target_abs, "r", encoding="utf-8") as f:
                 assert f.read() == "a\n"
 
+    def test_po_apply_in_process_patch_matches_git_apply(self):
+        """PO-011c: In-process patch apply keeps CRLF, records the same commands as git apply and reverts."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects_path = os.path.join(tmpdir, "projects")
+            patches_dir = os.path.join(projects_path, "board", "po", "po1", "patches")
+            os.makedirs(patches_dir, exist_ok=True)
+            projects_info = {"proj": {"board_name": "board", "config": {"PROJECT_PO_CONFIG": "po1"}}}
+
+            def _make_repo(name: str) -> str:
+                repo_root = os.path.join(tmpdir, name)
+                os.makedirs(repo_root)
+
+                def _git(*args: str) -> None:
+                    subprocess.run(
+                        ["git", *args], cwd=repo_root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                    )
+
+                _git("init")
+                _git("config", "user.email", "test@example.com")
+                _git("config", "user.name", "Test User")
+                with open(os.path.join(repo_root, "crlf.txt"), "wb") as f:
+                    f.write(b"".join(b"line %d\r\n" % i for i in range(1, 21)))
+                with open(os.path.join(repo_root, "blob.bin"), "wb") as f:
+                    f.write(b"\x00\x01")
+                _git("add", ".")
+                _git("commit", "-m", "base")
+                return repo_root
+
+            repo_git = _make_repo("repo_git")
+            repo_fast = _make_repo("repo_fast")
+            with open(os.path.join(repo_git, "crlf.txt"), "rb") as f:
+                lines = f.read().split(b"\r\n")
+            lines[2], lines[15] = b"LINE 3", b"LINE 16"
+            with open(os.path.join(repo_git, "crlf.txt"), "wb") as f:
+                f.write(b"\r\n".join(lines))
+            with open(os.path.join(repo_git, "blob.bin"), "wb") as f:
+                f.write(b"\x00\x02")
+            for name in ("crlf.txt", "blob.bin"):
+                diff = subprocess.check_output(["git", "diff", "--binary", "--", name], cwd=repo_git)
+                with open(os.path.join(patches_dir, f"{name}.patch"), "wb") as f:
+                    f.write(diff)
+            subprocess.run(["git", "checkout", "--", "."], cwd=repo_git, check=True)
+
+            def _env(repo_root: str) -> dict:
+                return {"projects_path": projects_path, "repositories": [(repo_root, "root")], "po_configs": {}}
+
+            def _record(repo_root: str) -> dict:
+                path = os.path.join(repo_root, ".cache", "po_applied", "board", "proj", "po1.json")
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+                return {
+                    "patches": record["patches"],
+                    "commands": [(c["cmd"], c["description"], c["returncode"]) for c in record["commands"]],
+                }
+
+            assert self.PatchOverride.po_apply(_env(repo_git), projects_info, "proj") is True
+            with patch.object(subprocess, "run", wraps=subprocess.run) as run_mock:
+                assert self.PatchOverride.po_apply(_env(repo_fast), projects_info, "proj", in_process_patch=True)
+            git_apply_calls = [c.args[0] for c in run_mock.call_args_list if c.args[0][:2] == ["git", "apply"]]
+            assert git_apply_calls == [["git", "apply", os.path.join(patches_dir, "blob.bin.patch")]]
+
+            assert _record(repo_fast) == _record(repo_git)
+            for name in ("crlf.txt", "blob.bin"):
+                with open(os.path.join(repo_fast, name), "rb") as f_fast, open(os.path.join(repo_git, name), "rb") as f_git:
+                    assert f_fast.read() == f_git.read()
+            with open(os.path.join(repo_fast, "crlf.txt"), "rb") as f:
+                assert b"LINE 16\r\nline 17\r\n" in f.read()
+
+            assert self.PatchOverride.po_revert(_env(repo_fast), projects_info, "proj", in_process_patch=True) is True
+            status = subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo_fast, capture_output=True, check=True
+            )
+            assert status.stdout == b""
+
+    def test_po_apply_po_cache_reuses_materialized_results(self):
+        """PO-011d: po_apply --po-cache serves patched contents by (base blob, patch hash) and evicts LRU entries."""
+        from src.plugins.po_plugins import materialized, unidiff
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_root = os.path.join(tmpdir, "repo")
+            os.makedirs(repo_root)
+            target = os.path.join(repo_root, "a.txt")
+            with open(target, "w", encoding="utf-8") as f:
+                f.write("one\ntwo\n")
+            patches_dir = os.path.join(tmpdir, "projects", "board", "po", "po1", "patches")
+            os.makedirs(patches_dir)
+            with open(os.path.join(patches_dir, "a.patch"), "w", encoding="utf-8") as f:
+                f.write("diff --git a/a.txt b/a.txt\n--- a/a.txt\n+++ b/a.txt\n@@ -1,2 +1,2 @@\n one\n-two\n+TWO\n")
+            env = {
+                "projects_path": os.path.join(tmpdir, "projects"),
+                "repositories": [(repo_root, "root")],
+                "po_configs": {},
+            }
+            projects_info = {"proj": {"board_name": "board", "config": {"PROJECT_PO_CONFIG": "po1"}}}
+
+            def _apply(base: str) -> str:
+                with open(target, "w", encoding="utf-8") as f:
+                    f.write(base)
+                assert self.PatchOverride.po_apply(env, projects_info, "proj", reapply=True, po_cache=True)
+                with open(target, "r", encoding="utf-8") as f:
+                    return f.read()
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                assert _apply("one\ntwo\n") == "one\nTWO\n"
+                cache_root = os.path.join(tmpdir, ".cache", "po_materialized")
+                assert sum(len(files) for _root, _dirs, files in os.walk(cache_root)) == 1
+
+                with patch.object(unidiff, "_apply_hunks", side_effect=AssertionError("cache miss")):
+                    assert _apply("one\ntwo\n") == "one\nTWO\n"
+
+                # A different base blob is a different key, never a stale hit.
+                assert _apply("zero\none\ntwo\n") == "zero\none\nTWO\n"
+                assert sum(len(files) for _root, _dirs, files in os.walk(cache_root)) == 2
+
+                cache = materialized.MaterializedCache(cache_root, max_bytes=1)
+                key = cache.key(materialized.git_blob_sha(b"x"), "0" * 64, "a.txt")
+                cache.put(key, b"y")
+                assert cache.prune() == 2
+                assert cache.get(key) == b"y"
+            finally:
+                os.chdir(old_cwd)
+
     def test_po_revert_override_tracked_restores_via_git_checkout(self):
         """PO-012: Override revert for tracked file."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -2015,7 +2608,7 @@ class TestPatchOverrideList:
             assert isinstance(result, list)
             assert [item["name"] for item in result] == [po1]
 
-    def test_po_list_json_prints_payload(self):
+    def test_po_list_json_prints_payload(self, capsys):
         """po_list --json prints a machine-readable payload."""
         with tempfile.TemporaryDirectory() as tmpdir:
             projects_path = os.path.join(tmpdir, "projects")
@@ -2033,21 +2626,69 @@ class TestPatchOverrideList:
                 }
             }
 
-            with patch("builtins.print") as mock_print:
-                result = self.PatchOverride.po_list(env, projects_info, project_name, json=True)
+            capsys.readouterr()
+            result = self.PatchOverride.po_list(env, projects_info, project_name, json=True)
 
             assert isinstance(result, list)
             assert len(result) == 1
             assert result[0]["name"] == po1
 
-            assert mock_print.call_count == 1
-            payload = json.loads(mock_print.call_args[0][0])
+            payload = json.loads(capsys.readouterr().out)
             assert payload["schema_version"] == 1
             assert payload["project_name"] == project_name
             assert payload["board_name"] == board_name
             assert isinstance(payload["items"], list)
 
 
+    def test_po_pack_bundle_is_read_transparently(self):
+        """PO-011e: po_pack writes an indexed bundle; po_list and po_apply read it without the PO directory."""
+        from src.plugins.po_plugins import bundle
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_root = os.path.join(tmpdir, "repo")
+            os.makedirs(repo_root)
+            with open(os.path.join(repo_root, "a.txt"), "w", encoding="utf-8") as f:
+                f.write("one\n")
+            po_path = os.path.join(tmpdir, "projects", "board", "po", "po1")
+            os.makedirs(os.path.join(po_path, "patches"))
+            os.makedirs(os.path.join(po_path, "overrides", "cfg"))
+            with open(os.path.join(po_path, "patches", "a.patch"), "w", encoding="utf-8") as f:
+                f.write("diff --git a/a.txt b/a.txt\n--- a/a.txt\n+++ b/a.txt\n@@ -1 +1 @@\n-one\n+ONE\n")
+            with open(os.path.join(po_path, "overrides", "cfg", "b.ini"), "w", encoding="utf-8") as f:
+                f.write("[b]\n")
+            env = {
+                "projects_path": os.path.join(tmpdir, "projects"),
+                "repositories": [(repo_root, "root")],
+                "po_configs": {},
+            }
+            projects_info = {"proj": {"board_name": "board", "config": {"PROJECT_PO_CONFIG": "po1"}}}
+
+            old_cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                assert self.PatchOverride.po_pack(env, projects_info, "proj", "po1", remove_dir=True) is True
+                assert not os.path.exists(po_path)
+                index = bundle.PoBundle.open(po_path + ".pobundle")
+                assert index.files() == ["overrides/cfg/b.ini", "patches/a.patch"]
+
+                with patch("builtins.print"):
+                    listed = self.PatchOverride.po_list(env, projects_info, "proj")
+                assert listed[0]["patch_files"] == ["a.patch"]
+                assert listed[0]["override_files"] == [os.path.join("cfg", "b.ini")]
+
+                assert self.PatchOverride.po_apply(env, projects_info, "proj", force=True) is True
+                with open(os.path.join(repo_root, "a.txt"), "r", encoding="utf-8") as f:
+                    assert f.read() == "ONE\n"
+                assert os.path.isfile(os.path.join(repo_root, "cfg", "b.ini"))
+
+                assert self.PatchOverride.po_unpack(env, projects_info, "proj", "po1", remove_bundle=True) is True
+                assert not os.path.exists(po_path + ".pobundle")
+                with open(os.path.join(po_path, "overrides", "cfg", "b.ini"), "r", encoding="utf-8") as f:
+                    assert f.read() == "[b]\n"
+                assert self.PatchOverride.po_unpack(env, projects_info, "proj", "po1") is False
+            finally:
+                os.chdir(old_cwd)
+
 class TestPatchOverrideParseConfig:
     """Test cases for parse_po_config method."""
 
@@ -2524,6 +3165,116 @@ class TestPatchOverrideUpdate:
             # Check that po_new succeeded
             assert result, "po_new should succeed"
 
+    def test_git_status_entries_classifies_porcelain_v2_output(self):
+        """File discovery for po_new uses one porcelain v2 status call and keeps the status annotations."""
+        with tempfile.TemporaryDirectory() as repo_dir:
+
+            def _git(*args: str) -> None:
+                subprocess.run(
+                    ["git", *args], cwd=repo_dir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+
+            def _write(name: str, content: str) -> None:
+                path = os.path.join(repo_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+
+            _git("init")
+            _git("config", "user.email", "test@example.com")
+            _git("config", "user.name", "Test User")
+            for name in ("staged.txt", "both.txt", "working.txt", "deleted.txt", "old name.txt"):
+                _write(name, f"{name}\n")
+            _git("add", ".")
+            _git("commit", "-m", "base")
+
+            _write("staged.txt", "changed\n")
+            _write("both.txt", "changed\n")
+            _git("add", "staged.txt", "both.txt")
+            _write("both.txt", "changed again\n")
+            _write("working.txt", "changed\n")
+            os.remove(os.path.join(repo_dir, "deleted.txt"))
+            _git("mv", "old name.txt", "new name.txt")
+            _write("untracked/dir/new.txt", "new\n")
+
+            with patch.object(
+                self.PatchOverride.subprocess, "run", wraps=self.PatchOverride.subprocess.run
+            ) as run_mock:
+                entries = self.PatchOverride._git_status_entries(repo_dir)
+            assert run_mock.call_count == 1
+
+            statuses = {path: self.PatchOverride._describe_git_status(xy) for xy, path in entries}
+            assert statuses == {
+                "both.txt": "MM (staged+modified)",
+                "deleted.txt": " D (deleted)",
+                "new name.txt": "R  (staged)",
+                "staged.txt": "M  (staged)",
+                "untracked/dir/new.txt": "?? (working)",
+                "working.txt": " M (working)",
+            }
+
+        with tempfile.TemporaryDirectory() as not_a_repo:
+            assert self.PatchOverride._git_status_entries(not_a_repo) == []
+
+    def test_po_new_batches_patch_creation_per_repository(self):
+        """Patches come from one staged and one working tree git diff per repository, split per file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects_path = os.path.join(tmpdir, "projects")
+            repo_dir = os.path.join(tmpdir, "repo")
+            os.makedirs(repo_dir)
+
+            def _git(*args: str) -> None:
+                subprocess.run(
+                    ["git", *args], cwd=repo_dir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+
+            def _write(name: str, content: bytes) -> None:
+                with open(os.path.join(repo_dir, name), "wb") as f:
+                    f.write(content)
+
+            _git("init")
+            _git("config", "user.email", "test@example.com")
+            _git("config", "user.name", "Test User")
+            # User settings that change the diff headers or body must not leak into the patches.
+            _git("config", "diff.noprefix", "true")
+            _git("config", "diff.mnemonicPrefix", "true")
+            _git("config", "color.ui", "always")
+            _write("staged.txt", b"base\n")
+            _write("with space.txt", b"base\n")
+            _write("crlf.txt", b"one\r\ntwo\r\n")
+            _git("add", ".")
+            _git("commit", "-m", "base")
+
+            _write("staged.txt", b"staged\n")
+            _git("add", "staged.txt")
+            _write("staged.txt", b"working\n")
+            _write("with space.txt", b"changed\n")
+            _write("crlf.txt", b"one\r\nTWO\r\n")
+
+            env = {"projects_path": projects_path, "repositories": [(repo_dir, "root")], "po_configs": {}}
+            projects_info = {
+                "proj": {"board_name": "board", "board_path": os.path.join(projects_path, "board"), "config": {}}
+            }
+
+            with patch("builtins.input", side_effect=["yes", "all", "1", "", "", ""]), patch.object(
+                self.PatchOverride.subprocess, "run", wraps=self.PatchOverride.subprocess.run
+            ) as run_mock:
+                assert self.PatchOverride.po_new(env, projects_info, "proj", "po_batch", force=False)
+
+            diff_calls = [c for c in run_mock.call_args_list if "diff" in c.args[0]]
+            assert len(diff_calls) == 2
+
+            patches_dir = os.path.join(projects_path, "board", "po", "po_batch", "patches")
+            with open(os.path.join(patches_dir, "staged.txt.patch"), "rb") as f:
+                staged_patch = f.read()
+            assert b"+staged" in staged_patch and b"working" not in staged_patch
+            with open(os.path.join(patches_dir, "with space.txt.patch"), "rb") as f:
+                assert f.read().startswith(b"diff --git a/with space.txt b/with space.txt")
+            with open(os.path.join(patches_dir, "crlf.txt.patch"), "rb") as f:
+                crlf_patch = f.read()
+            assert b"+TWO\r\n" in crlf_patch and b"diff --git a/crlf.txt" in crlf_patch
+            assert b"staged.txt" not in crlf_patch
+
     def test_po_new_creates_remove_files_for_deleted_files(self):
         """Test that po_new creates .remove files for deleted files."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -27,17 +27,11 @@ class _StubQuestionary:
 
 
 def _fake_git_run_factory(*, working_file: str):
-    def _run(cmd, cwd=None, capture_output=None, text=None, check=None):  # noqa: ARG001
+    def _run(cmd, cwd=None, **_kwargs):  # noqa: ARG001
         # Minimal subset used by po_new -> __get_modified_files.
-        if cmd[:4] == ["git", "diff", "--name-only", "--cached"]:
-            return SimpleNamespace(returncode=0, stdout="")
-        if cmd[:4] == ["git", "ls-files", "--modified", "--others"]:
-            return SimpleNamespace(returncode=0, stdout=f"{working_file}\n")
-        if cmd[:3] == ["git", "ls-files", "--deleted"]:
-            return SimpleNamespace(returncode=0, stdout="")
-        if cmd[:3] == ["git", "status", "--porcelain"]:
-            return SimpleNamespace(returncode=0, stdout=f"?? {working_file}\n")
-        return SimpleNamespace(returncode=1, stdout="")
+        if cmd[:3] == ["git", "status", "--porcelain=v2"]:
+            return SimpleNamespace(returncode=0, stdout=f"? {working_file}\0", stderr="")
+        return SimpleNamespace(returncode=1, stdout="", stderr="")
 
     return _run
 
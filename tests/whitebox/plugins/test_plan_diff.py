@@ -0,0 +1,97 @@
+"""
+Tests for the plan_diff operation.
+"""
+
+import json
+import os
+import sys
+
+
+def _po_plan(actions_by_repo):
+    return {
+        "schema_version": 1,
+        "operation": "po_apply",
+        "per_repo_actions": [{"repo": repo, "actions": actions} for repo, actions in actions_by_repo.items()],
+    }
+
+
+class TestPlanDiff:
+    def setup_method(self):
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
+        from src.plugins.plan_diff import plan_diff
+
+        self.plan_diff = plan_diff
+
+    def _write(self, path, payload):
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        return str(path)
+
+    def test_plan_diff_reports_actions_and_targets(self, tmp_path, capsys):
+        """PLAN-006: actions are matched by (repo, po, type, source); changes list the differing fields."""
+        patch_a = {"type": "patch_apply", "po": "po1", "source": "patches/a.patch", "sha256": "1", "targets": ["a.c"]}
+        patch_b = dict(patch_a, sha256="2", targets=["a.c", "b.c"])
+        override = {"type": "override_copy", "po": "po1", "source": "overrides/x", "sha256": "x", "path_in_repo": "x"}
+        commit = {"type": "commit_apply", "po": "po2", "source": "commits/0001.patch", "sha256": "c", "targets": []}
+        plan_a = self._write(tmp_path / "a.json", _po_plan({"repo1": [patch_a, override]}))
+        plan_b = self._write(tmp_path / "b.json", _po_plan({"repo1": [patch_b], "repo2": [commit]}))
+
+        capsys.readouterr()
+        assert self.plan_diff({}, {}, plan_a, plan_b, json=True) is True
+        report = json.loads(capsys.readouterr().out)
+        assert report["summary"] == {
+            "added": 1,
+            "removed": 1,
+            "changed": 1,
+            "target_repos": 1,
+            "identical": False,
+        }
+        assert (report["added"][0]["repo"], report["added"][0]["type"]) == ("repo2", "commit_apply")
+        assert report["removed"][0]["source"] == "overrides/x"
+        assert report["changed"][0]["fields"] == ["sha256", "targets"]
+        assert report["targets"] == [{"repo": "repo1", "added": ["b.c"], "removed": ["x"]}]
+
+        assert self.plan_diff({}, {}, plan_a, plan_a) is True
+        assert "equivalent" in capsys.readouterr().out
+        assert self.plan_diff({}, {}, plan_a, str(tmp_path / "missing.json")) is False
+
+    def test_plan_diff_project_diff_plans_compare_files(self, tmp_path, capsys):
+        """project_diff plans compare the changed-file set of each repository."""
+        base = {"operation": "project_diff", "repositories": [{"repo": "r", "staged_files": [], "all_files": ["a"]}]}
+        newer = {
+            "operation": "project_diff",
+            "repositories": [{"repo": "r", "staged_files": ["a"], "all_files": ["a", "b"]}],
+        }
+        plan_a = self._write(tmp_path / "a.json", base)
+        plan_b = self._write(tmp_path / "b.json", newer)
+
+        capsys.readouterr()
+        assert self.plan_diff({}, {}, plan_a, plan_b) is True
+        out = capsys.readouterr().out
+        assert "+ r file b" in out
+        assert "~ r file a (staged)" in out
+        assert "targets r: +b" in out
+
+    def test_plan_diff_tells_commit_reverts_apart_by_sha(self, tmp_path, capsys):
+        """PLAN-006b: actions without a source are keyed by sha or path, so reverts of different commits differ."""
+
+        def _revert_plan(*shas):
+            actions = [{"type": "commit_revert", "po": "po1", "sha": sha} for sha in shas]
+            actions.append({"type": "remove_applied_record", "po": "po1", "path": "repo1/.cache/po1.json"})
+            return dict(_po_plan({"repo1": actions}), operation="po_revert")
+
+        plan_a = self._write(tmp_path / "a.json", _revert_plan("aaa111", "bbb222"))
+        plan_b = self._write(tmp_path / "b.json", _revert_plan("aaa111", "ccc333"))
+
+        capsys.readouterr()
+        assert self.plan_diff({}, {}, plan_a, plan_b, json=True) is True
+        report = json.loads(capsys.readouterr().out)
+        assert [(item["type"], item["sha"]) for item in report["added"]] == [("commit_revert", "ccc333")]
+        assert [(item["type"], item["sha"]) for item in report["removed"]] == [("commit_revert", "bbb222")]
+        assert report["summary"]["changed"] == 0
+
+        assert self.plan_diff({}, {}, plan_a, plan_b) is True
+        out = capsys.readouterr().out
+        assert "+ repo1 po1 commit_revert ccc333" in out
+        assert "- repo1 po1 commit_revert bbb222" in out
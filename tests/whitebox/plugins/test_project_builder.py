@@ -4,6 +4,7 @@ Tests for project_builder functions.
 
 import json
 import os
+import re
 import subprocess
 import sys
 import tarfile
@@ -13,6 +14,22 @@ from unittest.mock import MagicMock, patch
 # pylint: disable=protected-access
 
 
+def _init_repo(repo_root, files=None):
+    """Create a git repository at repo_root and commit `files` ({name: str or bytes}) when given."""
+    repo_root.mkdir(parents=True, exist_ok=True)
+    for args in (["init"], ["config", "user.email", "t@e.com"], ["config", "user.name", "T"]):
+        subprocess.run(["git", *args], cwd=str(repo_root), check=True, stdout=subprocess.DEVNULL)
+    if files:
+        for name, content in files.items():
+            if isinstance(content, bytes):
+                (repo_root / name).write_bytes(content)
+            else:
+                (repo_root / name).write_text(content, encoding="utf-8")
+        subprocess.run(["git", "add", "."], cwd=str(repo_root), check=True, stdout=subprocess.DEVNULL)
+        subprocess.run(["git", "commit", "-m", "base"], cwd=str(repo_root), check=True, stdout=subprocess.DEVNULL)
+    return repo_root
+
+
 class TestProjectDiff:
     """Test cases for project_diff function."""
 
@@ -342,6 +359,232 @@ class TestProjectDiff:
         # Single repo should not create a repo-name subdir.
         assert "diff/after/root/a.txt" not in names
 
+    def test_project_diff_before_snapshots_use_one_cat_file_stream(self, tmp_path):
+        """BUILD-004b: "before" files come from one ls-tree + cat-file --batch per repo, submodules included."""
+        repo_root = tmp_path / "repo"
+        repo_root.mkdir(parents=True, exist_ok=True)
+
+        def _git(*args: str) -> None:
+            subprocess.run(
+                ["git", *args], cwd=str(repo_root), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+
+        _git("init")
+        _git("config", "user.email", "test@example.com")
+        _git("config", "user.name", "Test User")
+        (repo_root / "a.txt").write_text("base\n", encoding="utf-8")
+        (repo_root / "dir with space").mkdir()
+        (repo_root / "dir with space" / "b.bin").write_bytes(b"\x00\x01crlf\r\n")
+        (repo_root / "gone.txt").write_text("gone\n", encoding="utf-8")
+        _git("add", ".")
+        _git("update-index", "--add", "--cacheinfo", f"160000,{'1' * 40},sub")
+        _git("commit", "-m", "base")
+
+        (repo_root / "a.txt").write_text("base\nchange\n", encoding="utf-8")
+        (repo_root / "dir with space" / "b.bin").write_bytes(b"changed")
+        (repo_root / "gone.txt").unlink()
+        (repo_root / "new.txt").write_text("new\n", encoding="utf-8")
+        _git("update-index", "--cacheinfo", f"160000,{'2' * 40},sub")
+
+        real_run = subprocess.run
+        old_cwd = os.getcwd()
+        try:
+            os.chdir(str(tmp_path))
+            env = {"repositories": [(str(repo_root), "root")]}
+            with patch("src.plugins.project_builder.subprocess.run", side_effect=real_run) as mock_run:
+                assert self.project_diff(env, {}, "projA", keep_diff_dir=True, timestamp="t1") is True
+        finally:
+            os.chdir(old_cwd)
+
+        commands = [call.args[0] for call in mock_run.call_args_list]
+        assert not any(cmd[:2] == ["git", "show"] for cmd in commands)
+        assert sum(cmd[:2] == ["git", "ls-tree"] for cmd in commands) == 1
+
+        before = tmp_path / ".cache" / "build" / "projA" / "t1" / "diff" / "before"
+        assert (before / "a.txt").read_text(encoding="utf-8") == "base\n"
+        assert (before / "dir with space" / "b.bin").read_bytes() == b"\x00\x01crlf\r\n"
+        assert (before / "gone.txt").read_text(encoding="utf-8") == "gone\n"
+        assert (before / "sub").read_text(encoding="utf-8") == f"Subproject commit {'1' * 40}\n"
+        assert not (before / "new.txt").exists()
+
+    def test_project_diff_parallel_jobs_orders_progress_and_aggregates_errors(self, tmp_path, capsys):
+        """BUILD-002b: repos are captured concurrently; progress stays in repo order and failures are collected."""
+        repos = []
+        for name in ("r1", "r2", "r3"):
+            repo_root = tmp_path / name
+            repo_root.mkdir()
+            if name != "r2":
+                _init_repo(repo_root)
+                (repo_root / "f.txt").write_text(name, encoding="utf-8")
+            repos.append((str(repo_root), name))
+
+        old_cwd = os.getcwd()
+        try:
+            os.chdir(str(tmp_path))
+            assert self.project_diff({"repositories": repos}, {}, "projA", jobs="nope") is False
+            capsys.readouterr()
+            result = self.project_diff(
+                {"repositories": repos}, {}, "projA", keep_diff_dir=True, timestamp="t", jobs="3"
+            )
+        finally:
+            os.chdir(old_cwd)
+
+        assert result is False
+        progress = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Processing repo")]
+        assert progress == [
+            "Processing repo 1/3: r1",
+            "Processing repo 2/3: r2 (failed)",
+            "Processing repo 3/3: r3",
+        ]
+        after = tmp_path / ".cache" / "build" / "projA" / "t" / "diff" / "after"
+        assert (after / "r1" / "f.txt").read_text(encoding="utf-8") == "r1"
+        assert (after / "r3" / "f.txt").read_text(encoding="utf-8") == "r3"
+
+    def test_project_diff_skips_clean_repositories(self, tmp_path, capsys):
+        """BUILD-003b: a parallel git status pre-scan skips clean repos and records them in manifest.json."""
+        repos = []
+        for name in ("clean", "dirty"):
+            repo_root = _init_repo(tmp_path / name, {"f.txt": "base\n"})
+            repos.append((str(repo_root), name))
+        (tmp_path / "dirty" / "f.txt").write_text("changed\n", encoding="utf-8")
+
+        real_check_output = subprocess.check_output
+        old_cwd = os.getcwd()
+        try:
+            os.chdir(str(tmp_path))
+            with patch(
+                "src.plugins.project_builder.subprocess.check_output", side_effect=real_check_output
+            ) as mock_check_output:
+                env = {"repositories": repos}
+                assert self.project_diff(env, {}, "projA", keep_diff_dir=True, timestamp="t") is True
+        finally:
+            os.chdir(old_cwd)
+
+        assert all(call.kwargs.get("cwd") != repos[0][0] for call in mock_check_output.call_args_list)
+        out = capsys.readouterr().out
+        assert "Processing repo 1/2: clean (clean)" in out
+        assert "Processing repo 2/2: dirty\n" in out
+        diff_root = tmp_path / ".cache" / "build" / "projA" / "t" / "diff"
+        manifest = json.loads((diff_root / "manifest.json").read_text(encoding="utf-8"))
+        assert {item["repo"]: item["status"] for item in manifest["repositories"]} == {
+            "clean": "clean",
+            "dirty": "captured",
+        }
+        assert (diff_root / "after" / "dirty" / "f.txt").is_file()
+        assert not (diff_root / "after" / "clean").exists()
+
+    def test_project_diff_stream_matches_directory_archive(self, tmp_path):
+        """BUILD-004c: --stream writes the same archive entries as the diff directory, without creating it."""
+        upstream = tmp_path / "upstream.git"
+        subprocess.run(["git", "init", "--bare", str(upstream)], check=True, stdout=subprocess.DEVNULL)
+        repo_root = tmp_path / "repo"
+        subprocess.run(
+            ["git", "clone", str(upstream), str(repo_root)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        def _git(*args: str) -> None:
+            subprocess.run(
+                ["git", *args], cwd=str(repo_root), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+
+        _git("config", "user.email", "test@example.com")
+        _git("config", "user.name", "Test User")
+        (repo_root / "a.txt").write_text("base\n", encoding="utf-8")
+        (repo_root / "run.sh").write_text("echo base\n", encoding="utf-8")
+        (repo_root / "run.sh").chmod(0o755)
+        _git("add", ".")
+        _git("commit", "-m", "base")
+        _git("push", "origin", "HEAD")
+        (repo_root / "c.txt").write_text("local\n", encoding="utf-8")
+        _git("add", "c.txt")
+        _git("commit", "-m", "Local fix: handle the  odd..case!")
+        (repo_root / "a.txt").write_text("base\nchange\n", encoding="utf-8")
+        (repo_root / "run.sh").write_text("echo changed\n", encoding="utf-8")
+        (repo_root / "new.txt").write_text("new\n", encoding="utf-8")
+        _git("add", "new.txt")
+
+        old_cwd = os.getcwd()
+        try:
+            os.chdir(str(tmp_path))
+            env = {"repositories": [(str(repo_root), "root")]}
+            assert self.project_diff(env, {}, "projA", compress="bogus") is False
+            assert self.project_diff(env, {}, "projA", stream=True, keep_diff_dir=True) is False
+            assert self.project_diff(env, {}, "projA", timestamp="tree", compress="none") is True
+            assert self.project_diff(env, {}, "projA", timestamp="stream", compress="xz", stream=True) is True
+        finally:
+            os.chdir(old_cwd)
+
+        build_root = tmp_path / ".cache" / "build" / "projA"
+        assert not (build_root / "stream" / "diff").exists()
+
+        def _files(archive):
+            with tarfile.open(str(archive), "r:*") as tar:
+                return {m.name: (m.mode, tar.extractfile(m).read()) for m in tar.getmembers() if m.isfile()}
+
+        tree = _files(build_root / "tree" / "diff_projA_tree.tar")
+        streamed = _files(build_root / "stream" / "diff_projA_stream.tar.xz")
+        assert "diff/commit/0001-Local-fix-handle-the-odd.case.patch" in tree
+        assert sorted(streamed) == sorted(tree)
+        for name, (mode, data) in tree.items():
+            if name.startswith("diff/commit/"):
+                # format-patch stamps its own version line; compare the commit content only.
+                assert data.split(b"\n-- \n")[0] == streamed[name][1].split(b"\n-- \n")[0]
+            else:
+                assert streamed[name][1] == data, name
+        assert streamed["diff/before/run.sh"][0] == 0o755
+        assert streamed["diff/after/a.txt"][1] == b"base\nchange\n"
+
+    def test_project_diff_store_deduplicates_and_exports(self, tmp_path):
+        """BUILD-004d: --store keeps each file once under .cache/build/objects; project_diff_export rebuilds it."""
+        from src.plugins.project_builder import project_diff_export
+
+        repo_root = _init_repo(tmp_path / "repo", {"a.txt": "base\n", "big.bin": b"x" * 4096})
+        (repo_root / "a.txt").write_text("base\nchange\n", encoding="utf-8")
+        (repo_root / "big.bin").write_bytes(b"y" * 4096)
+
+        old_cwd = os.getcwd()
+        try:
+            os.chdir(str(tmp_path))
+            env = {"repositories": [(str(repo_root), "root")]}
+            assert self.project_diff(env, {}, "projA", timestamp="t1", store=True, keep_diff_dir=True) is False
+            assert self.project_diff(env, {}, "projA", timestamp="tree", compress="none") is True
+            assert self.project_diff(env, {}, "projA", timestamp="t1", store=True) is True
+            objects = tmp_path / ".cache" / "build" / "objects"
+            first = {p.name for p in objects.rglob("*") if p.is_file()}
+            assert self.project_diff(env, {}, "projA", timestamp="t2", store=True) is True
+            second = {p.name for p in objects.rglob("*") if p.is_file()}
+
+            build_root = tmp_path / ".cache" / "build" / "projA"
+            manifest_path = build_root / "t2" / "diff_projA_t2.manifest.json"
+            assert project_diff_export({}, {}, str(manifest_path), compress="none") is True
+            exported = build_root / "t2" / "diff_projA_t2.tar"
+        finally:
+            os.chdir(old_cwd)
+
+        assert second == first
+        assert not (build_root / "t1" / "diff").exists()
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        entries = {entry["path"]: entry for entry in manifest["entries"]}
+        assert entries["diff/after/big.bin"]["size"] == 4096
+        assert (objects / entries["diff/before/a.txt"]["sha256"][:2] / entries["diff/before/a.txt"]["sha256"]).is_file()
+
+        def _files(archive):
+            with tarfile.open(str(archive), "r:*") as tar:
+                return {m.name: tar.extractfile(m).read() for m in tar.getmembers() if m.isfile()}
+
+        tree = _files(build_root / "tree" / "diff_projA_tree.tar")
+        restored = _files(exported)
+        assert restored.keys() == tree.keys()
+        assert {k: v for k, v in restored.items() if k != "diff/manifest.json"} == {
+            k: v for k, v in tree.items() if k != "diff/manifest.json"
+        }
+
+        os.unlink(objects / entries["diff/after/a.txt"]["sha256"][:2] / entries["diff/after/a.txt"]["sha256"])
+        assert project_diff_export({}, {}, str(manifest_path), out=str(tmp_path / "x.tar.gz")) is False
+
     def test_project_diff_multi_repo_archive_structure_real_git(self, tmp_path):
         """BUILD-002: Multi-repo diff archive groups files under repo subdirs."""
         repo1 = tmp_path / "repo1"
@@ -568,6 +811,20 @@ class TestProjectPreBuild:
         assert called_kwargs["timestamp"] is None
         assert called_kwargs["dry_run"] is False
 
+    @patch("src.plugins.project_builder.po_apply")
+    @patch("src.plugins.project_builder.project_diff")
+    def test_project_pre_build_passes_diff_store(self, mock_project_diff, mock_po_apply):
+        """BUILD-011b: PROJECT_DIFF_STORE makes the pre-build diff use the object store."""
+        mock_project_diff.return_value = True
+        mock_po_apply.return_value = True
+        projects_info = {"test_project": {"config": {"PROJECT_DIFF_STORE": "true"}}}
+
+        assert self.project_pre_build({}, projects_info, "test_project") is True
+        assert mock_project_diff.call_args[1]["store"] is True
+
+        self.project_pre_build({}, {"test_project": {"config": {}}}, "test_project")
+        assert mock_project_diff.call_args[1]["store"] is False
+
 
 class TestProjectDoBuild:
     """Test cases for project_do_build function."""
@@ -1126,3 +1383,395 @@ class TestProjectBuild:
             assert self.project_build(env, projects_info, "p") is True
         finally:
             hooks_registry._platform_hooks = old_hooks
+
+
+class TestRepoSync:
+    """Test cases for _repo_sync."""
+
+    @staticmethod
+    def _ctx(root, repositories, sync_jobs=0, force=False):
+        from src.plugins.project_builder import BuildContext
+
+        return BuildContext(
+            env={},
+            projects_info={},
+            project_name="p",
+            project_cfg={},
+            platform=None,
+            repositories=repositories,
+            root_path=str(root),
+            build_ts="t",
+            build_root=str(root / ".cache" / "build" / "p" / "t"),
+            dry_run=False,
+            force=force,
+            profile="full",
+            repo="",
+            target="",
+            sync_jobs=sync_jobs,
+        )
+
+    @staticmethod
+    def _git(cwd, *args):
+        subprocess.run(["git", *args], cwd=str(cwd), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _clone_pair(self, tmp_path, name):
+        upstream = tmp_path / f"{name}.git"
+        self._git(tmp_path, "init", "--bare", str(upstream))
+        seed = tmp_path / f"{name}-seed"
+        self._git(tmp_path, "clone", str(upstream), str(seed))
+        for args in (["config", "user.email", "t@e.com"], ["config", "user.name", "T"]):
+            self._git(seed, *args)
+        (seed / "f.txt").write_text("base\n", encoding="utf-8")
+        self._git(seed, "add", "f.txt")
+        self._git(seed, "commit", "-m", "base")
+        self._git(seed, "push", "origin", "HEAD")
+        work = tmp_path / name
+        self._git(tmp_path, "clone", str(upstream), str(work))
+        (seed / "f.txt").write_text("newer\n", encoding="utf-8")
+        self._git(seed, "commit", "-am", "newer")
+        self._git(seed, "push", "origin", "HEAD")
+        return work
+
+    def test_repo_sync_pulls_in_parallel_and_prints_summary(self, tmp_path, capsys):
+        """BUILD-008b: git repositories are pulled concurrently and reported in a duration table."""
+        from src.plugins.project_builder import _repo_sync
+
+        repos = [(str(self._clone_pair(tmp_path, name)), name) for name in ("r1", "r2")]
+        assert _repo_sync(self._ctx(tmp_path, repos, sync_jobs=2)) is True
+
+        for path, _name in repos:
+            assert (tmp_path / path / "f.txt").read_text(encoding="utf-8") == "newer\n"
+        out = capsys.readouterr().out
+        assert "Sync summary (2 repositories, jobs=2):" in out
+        rows = [line.split() for line in out.splitlines() if line.startswith(("r1 ", "r2 "))]
+        assert [row[:2] for row in rows] == [["r1", "synced"], ["r2", "synced"]]
+
+    def test_repo_sync_dirty_check_and_failures_stop_the_pool(self, tmp_path, capsys):
+        """BUILD-008c: a dirty repo aborts before any pull; a failed pull cancels pulls not yet started."""
+        from src.plugins import project_builder
+
+        repos = [(str(self._clone_pair(tmp_path, name)), name) for name in ("r1", "r2", "r3")]
+        (tmp_path / "r2" / "untracked.txt").write_text("x", encoding="utf-8")
+        with patch.object(project_builder, "_run_cmd") as mock_run_cmd:
+            assert project_builder._repo_sync(self._ctx(tmp_path, repos, sync_jobs=3)) is False
+        mock_run_cmd.assert_not_called()
+
+        calls = []
+
+        def fake_run_cmd(cmd, *, cwd, dry_run, description):
+            calls.append(cwd)
+            return subprocess.CompletedProcess(cmd, 1, "", "network down")
+
+        with patch.object(project_builder, "_run_cmd", side_effect=fake_run_cmd):
+            assert project_builder._repo_sync(self._ctx(tmp_path, repos, sync_jobs=1, force=True)) is False
+        assert calls == [repos[0][0]]
+        rows = [line.split()[:2] for line in capsys.readouterr().out.splitlines() if line.startswith("r")]
+        assert rows == [["r1", "failed"], ["r2", "cancelled"], ["r3", "cancelled"]]
+
+    def test_repo_sync_passes_jobs_to_repo_tool(self, tmp_path):
+        """BUILD-008d: the repo tool branch receives the configured job count as -jN."""
+        from src.plugins import project_builder
+
+        (tmp_path / ".repo").mkdir()
+        (tmp_path / ".repo" / "manifest.xml").write_text("<manifest/>", encoding="utf-8")
+        ok = subprocess.CompletedProcess([], 0, "", "")
+        with patch.object(project_builder.shutil, "which", return_value="/usr/bin/repo"), patch.object(
+            project_builder, "_run_cmd", return_value=ok
+        ) as mock_run_cmd:
+            assert project_builder._repo_sync(self._ctx(tmp_path, [(str(tmp_path), "root")], sync_jobs=4)) is True
+            assert project_builder._repo_sync(self._ctx(tmp_path, [(str(tmp_path), "root")])) is True
+        assert [call.args[0] for call in mock_run_cmd.call_args_list] == [["repo", "sync", "-j4"], ["repo", "sync"]]
+        assert project_builder.project_build({}, {"p": {"config": {}}}, "p", sync=True, sync_jobs="zero") is False
+
+
+class TestRepoClean:
+    """Test cases for _repo_clean."""
+
+    @staticmethod
+    def _repo(tmp_path, name):
+        repo_root = _init_repo(tmp_path / name, {"f.txt": "base\n"})
+        (repo_root / "junk.bin").write_bytes(b"j" * 100)
+        (repo_root / "out dir").mkdir()
+        (repo_root / "out dir" / "a.o").write_bytes(b"a" * 50)
+        (repo_root / "out dir" / "b.o").write_bytes(b"b" * 50)
+        (repo_root / "projects").mkdir()
+        (repo_root / "projects" / "keep.ini").write_text("keep", encoding="utf-8")
+        return str(repo_root), name
+
+    def test_repo_clean_dry_run_estimates_freed_bytes(self, tmp_path, capsys):
+        """BUILD-009b: dry-run clean estimates freed bytes per repository with a parallel git clean -n."""
+        from src.plugins.project_builder import _repo_clean
+
+        repos = [self._repo(tmp_path, name) for name in ("r1", "r2")]
+        ctx = TestRepoSync._ctx(tmp_path, repos)
+        ctx.dry_run = True
+        ctx.clean_jobs = 2
+        assert _repo_clean(ctx) is True
+
+        out = capsys.readouterr().out
+        assert "Clean estimate (2 repositories, jobs=2, 400 bytes to free):" in out
+        rows = [line.split() for line in out.splitlines() if line.startswith(("r1 ", "r2 "))]
+        assert [[row[0], row[1], row[3], row[4]] for row in rows] == [
+            ["r1", "would-clean", "2", "200"],
+            ["r2", "would-clean", "2", "200"],
+        ]
+        assert (tmp_path / "r1" / "junk.bin").exists()
+
+    def test_repo_clean_runs_all_repositories_and_aggregates_failures(self, tmp_path, capsys):
+        """BUILD-009c: clean runs concurrently, keeps excluded paths and reports every failure."""
+        from src.plugins import project_builder
+
+        repos = [self._repo(tmp_path, name) for name in ("r1", "r2", "r3")]
+        ctx = TestRepoSync._ctx(tmp_path, repos, force=True)
+        ctx.clean_jobs = 3
+        assert project_builder._repo_clean(ctx) is True
+        for path, _name in repos:
+            assert not os.path.exists(os.path.join(path, "junk.bin"))
+            assert not os.path.exists(os.path.join(path, "out dir"))
+            assert os.path.exists(os.path.join(path, "projects", "keep.ini"))
+        assert "Clean summary (3 repositories, jobs=3):" in capsys.readouterr().out
+
+        real_run_cmd = project_builder._run_cmd
+
+        def flaky_run_cmd(cmd, *, cwd, dry_run, description):
+            if cmd[:2] == ["git", "reset"] and cwd != repos[1][0]:
+                return subprocess.CompletedProcess(cmd, 128, "", "index.lock exists")
+            return real_run_cmd(cmd, cwd=cwd, dry_run=dry_run, description=description)
+
+        (tmp_path / "r2" / "junk.bin").write_bytes(b"j")
+        with patch.object(project_builder, "_run_cmd", side_effect=flaky_run_cmd):
+            assert project_builder._repo_clean(ctx) is False
+        rows = [line.split()[:2] for line in capsys.readouterr().out.splitlines() if line.startswith("r")]
+        assert rows == [["r1", "failed"], ["r2", "cleaned"], ["r3", "failed"]]
+        assert not (tmp_path / "r2" / "junk.bin").exists()
+
+
+class TestCollectArtifacts:
+    """Test cases for _collect_artifacts."""
+
+    @staticmethod
+    def _tree(tmp_path):
+        out = tmp_path / "out"
+        (out / "images" / "sub").mkdir(parents=True)
+        (out / "app.bin").write_bytes(b"a" * 3000)
+        (out / "images" / "boot.img").write_bytes(b"b" * 10)
+        (out / "images" / "sub" / "system.img").write_bytes(b"s" * 20)
+        return out
+
+    def test_collect_artifacts_copies_in_parallel_and_records_checksums(self, tmp_path):
+        """ART-006: rules resolve first, files copy on a pool and manifest.json records size and sha256."""
+        import hashlib
+
+        from src.plugins.project_builder import _collect_artifacts
+
+        self._tree(tmp_path)
+        ctx = TestRepoSync._ctx(tmp_path, [])
+        ctx.artifact_jobs = 4
+        ctx.project_cfg = {"PROJECT_ARTIFACT_LINK": "hardlink"}
+        assert _collect_artifacts(ctx, "path:out/app.bin:bin/\npath:out/images:") is True
+
+        artifacts = tmp_path / ".cache" / "build" / "p" / "t" / "artifacts"
+        manifest = json.loads((artifacts / "manifest.json").read_text(encoding="utf-8"))
+        file_item, dir_item = manifest["items"]
+        assert file_item["dest"] == os.path.join("bin", "app.bin")
+        assert file_item["size"] == 3000
+        assert file_item["sha256"] == hashlib.sha256(b"a" * 3000).hexdigest()
+        assert file_item["method"] == "hardlink"
+        assert os.stat(artifacts / "bin" / "app.bin").st_ino == os.stat(tmp_path / "out" / "app.bin").st_ino
+        assert dir_item["size"] == 30
+        assert dir_item["method"] == "hardlink"
+        assert [(entry["path"], entry["sha256"]) for entry in dir_item["files"]] == [
+            ("boot.img", hashlib.sha256(b"b" * 10).hexdigest()),
+            ("sub/system.img", hashlib.sha256(b"s" * 20).hexdigest()),
+        ]
+        assert (artifacts / "images" / "sub" / "system.img").read_bytes() == b"s" * 20
+
+    def test_collect_artifacts_copies_nothing_when_a_later_rule_fails(self, tmp_path):
+        """ART-007: a bad rule is reported before any copy, and an unknown link mode is rejected."""
+        from src.plugins.project_builder import _collect_artifacts
+
+        self._tree(tmp_path)
+        ctx = TestRepoSync._ctx(tmp_path, [])
+        assert _collect_artifacts(ctx, "path:out/app.bin:bin/\npath:out/missing.bin:bin/") is False
+        assert not (tmp_path / ".cache" / "build" / "p" / "t" / "artifacts").exists()
+
+        ctx.project_cfg = {"PROJECT_ARTIFACT_LINK": "symlink"}
+        assert _collect_artifacts(ctx, "path:out/app.bin:bin/") is False
+
+        ctx.project_cfg = {}
+        assert _collect_artifacts(ctx, "path:out/app.bin:bin/") is True
+        manifest = json.loads(
+            (tmp_path / ".cache" / "build" / "p" / "t" / "artifacts" / "manifest.json").read_text(encoding="utf-8")
+        )
+        assert manifest["items"][0]["method"] == "copy"
+
+    def test_collect_artifacts_recreates_parents_a_directory_rule_replaced(self, tmp_path):
+        """ART-007b: a file rule below a later directory rule's destination still lands in place."""
+        from src.plugins.project_builder import _collect_artifacts
+
+        self._tree(tmp_path)
+        ctx = TestRepoSync._ctx(tmp_path, [])
+        assert _collect_artifacts(ctx, "path:out/app.bin:images/a/\npath:out/images:") is True
+
+        artifacts = tmp_path / ".cache" / "build" / "p" / "t" / "artifacts"
+        assert (artifacts / "images" / "a" / "app.bin").read_bytes() == b"a" * 3000
+        assert (artifacts / "images" / "boot.img").read_bytes() == b"b" * 10
+        manifest = json.loads((artifacts / "manifest.json").read_text(encoding="utf-8"))
+        assert [item["method"] for item in manifest["items"]] == ["copy", "copy"]
+
+    def test_regex_walk_plan_prunes_only_anchored_patterns(self):
+        """ART-008: anchored regex rules yield a literal start directory and per-depth directory filters."""
+        from src.plugins.project_builder import _regex_walk_plan
+
+        start, filters = _regex_walk_plan(r"^target/product/[^/]+/.*\.img$")
+        assert start == "target/product"
+        assert [f.pattern for f in filters] == ["[^/]+"]
+        assert _regex_walk_plan(r"^out\/obj\/[a-z]+_\d+/x")[0] == "out/obj"
+        for pattern in (r".*\.img$", r"^a/b|c/d", r"^out/?x", r"^out"):
+            assert _regex_walk_plan(pattern) == ("", [])
+        # Classes and escapes that can match `/` stop pruning at that component.
+        for pattern in (r"^out/x[a/]y/z\.img$", r"^out/a\x2fb/c\.img$", r"^out/a[\W]b/c\.img$", r"^out/[!-~]+/c"):
+            assert _regex_walk_plan(pattern) == ("out", [])
+        assert [f.pattern for f in _regex_walk_plan(r"^out/[a-z\d_.-]+/c")[1]] == [r"[a-z\d_.-]+"]
+
+    def test_regex_rule_skips_pruned_and_excluded_directories(self, tmp_path):
+        """ART-009: regex@ rules scan only directories the pattern allows, minus PROJECT_ARTIFACT_EXCLUDE."""
+        from src.plugins import project_builder
+
+        out = tmp_path / "out"
+        for rel in (
+            "target/product/dev/system.img",
+            "target/product/dev/obj/stale.img",
+            "target/product/emu/vendor.img",
+            "target/common/skip.img",
+            "obj/deep/x.img",
+        ):
+            (out / rel).parent.mkdir(parents=True, exist_ok=True)
+            (out / rel).write_bytes(b"img")
+
+        ctx = TestRepoSync._ctx(tmp_path, [])
+        ctx.project_cfg = {"PROJECT_ARTIFACT_EXCLUDE": "obj"}
+        scanned = []
+        real_scandir = os.scandir
+
+        def spy_scandir(path):
+            scanned.append(os.path.relpath(path, out).replace(os.sep, "/"))
+            return real_scandir(path)
+
+        rule = r"regex@out:^target/product/[^/]+/.*\.img$:images/"
+        with patch.object(project_builder.os, "scandir", side_effect=spy_scandir):
+            assert project_builder._collect_artifacts(ctx, rule) is True
+        assert sorted(scanned) == ["target/product", "target/product/dev", "target/product/emu"]
+        artifacts = tmp_path / ".cache" / "build" / "p" / "t" / "artifacts"
+        manifest = json.loads((artifacts / "manifest.json").read_text(encoding="utf-8"))
+        assert sorted(item["src"] for item in manifest["items"]) == [
+            os.path.join("out", "target", "product", "dev", "system.img"),
+            os.path.join("out", "target", "product", "emu", "vendor.img"),
+        ]
+
+        (out / "target" / "x" / "y").mkdir(parents=True)
+        (out / "target" / "x" / "y" / "z.img").write_bytes(b"img")
+        for pattern in (r"^target/x[a/]y/z\.img$", r"^target/x\x2fy/z\.img$", r"^target/x[\W]y/z\.img$"):
+            assert project_builder._regex_artifact_matches(str(out), re.compile(pattern), []) == ["target/x/y/z.img"]
+
+
+class TestBuildFingerprint:
+    """Test cases for build fingerprint reuse in project_build."""
+
+    def test_unchanged_inputs_reuse_previous_artifacts(self, tmp_path, monkeypatch):
+        """BUILD-011: a matching fingerprint links the earlier artifacts; changes or --no-cache rebuild."""
+        from datetime import datetime
+
+        from src.plugins import project_builder
+
+        repo_root = _init_repo(tmp_path / "repo1", {"src.c": "int main;\n"})
+        (tmp_path / "build.py").write_text(
+            "import os\n"
+            "os.makedirs('out', exist_ok=True)\n"
+            "open('out/app.bin', 'wb').write(b'app')\n"
+            "open('runs.txt', 'a').write('run\\n')\n",
+            encoding="utf-8",
+        )
+        cfg = {"PROJECT_BUILD_CMD": f"{sys.executable} build.py", "PROJECT_BUILD_ARTIFACTS": "path:out/app.bin:bin/"}
+        env = {"root_path": str(tmp_path), "repositories": [(str(repo_root), "repo1")]}
+        monkeypatch.chdir(tmp_path)
+
+        class _Clock(datetime):
+            current = datetime(2026, 1, 1, 0, 0, 0)
+
+            @classmethod
+            def now(cls, tz=None):
+                return cls.current
+
+        monkeypatch.setattr(project_builder, "datetime", _Clock)
+
+        def build(second, **kwargs):
+            _Clock.current = datetime(2026, 1, 1, 0, 0, second)
+            assert project_builder.project_build(env, {"p": {"config": cfg}}, "p", no_po=True, no_diff=True, **kwargs)
+            return tmp_path / ".cache" / "build" / "p" / f"20260101_0000{second:02d}"
+
+        def runs():
+            return len((tmp_path / "runs.txt").read_text(encoding="utf-8").splitlines())
+
+        first = build(1)
+        record = json.loads((first / "fingerprint.json").read_text(encoding="utf-8"))
+        assert record["reused_from"] == "" and record["inputs"]["repositories"][0]["repo"] == "repo1"
+
+        second = build(2)
+        assert runs() == 1
+        app = os.path.join("artifacts", "bin", "app.bin")
+        assert os.stat(second / app).st_ino == os.stat(first / app).st_ino
+        manifest = json.loads((second / "artifacts" / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["reused_from"] == "20260101_000001"
+        reused = json.loads((second / "fingerprint.json").read_text(encoding="utf-8"))
+        assert reused["fingerprint"] == record["fingerprint"]
+
+        build(3, no_cache=True)
+        assert runs() == 2
+
+        (repo_root / "src.c").write_text("int main(void);\n", encoding="utf-8")
+        build(4)
+        assert runs() == 3
+
+        (repo_root / "src.c").write_text("int main;\n", encoding="utf-8")
+        for stamp in ("01", "02", "03"):
+            (tmp_path / ".cache" / "build" / "p" / f"20260101_0000{stamp}" / app).write_bytes(b"x")
+        build(5)
+        assert runs() == 4
+
+    def test_workspace_repository_ignores_tool_cache(self, tmp_path, monkeypatch):
+        """BUILD-011c: a repository at root_path reuses builds although each build adds files under .cache."""
+        from datetime import datetime
+
+        from src.plugins import project_builder
+
+        _init_repo(tmp_path, {"src.c": "int main;\n", ".gitignore": "out/\nruns.txt\n"})
+        (tmp_path / "build.py").write_text(
+            "import os\n"
+            "os.makedirs('out', exist_ok=True)\n"
+            "open('out/app.bin', 'wb').write(b'app')\n"
+            "open('runs.txt', 'a').write('run\\n')\n",
+            encoding="utf-8",
+        )
+        subprocess.run(["git", "add", "build.py"], cwd=str(tmp_path), check=True, stdout=subprocess.DEVNULL)
+        subprocess.run(["git", "commit", "-m", "build"], cwd=str(tmp_path), check=True, stdout=subprocess.DEVNULL)
+        cfg = {"PROJECT_BUILD_CMD": f"{sys.executable} build.py", "PROJECT_BUILD_ARTIFACTS": "path:out/app.bin:bin/"}
+        env = {"root_path": str(tmp_path), "repositories": [(str(tmp_path), "root")]}
+        monkeypatch.chdir(tmp_path)
+
+        class _Clock(datetime):
+            current = datetime(2026, 1, 1, 0, 0, 0)
+
+            @classmethod
+            def now(cls, tz=None):
+                return cls.current
+
+        monkeypatch.setattr(project_builder, "datetime", _Clock)
+        for second in (1, 2):
+            _Clock.current = datetime(2026, 1, 1, 0, 0, second)
+            assert project_builder.project_build(env, {"p": {"config": cfg}}, "p", no_po=True, no_diff=False)
+
+        assert (tmp_path / "runs.txt").read_text(encoding="utf-8").splitlines() == ["run"]
+        second = tmp_path / ".cache" / "build" / "p" / "20260101_000002"
+        manifest = json.loads((second / "artifacts" / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["reused_from"] == "20260101_000001"
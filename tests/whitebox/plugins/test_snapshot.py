@@ -78,6 +78,11 @@ class TestSnapshot:
         assert payload["repositories"][0]["name"] == "root"
         assert payload["repositories"][0]["path"] == "."
         assert len(payload["repositories"][0]["head"]) == 40
+        assert payload["repositories"][0]["clean"] is True
+
+        (tmp_path / "a.txt").write_text("base\nchange\n", encoding="utf-8")
+        assert self.snapshot_create(env, projects_info, "projA") is True
+        assert json.loads(capsys.readouterr().out)["repositories"][0]["clean"] is False
 
     def test_snapshot_validate_detects_repo_head_drift(self, tmp_path, monkeypatch, capsys):
         monkeypatch.chdir(tmp_path)
@@ -0,0 +1,86 @@
+"""
+Tests for ignore_utils module.
+"""
+
+# pylint: disable=attribute-defined-outside-init
+# pylint: disable=import-outside-toplevel
+
+import os
+import sys
+import tempfile
+
+
+class TestIgnoreMatcher:
+    """Test cases for IgnoreMatcher."""
+
+    def setup_method(self):
+        """Import the ignore_utils module."""
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
+        import src.ignore_utils as ignore_utils
+
+        self.ignore_utils = ignore_utils
+
+    def test_po_ignore_keeps_containment_and_fnmatch_semantics(self):
+        """Plain PROJECT_PO_IGNORE words match by containment; wildcards use fnmatch."""
+        matcher = self.ignore_utils.IgnoreMatcher(["vendor", "external/*"])
+        assert matcher.is_ignored("src/vendor_config.h")
+        assert matcher.is_ignored("lib.c", "my_vendor_lib")
+        assert matcher.is_ignored("a/b.c", "external")
+        assert matcher.is_ignored("external/deep/file.c")
+        assert not matcher.is_ignored("src/main.c", "frameworks")
+
+    def test_gitignore_semantics(self):
+        """.gitignore lines honour comments, anchoring, directory-only, ** and negation."""
+        matcher = self.ignore_utils.IgnoreMatcher(
+            gitignore_lines=["# comment\n", "/build\n", "out/\n", "*.o\n", "!keep.o\n", "docs/**/tmp\n", "\n"]
+        )
+        assert matcher.is_ignored("build/x.c")
+        assert not matcher.is_ignored("src/build")
+        assert matcher.is_ignored("src/out/x")
+        assert not matcher.is_ignored("out")
+        assert matcher.is_ignored("a/b.o")
+        assert not matcher.is_ignored("a/keep.o")
+        assert matcher.is_ignored("docs/tmp")
+        assert matcher.is_ignored("docs/x/y/tmp/file")
+        assert not matcher.is_ignored("docs/x")
+        assert not matcher.is_ignored("# comment")
+
+    def test_gitignore_anchoring_and_excluded_parent_directories(self):
+        """A leading or inner slash anchors directory patterns; negation cannot reach inside an excluded dir."""
+        matcher = self.ignore_utils.IgnoreMatcher(
+            gitignore_lines=["/dir/\n", "a/b/\n", "build/\n", "!build/keep.txt\n", "*.log\n", "!keep.log\n"]
+        )
+        assert matcher.is_ignored("dir/x")
+        assert not matcher.is_ignored("src/dir/x")
+        assert not matcher.is_ignored("dir")
+        assert matcher.is_ignored("a/b/c.txt")
+        assert not matcher.is_ignored("x/a/b/c.txt")
+        assert matcher.is_ignored("build/keep.txt")
+        assert matcher.is_ignored("src/build/keep.txt")
+        assert matcher.is_ignored("logs/x.log")
+        assert not matcher.is_ignored("logs/keep.log")
+
+    def test_load_ignore_matcher_reads_workspace_gitignore_and_caches(self):
+        """Matchers are shared until PROJECT_PO_IGNORE or the .gitignore changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gitignore = os.path.join(tmpdir, ".gitignore")
+            with open(gitignore, "w", encoding="utf-8") as f:
+                f.write("*.tmp\n")
+
+            first = self.ignore_utils.load_ignore_matcher("vendor", tmpdir)
+            assert first is self.ignore_utils.load_ignore_matcher("vendor", tmpdir)
+            assert first.is_ignored("x.tmp")
+            assert first.is_ignored("vendor/x.c")
+
+            with open(gitignore, "w", encoding="utf-8") as f:
+                f.write("*.bak\n")
+            os.utime(gitignore, ns=(0, 1))
+            second = self.ignore_utils.load_ignore_matcher("vendor", tmpdir)
+            assert second is not first
+            assert second.is_ignored("x.bak")
+            assert not second.is_ignored("x.tmp")
+
+        with tempfile.TemporaryDirectory() as empty_dir:
+            assert not self.ignore_utils.load_ignore_matcher("", empty_dir)
@@ -29,6 +29,7 @@ path_from_root = utils.path_from_root
 get_filename = utils.get_filename
 get_version = utils.get_version
 list_file_path = utils.list_file_path
+parse_jobs = utils.parse_jobs
 
 
 class TestPathFromRoot:
@@ -58,6 +59,18 @@ class TestPathFromRoot:
         assert path_from_root("a", "b") == os.path.join(str(tmp_path), "a", "b")
 
 
+class TestParseJobs:
+    """Test cases for parse_jobs function."""
+
+    def test_parse_jobs_defaults_to_cpu_count(self):
+        """Unset values use the CPU count; numbers are parsed; anything else is 0."""
+        with patch.object(utils.os, "cpu_count", return_value=6):
+            assert [parse_jobs(value) for value in (None, True, "")] == [6, 6, 6]
+        assert parse_jobs("3") == 3
+        assert parse_jobs(2) == 2
+        assert [parse_jobs(value) for value in ("0", "-2", "nope", "1.5", False)] == [0, 0, 0, 0, 0]
+
+
 class TestGetFilename:
     """Test cases for get_filename function."""
 